@@ -12,8 +12,10 @@ Data: 03 de dezembro de 2025
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import logging
+from streamlit_echarts import st_echarts
 
 # Importações dos módulos do sistema
 from config import (
@@ -23,22 +25,23 @@ from config import (
     LIMITE_TOP_5,
     LIMITE_TOP_10,
     LIMITE_TOP_20,
-    LIMITE_MAXIMO_MESES
+    LIMITE_MAXIMO_MESES,
+    USINAS_POR_PAGINA_RANKING,
+    ALARMES_POR_PAGINA
 )
 
 from database.conexao import testar_conexao
 from database.queries import (
     listar_usinas_disponiveis,
-    descobrir_periodos_disponiveis,
+    obter_indice_periodos,
+    invalidar_cache_catalogo,
     filtrar_periodos_validos,
-    calcular_total_alarmes,
-    calcular_tempo_total_alarmado,
-    calcular_tempo_medio_reconhecimento,
-    obter_top_equipamentos_por_quantidade,
-    obter_top_equipamentos_por_duracao,
+    verificar_existem_alarmes,
+    calcular_kpis_consolidados,
+    obter_ranking_usinas,
+    obter_top_equipamentos_com_qtd_e_duracao,
     obter_equipamentos_sem_comunicacao,
-    obter_top_teleobjetos_por_quantidade,
-    obter_top_teleobjetos_por_duracao,
+    obter_top_teleobjetos_com_qtd_e_duracao,
     obter_tempo_por_severidade,
     obter_alarmes_criticos_por_equipamento,
     obter_alarmes_criticos_por_teleobjeto,
@@ -47,14 +50,20 @@ from database.queries import (
     obter_tempo_reconhecimento_por_severidade,
     obter_top_usuarios_reconhecimento,
     obter_lista_alarmes,
+    contar_alarmes,
     obter_alarmes_ncu,
     obter_teleobjetos_ncu,
     obter_alarmes_trackers,
     obter_teleobjetos_tracker,
+    iniciar_consultas_em_paralelo,
 )
 
-from calculos.kpis import calcular_kpis_principais, calcular_tempo_medio_por_alarme
-from calculos.formatacao import formatar_tempo_minutos, formatar_numero
+from calculos.kpis import (
+    calcular_kpis_principais,
+    calcular_tempo_medio_por_alarme,
+    calcular_tempo_medio_por_alarme_vec,
+)
+from calculos.formatacao import formatar_tempo_minutos, formatar_tempo_minutos_vec, formatar_numero
 
 from visualizacoes.cards import exibir_cards_kpis_principais, exibir_card_resumo_usina, exibir_card_alerta
 from visualizacoes.graficos import (
@@ -64,7 +73,7 @@ from visualizacoes.graficos import (
     criar_grafico_barras_tempo_medio,
     criar_grafico_top_usuarios,
     criar_grafico_alarmes_criticos_equipamento,
-    criar_grafico_alarmes_criticos_teleobjeto,
+    criar_grafico_alarmes_criticos,
     criar_grafico_alarmes_nao_finalizados,
     criar_grafico_linha_evolucao,
     criar_grafico_resumo_mensal,
@@ -73,11 +82,11 @@ from visualizacoes.graficos import (
 from visualizacoes.tabelas import exibir_tabela_alarmes, exibir_tabela_simples
 
 from utils.helpers import (
-    validar_periodos_selecionados,
     construir_texto_periodo,
     inicializar_session_state,
     gerar_opcoes_anos,
     obter_nome_mes,
+    Periodos,
 )
 
 # Configurar logging
@@ -102,8 +111,21 @@ st.set_page_config(
 # Inicializar session state
 inicializar_session_state()
 
+@st.cache_resource(show_spinner=False)
+def verificar_conexao_inicial() -> bool:
+    """
+    Testa a conexão com o banco uma única vez por processo.
+    
+    Retorna:
+        bool: True se a conexão foi bem-sucedida
+    """
+    return testar_conexao()
+
+
 # Testar conexão com banco de dados
-if not testar_conexao():
+if not verificar_conexao_inicial():
+    # Não manter a falha em cache: tentar novamente no próximo rerun
+    verificar_conexao_inicial.clear()
     st.error("""
         ❌ **Erro de Conexão com Banco de Dados**
         
@@ -125,11 +147,11 @@ def pagina_home():
     Página HOME - Visão geral de todas as usinas.
     
     Funcionalidades:
-    - Filtros: Ano (dropdown) e Meses (checkboxes, máx 3)
+    - Filtros: Ano (dropdown) e Meses (seleção múltipla, máx 3)
     - KPIs Gerais: Total de Usinas, Total de Alarmes, Tempo Total, Tempo Médio
     - Gráfico Pizza: Distribuição de Alarmes por Usina
     - Gráfico Barras: Top 10 Usinas com Mais Alarmes
-    - Tabela Ranking: Todas as 55 usinas com botão "Analisar"
+    - Tabela Ranking: Usinas paginadas (Top N) com seleção "Analisar usina"
     """
     # Título da seção
     st.subheader("📊 Visão Geral de Todas as Usinas")
@@ -151,30 +173,39 @@ def pagina_home():
         
         st.markdown("---")
         
-        # Filtro de Meses (checkboxes)
-        st.markdown("**📆 Selecione os Meses (máx 3):**")
-        meses_selecionados = []
-        
-        for mes in range(1, 13):
-            if st.checkbox(
-                obter_nome_mes(mes),
-                key=f"home_mes_{mes}"
-            ):
-                meses_selecionados.append(mes)
+        # Filtro de Meses (o próprio widget limita a LIMITE_MAXIMO_MESES)
+        meses_selecionados = st.multiselect(
+            f"📆 Selecione os Meses (máx {LIMITE_MAXIMO_MESES}):",
+            options=list(range(1, 13)),
+            format_func=obter_nome_mes,
+            max_selections=LIMITE_MAXIMO_MESES,
+            key="home_meses"
+        )
         
         st.markdown("---")
         
         # Validar seleção de meses
-        if len(meses_selecionados) > LIMITE_MAXIMO_MESES:
-            st.error(f"⚠️ Máximo de {LIMITE_MAXIMO_MESES} meses permitidos!")
-            return
-        
         if len(meses_selecionados) == 0:
             st.warning("⚠️ Selecione pelo menos 1 mês para visualizar os dados.")
             return
     
     # Construir períodos selecionados
-    periodos = [{'ano': ano_selecionado, 'mes': mes} for mes in meses_selecionados]
+    periodos = tuple((ano_selecionado, mes) for mes in sorted(meses_selecionados))
+    
+    exibir_visao_geral(periodos)
+
+
+@st.fragment
+def exibir_visao_geral(periodos: Periodos):
+    """
+    Conteúdo da página HOME (KPIs gerais e ranking) para os períodos filtrados.
+    
+    Roda como fragmento: interações com os widgets daqui de dentro reexecutam
+    apenas este trecho, e não o script inteiro (sidebar, abas, outra página).
+    
+    Parâmetros:
+        periodos: Tupla de períodos (ano, mes) selecionados na sidebar
+    """
     texto_periodo = construir_texto_periodo(periodos)
     
     # INFO: Não filtramos períodos na página HOME pois queremos mostrar dados agregados
@@ -183,99 +214,113 @@ def pagina_home():
     # Exibir período selecionado
     st.info(f"📅 **Período Selecionado:** {texto_periodo}")
     
-    # Listar todas as usinas
-    usinas = listar_usinas_disponiveis()
+    # Paginação do ranking (os widgets ficam na seção do ranking, mais abaixo)
+    usinas_por_pagina = int(st.session_state.get('home_ranking_top_n', USINAS_POR_PAGINA_RANKING))
+    pagina_ranking = int(st.session_state.get('home_ranking_pagina', 1))
+    
+    # Total de alarmes e tempo alarmado de todas as usinas em uma única query,
+    # já ordenada e limitada à página do ranking
+    with st.spinner("Calculando KPIs gerais..."):
+        df_ranking = obter_ranking_usinas(
+            periodos,
+            usinas_por_pagina,
+            (pagina_ranking - 1) * usinas_por_pagina
+        )
+        
+        if df_ranking.empty and pagina_ranking > 1:
+            # Página além do fim (ex: Top N aumentou): voltar para a primeira
+            pagina_ranking = 1
+            st.session_state['home_ranking_pagina'] = 1
+            df_ranking = obter_ranking_usinas(periodos, usinas_por_pagina, 0)
     
-    if not usinas:
+    if df_ranking.empty:
         st.error("❌ Nenhuma usina encontrada no sistema.")
         return
     
+    offset_ranking = (pagina_ranking - 1) * usinas_por_pagina
+    total_usinas = int(df_ranking['total_usinas'].iloc[0])
+    
+    # Os KPIs gerais e o ranking saem do mesmo DataFrame: cada usina é
+    # calculada uma única vez
+    df_ranking['tempo_medio_minutos'] = calcular_tempo_medio_por_alarme_vec(
+        df_ranking['tempo_total_minutos'].to_numpy(),
+        df_ranking['total_alarmes'].to_numpy()
+    )
+    
     # Calcular KPIs gerais (agregando todas as usinas)
     st.markdown("---")
     st.subheader("📈 Indicadores Gerais")
     
-    with st.spinner("Calculando KPIs gerais..."):
-        # Agregar dados de todas as usinas
-        total_alarmes_geral = 0
-        tempo_total_geral = 0.0
-        
-        for usina in usinas:
-            try:
-                total_alarmes = calcular_total_alarmes(usina['id'], periodos)
-                tempo_total = calcular_tempo_total_alarmado(usina['id'], periodos)
-                
-                total_alarmes_geral += total_alarmes
-                tempo_total_geral += tempo_total
-            except Exception as e:
-                logger.error(f"Erro ao processar usina {usina['id']}: {e}")
-                continue
-        
-        # Calcular tempo médio
-        tempo_medio_geral = calcular_tempo_medio_por_alarme(
-            tempo_total_geral,
-            total_alarmes_geral
+    total_alarmes_geral = int(df_ranking['total_alarmes_geral'].iloc[0])
+    tempo_total_geral = float(df_ranking['tempo_total_geral'].iloc[0])
+    
+    # Calcular tempo médio
+    tempo_medio_geral = calcular_tempo_medio_por_alarme(
+        tempo_total_geral,
+        total_alarmes_geral
+    )
+    
+    # Exibir KPIs em cards
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(
+            label="🏭 Total de Usinas",
+            value=total_usinas
+        )
+    
+    with col2:
+        st.metric(
+            label="🚨 Total de Alarmes",
+            value=formatar_numero(total_alarmes_geral)
+        )
+    
+    with col3:
+        st.metric(
+            label="⏱️ Tempo Total Alarmado",
+            value=formatar_tempo_minutos(tempo_total_geral)
+        )
+    
+    with col4:
+        st.metric(
+            label="📊 Tempo Médio por Alarme",
+            value=f"{tempo_medio_geral:.2f} min"
         )
-        
-        # Exibir KPIs em cards
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.metric(
-                label="🏭 Total de Usinas",
-                value=len(usinas)
-            )
-        
-        with col2:
-            st.metric(
-                label="🚨 Total de Alarmes",
-                value=formatar_numero(total_alarmes_geral)
-            )
-        
-        with col3:
-            st.metric(
-                label="⏱️ Tempo Total Alarmado",
-                value=formatar_tempo_minutos(tempo_total_geral)
-            )
-        
-        with col4:
-            st.metric(
-                label="📊 Tempo Médio por Alarme",
-                value=f"{tempo_medio_geral:.2f} min"
-            )
     
     st.markdown("---")
     
     # Tabela de Ranking de Usinas
     st.subheader("🏆 Ranking de Usinas")
     
+    col_top_n, col_pagina = st.columns(2)
+    
+    with col_top_n:
+        st.number_input(
+            "Usinas por página (Top N):",
+            min_value=5,
+            max_value=100,
+            value=USINAS_POR_PAGINA_RANKING,
+            step=5,
+            key="home_ranking_top_n"
+        )
+    
+    with col_pagina:
+        total_paginas = max(1, -(-total_usinas // usinas_por_pagina))
+        st.number_input(
+            f"Página (de {total_paginas}):",
+            min_value=1,
+            max_value=total_paginas,
+            step=1,
+            key="home_ranking_pagina"
+        )
+    
     with st.spinner("Carregando ranking de usinas..."):
-        # Construir ranking
-        ranking_data = []
-        
-        for usina in usinas:
-            try:
-                total_alarmes = calcular_total_alarmes(usina['id'], periodos)
-                tempo_total = calcular_tempo_total_alarmado(usina['id'], periodos)
-                tempo_medio = calcular_tempo_medio_por_alarme(tempo_total, total_alarmes)
-                
-                ranking_data.append({
-                    'usina_id': usina['id'],
-                    'usina_nome': usina['nome'],
-                    'total_alarmes': total_alarmes,
-                    'tempo_total_minutos': tempo_total,
-                    'tempo_medio_minutos': tempo_medio
-                })
-            except Exception as e:
-                logger.error(f"Erro ao processar usina {usina['id']}: {e}")
-                continue
-        
-        # Criar DataFrame
-        df_ranking = pd.DataFrame(ranking_data)
-        
         if not df_ranking.empty:
-            # Ordenar por total de alarmes
-            df_ranking = df_ranking.sort_values('total_alarmes', ascending=False)
-            df_ranking['posicao'] = range(1, len(df_ranking) + 1)
+            # Já vem ordenado por total de alarmes e paginado do banco
+            df_ranking['posicao'] = np.arange(
+                offset_ranking + 1,
+                offset_ranking + len(df_ranking) + 1
+            )
             
             # Formatar para exibição
             df_exibir = df_ranking[[
@@ -287,18 +332,18 @@ def pagina_home():
             ]].copy()
             
             # Formatar colunas
-            df_exibir['tempo_total_formatado'] = df_exibir['tempo_total_minutos'].apply(
-                lambda x: formatar_tempo_minutos(x)
-            )
-            df_exibir['tempo_medio_formatado'] = df_exibir['tempo_medio_minutos'].apply(
-                lambda x: f"{x:.2f} min"
+            df_exibir['total_alarmes_formatado'] = df_exibir['total_alarmes'].map(formatar_numero)
+            df_exibir['tempo_total_formatado'] = formatar_tempo_minutos_vec(
+                df_exibir['tempo_total_minutos'].to_numpy()
             )
+            df_exibir['tempo_medio_formatado'] = df_exibir['tempo_medio_minutos'].map('{:.2f} min'.format)
+            df_exibir['posicao'] = df_exibir['posicao'].map('{}º'.format)
             
             # Selecionar colunas finais
             df_final = df_exibir[[
                 'posicao',
                 'usina_nome',
-                'total_alarmes',
+                'total_alarmes_formatado',
                 'tempo_total_formatado',
                 'tempo_medio_formatado'
             ]].copy()
@@ -311,33 +356,51 @@ def pagina_home():
                 'Tempo Médio'
             ]
             
-            # Exibir tabela com botão "Analisar"
-            for idx, row in df_final.iterrows():
-                col1, col2, col3, col4, col5, col6 = st.columns([1, 3, 2, 2, 2, 1])
-                
-                with col1:
-                    st.write(f"**{row['Posição']}º**")
-                
-                with col2:
-                    st.write(row['Usina'])
-                
-                with col3:
-                    st.write(formatar_numero(row['Total de Alarmes']))
-                
-                with col4:
-                    st.write(row['Tempo Total'])
-                
-                with col5:
-                    st.write(row['Tempo Médio'])
-                
-                with col6:
-                    usina_id = df_ranking.iloc[idx]['usina_id']
-                    if st.button("🔍", key=f"analisar_{usina_id}"):
-                        st.session_state['usina_selecionada'] = usina_id
-                        st.session_state['pagina_atual'] = 'analise'
-                        st.rerun()
+            # Exibir tabela inteira de uma vez (um único componente); clicar em
+            # uma linha seleciona a usina para a análise detalhada
+            evento_ranking = st.dataframe(
+                df_final,
+                use_container_width=True,
+                hide_index=True,
+                on_select="rerun",
+                selection_mode="single-row",
+                key="home_ranking_tabela"
+            )
+            
+            # Mapeamento nome -> ID (Series indexada, como no drill-down de NCU),
+            # na mesma ordem das linhas da tabela
+            usinas_ranking = df_ranking.set_index('usina_nome')['usina_id']
+            
+            def selecionar_usina_para_analise(usina_nome: str):
+                usina_id = int(usinas_ranking.loc[usina_nome])
+                st.session_state['usina_selecionada'] = usina_id
+                st.session_state['analise_usina'] = usina_nome
+                st.session_state['home_analisar_usina'] = usina_nome
                 
-                st.markdown("---")
+                # Levar o período da HOME para a Análise: o rerun seguinte já
+                # carrega a usina com os mesmos meses, sem nova seleção
+                ano = periodos[0][0]
+                meses_usina = obter_indice_periodos(usina_id).get(ano, [])
+                meses = [mes for _, mes in periodos if mes in meses_usina]
+                if meses:
+                    st.session_state['analise_ano'] = ano
+                    st.session_state['analise_meses'] = meses
+            
+            # A seleção guarda a posição da linha: vale para a página atual do ranking
+            linhas_selecionadas = evento_ranking.selection.rows
+            if linhas_selecionadas and linhas_selecionadas[0] < len(usinas_ranking):
+                usina_nome = usinas_ranking.index[linhas_selecionadas[0]]
+                if usina_nome != st.session_state.get('home_analisar_usina'):
+                    selecionar_usina_para_analise(usina_nome)
+                    
+                    # A sidebar da Análise fica fora do fragmento: rerun completo para atualizá-la
+                    st.rerun()
+            
+            if st.session_state.get('home_analisar_usina') is not None:
+                st.caption(
+                    f"Usina **{st.session_state['home_analisar_usina']}** selecionada "
+                    "— abra a aba **Análise Detalhada** para ver os detalhes."
+                )
         else:
             st.info("📄 Nenhum dado disponível para o período selecionado.")
 
@@ -380,50 +443,41 @@ def pagina_analise():
         
         usina_id = usina_opcoes[usina_nome_selecionada]
         
+        if st.button("🔄 Atualizar usinas e períodos", key="atualizar_usinas"):
+            invalidar_cache_catalogo()
+            st.rerun()
+        
         st.markdown("---")
         
-        # Descobrir períodos disponíveis para esta usina
-        periodos_disponiveis = descobrir_periodos_disponiveis(usina_id)
+        # Descobrir períodos disponíveis para esta usina ({ano: [meses]})
+        indice_periodos = obter_indice_periodos(usina_id)
         
-        if not periodos_disponiveis:
+        if not indice_periodos:
             st.error(f"❌ Nenhum período disponível para a usina {usina_nome_selecionada}.")
             return
         
-        # Extrair anos únicos
-        anos_disponiveis = sorted(
-            list(set([p['ano'] for p in periodos_disponiveis])),
-            reverse=True
-        )
-        
         # Seleção de Ano
         ano_selecionado = st.selectbox(
             "📅 Selecione o Ano:",
-            options=anos_disponiveis,
+            options=list(indice_periodos),
             key="analise_ano"
         )
         
-        # Filtrar meses disponíveis para o ano selecionado
-        meses_disponiveis_ano = [
-            p['mes'] for p in periodos_disponiveis 
-            if p['ano'] == ano_selecionado
-        ]
-        meses_disponiveis_ano = sorted(meses_disponiveis_ano)
+        # Meses disponíveis para o ano selecionado
+        meses_disponiveis_ano = indice_periodos.get(ano_selecionado, [])
         
         st.markdown("---")
         
-        # Seleção de Meses (checkboxes) - APENAS meses com dados
-        st.markdown(f"**📆 Selecione os Meses (máx {LIMITE_MAXIMO_MESES}):**")
-        
+        # Seleção de Meses - APENAS meses com dados
         if meses_disponiveis_ano:
             st.info(f"✅ {len(meses_disponiveis_ano)} meses com dados disponíveis")
-            meses_selecionados = []
-            
-            for mes in meses_disponiveis_ano:
-                if st.checkbox(
-                    obter_nome_mes(mes),
-                    key=f"analise_mes_{mes}"
-                ):
-                    meses_selecionados.append(mes)
+            meses_selecionados = st.multiselect(
+                f"📆 Selecione os Meses (máx {LIMITE_MAXIMO_MESES}):",
+                options=meses_disponiveis_ano,
+                format_func=obter_nome_mes,
+                max_selections=LIMITE_MAXIMO_MESES,
+                key="analise_meses"
+            )
         else:
             st.warning(f"⚠️ Nenhum mês com dados para o ano {ano_selecionado}")
             meses_selecionados = []
@@ -432,16 +486,12 @@ def pagina_analise():
         # Nota: Botão "Voltar" removido pois agora usamos navegação por abas
     
     # Validar seleção de meses
-    if len(meses_selecionados) > LIMITE_MAXIMO_MESES:
-        st.error(f"⚠️ Máximo de {LIMITE_MAXIMO_MESES} meses permitidos!")
-        return
-    
     if len(meses_selecionados) == 0:
         st.warning("⚠️ Selecione pelo menos 1 mês para visualizar os dados.")
         return
     
     # Construir períodos selecionados
-    periodos = [{'ano': ano_selecionado, 'mes': mes} for mes in meses_selecionados]
+    periodos = tuple((ano_selecionado, mes) for mes in sorted(meses_selecionados))
     
     # VALIDAÇÃO: Filtrar apenas períodos com dados disponíveis
     periodos_validos = filtrar_periodos_validos(usina_id, periodos)
@@ -451,6 +501,11 @@ def pagina_analise():
         st.info("💡 Selecione outros meses que possuam dados.")
         return
     
+    # Meses com tabela mas sem nenhum alarme da usina: evita ~20 consultas vazias
+    if not verificar_existem_alarmes(usina_id, periodos_validos):
+        st.info(f"📄 Nenhum alarme registrado para a usina {usina_nome_selecionada} nos meses selecionados.")
+        return
+    
     texto_periodo = construir_texto_periodo(periodos_validos)
     
     # Exibir resumo da usina
@@ -458,10 +513,50 @@ def pagina_analise():
     
     with st.spinner("Carregando dados da usina..."):
         try:
+            # Consultas de cada seção secundária; apenas a seção escolhida
+            # (lida do session_state antes do widget) é consultada
+            consultas_por_secao = {
+                "⚙️ Visão Geral": {
+                    'equipamentos': (obter_top_equipamentos_com_qtd_e_duracao, (usina_id, periodos, LIMITE_TOP_10)),
+                    'teleobjetos': (obter_top_teleobjetos_com_qtd_e_duracao, (usina_id, periodos, LIMITE_TOP_10)),
+                    'sem_com': (obter_equipamentos_sem_comunicacao, (usina_id, periodos, LIMITE_TOP_10)),
+                },
+                "🖥️ NCUs": {
+                    'ncu': (obter_alarmes_ncu, (usina_id, periodos_validos, LIMITE_TOP_10)),
+                },
+                "📍 Trackers": {
+                    'trackers': (obter_alarmes_trackers, (usina_id, periodos_validos, 20)),
+                },
+                "✅ Reconhecimento": {
+                    'reconhecimento': (obter_tempo_reconhecimento_por_severidade, (usina_id, periodos_validos)),
+                    'usuarios': (obter_top_usuarios_reconhecimento, (usina_id, periodos, LIMITE_TOP_10)),
+                },
+                "🚨 Críticos": {
+                    'crit_equip': (obter_alarmes_criticos_por_equipamento, (usina_id, periodos, LIMITE_TOP_10)),
+                    'crit_tele': (obter_alarmes_criticos_por_teleobjeto, (usina_id, periodos, LIMITE_TOP_10)),
+                    'nao_finalizados': (obter_alarmes_nao_finalizados, (usina_id, periodos, LIMITE_TOP_10)),
+                },
+                "📈 Evolução": {
+                    'evolucao': (obter_evolucao_diaria, (usina_id, periodos_validos)),
+                },
+                # A lista é consultada pelo próprio fragmento (exibir_lista_alarmes)
+                "📋 Lista de Alarmes": {},
+            }
+            secao_ativa = st.session_state.get('analise_secao', next(iter(consultas_por_secao)))
+            
+            # Disparar as queries da página em paralelo; cada seção espera
+            # apenas pelo próprio resultado (.result())
+            dados = iniciar_consultas_em_paralelo({
+                'kpis': (calcular_kpis_consolidados, (usina_id, periodos_validos)),
+                'severidade': (obter_tempo_por_severidade, (usina_id, periodos_validos)),
+                **consultas_por_secao.get(secao_ativa, {}),
+            })
+            
             # Calcular KPIs principais
-            total_alarmes = calcular_total_alarmes(usina_id, periodos_validos)
-            tempo_total_minutos = calcular_tempo_total_alarmado(usina_id, periodos_validos)
-            tempo_reconhecimento_minutos = calcular_tempo_medio_reconhecimento(usina_id, periodos_validos)
+            kpis = dados['kpis'].result()
+            total_alarmes = kpis['total_alarmes']
+            tempo_total_minutos = kpis['tempo_total_minutos']
+            tempo_reconhecimento_minutos = kpis['tempo_medio_reconhecimento_minutos']
             tempo_medio_minutos = calcular_tempo_medio_por_alarme(tempo_total_minutos, total_alarmes)
             
             # Exibir card de resumo
@@ -487,9 +582,8 @@ def pagina_analise():
             
             # GRÁFICO 1: Pizza - Tempo Total por Severidade
             st.subheader("🎨 Distribuição por Severidade")
-            df_severidade = obter_tempo_por_severidade(usina_id, periodos_validos)
+            df_severidade = dados['severidade'].result()
             if not df_severidade.empty:
-                from streamlit_echarts import st_echarts
                 grafico_pizza = criar_grafico_pizza_severidade(df_severidade)
                 st_echarts(grafico_pizza, height="400px")
             else:
@@ -497,359 +591,203 @@ def pagina_analise():
             
             st.markdown("---")
             
-            # GRÁFICOS 2 e 3: Equipamentos e Teleobjetos com Toggle
-            st.subheader("⚙️ Top Equipamentos")
-            df_equip_qtd = obter_top_equipamentos_por_quantidade(usina_id, periodos, LIMITE_TOP_10)
-            df_equip_dur = obter_top_equipamentos_por_duracao(usina_id, periodos, LIMITE_TOP_10)
-            
-            # Combinar dataframes
-            if not df_equip_qtd.empty and not df_equip_dur.empty:
-                df_equipamentos = df_equip_qtd.merge(
-                    df_equip_dur[['equipamento_nome_formatado', 'duracao_total_minutos']],
-                    on='equipamento_nome_formatado',
-                    how='outer',
-                    suffixes=('', '_dur')
-                ).fillna(0)
-                
-                exibir_grafico_com_toggle(
-                    df_equipamentos,
-                    "Top Equipamentos",
-                    "equipamento_nome_formatado",
-                    "quantidade_alarmes",
-                    "duracao_total_minutos",
-                    "equipamentos",
-                    limite_inicial=5,
-                    limite_expandido=50
-                )
-            else:
-                st.info("📄 Nenhum dado disponível.")
-            
-            st.markdown("---")
-            
-            st.subheader("📡 Top Teleobjetos")
-            df_tele_qtd = obter_top_teleobjetos_por_quantidade(usina_id, periodos, LIMITE_TOP_10)
-            df_tele_dur = obter_top_teleobjetos_por_duracao(usina_id, periodos, LIMITE_TOP_10)
+            # Seções secundárias: só a seção escolhida é renderizada (e consultada)
+            secao = st.radio(
+                "📑 Seção:",
+                options=list(consultas_por_secao),
+                horizontal=True,
+                key="analise_secao"
+            )
             
-            if not df_tele_qtd.empty and not df_tele_dur.empty:
-                df_teleobjetos = df_tele_qtd.merge(
-                    df_tele_dur[['teleobjeto_nome', 'duracao_total_minutos']],
-                    on='teleobjeto_nome',
-                    how='outer',
-                    suffixes=('', '_dur')
-                ).fillna(0)
+            if secao == "⚙️ Visão Geral":
+                # GRÁFICOS 2 e 3: Equipamentos e Teleobjetos com Toggle
+                st.subheader("⚙️ Top Equipamentos")
+                df_equipamentos = dados['equipamentos'].result()
                 
-                exibir_grafico_com_toggle(
-                    df_teleobjetos,
-                    "Top Teleobjetos",
-                    "teleobjeto_nome",
-                    "quantidade_alarmes",
-                    "duracao_total_minutos",
-                    "teleobjetos",
-                    limite_inicial=5,
-                    limite_expandido=50
-                )
-            else:
-                st.info("📄 Nenhum dado disponível.")
-            
-            st.markdown("---")
-            
-            # GRÁFICO 4: Sem Comunicação
-            st.subheader("📶 Equipamentos Sem Comunicação")
-            try:
-                df_sem_com = obter_equipamentos_sem_comunicacao(usina_id, periodos, LIMITE_TOP_10)
-                if not df_sem_com.empty:
-                    from streamlit_echarts import st_echarts
-                    grafico_sem_com = criar_grafico_barras_horizontais(
-                        df_sem_com,
-                        "Equipamentos Sem Comunicação - Top 10",
+                if not df_equipamentos.empty:
+                    exibir_grafico_com_toggle(
+                        df_equipamentos,
+                        "Top Equipamentos",
                         "equipamento_nome_formatado",
+                        "quantidade_alarmes",
                         "duracao_total_minutos",
-                        "Tempo Total (min)",
-                        "#e74c3c",
-                        formato_valor="tempo"
+                        "equipamentos",
+                        limite_inicial=5,
+                        limite_expandido=50
                     )
-                    st_echarts(grafico_sem_com, height="400px")
                 else:
-                    st.info("📄 Nenhum alarme de 'sem comunicação' encontrado.")
-            except Exception as e:
-                logger.error(f"Erro ao exibir gráfico de equipamentos sem comunicação: {e}")
-                st.error(f"❌ Erro ao carregar gráfico: {str(e)}")
-            
-            st.markdown("---")
-            
-            # SEÇÃO ESPECIAL: ANÁLISE DE NCUs
-            st.subheader("🖥️ Análise de NCUs (Network Control Units)")
-            
-            try:
-                # Buscar todos os alarmes de NCU
-                df_ncu = obter_alarmes_ncu(usina_id, periodos_validos, LIMITE_TOP_10)
-                
-                if not df_ncu.empty:
-                    # Gráfico de barras com NCUs
-                    from streamlit_echarts import st_echarts
+                    st.info("📄 Nenhum dado disponível.")
                     
-                    grafico_ncu = criar_grafico_barras_horizontais(
-                        dataframe=df_ncu,
-                        titulo="Top NCUs por Tempo Total Alarmado",
-                        coluna_nome="equipamento_nome_formatado",
-                        coluna_valor="duracao_total_minutos",
-                        nome_serie="Tempo Total (min)",
-                        cor="#FF6B6B",
-                        mostrar_valor=True,
-                        formato_valor="tempo"
+                st.markdown("---")
+                
+                st.subheader("📡 Top Teleobjetos")
+                df_teleobjetos = dados['teleobjetos'].result()
+                
+                if not df_teleobjetos.empty:
+                    exibir_grafico_com_toggle(
+                        df_teleobjetos,
+                        "Top Teleobjetos",
+                        "teleobjeto_nome",
+                        "quantidade_alarmes",
+                        "duracao_total_minutos",
+                        "teleobjetos",
+                        limite_inicial=5,
+                        limite_expandido=50
                     )
-                    st_echarts(grafico_ncu, height="400px")
-                    
-                    # Seleção interativa de NCU para ver teleobjetos
-                    st.markdown("### 🔍 Detalhes dos Teleobjetos por NCU")
+                else:
+                    st.info("📄 Nenhum dado disponível.")
                     
-                    # Criar mapeamento de nome formatado para nome original
-                    ncu_dict = dict(zip(df_ncu['equipamento_nome_formatado'], df_ncu['equipamento_nome']))
-                    ncu_opcoes = list(ncu_dict.keys())
+                st.markdown("---")
+                
+                # GRÁFICO 4: Sem Comunicação
+                st.subheader("📶 Equipamentos Sem Comunicação")
+                try:
+                    df_sem_com = dados['sem_com'].result()
+                    if not df_sem_com.empty:
+                        grafico_sem_com = criar_grafico_barras_horizontais(
+                            df_sem_com,
+                            "Equipamentos Sem Comunicação - Top 10",
+                            "equipamento_nome_formatado",
+                            "duracao_total_minutos",
+                            "Tempo Total (min)",
+                            "#e74c3c",
+                            formato_valor="tempo"
+                        )
+                        st_echarts(grafico_sem_com, height="400px")
+                    else:
+                        st.info("📄 Nenhum alarme de 'sem comunicação' encontrado.")
+                except Exception as e:
+                    logger.error(f"Erro ao exibir gráfico de equipamentos sem comunicação: {e}")
+                    st.error(f"❌ Erro ao carregar gráfico: {str(e)}")
                     
-                    ncu_selecionada_formatada = st.selectbox(
-                        "Selecione uma NCU para ver seus teleobjetos:",
-                        options=ncu_opcoes,
-                        key="ncu_selector"
-                    )
+            elif secao == "🖥️ NCUs":
+                # SEÇÃO ESPECIAL: ANÁLISE DE NCUs
+                st.subheader("🖥️ Análise de NCUs (Network Control Units)")
+                
+                try:
+                    # Buscar todos os alarmes de NCU
+                    df_ncu = dados['ncu'].result()
                     
-                    if ncu_selecionada_formatada:
-                        # Obter nome original do equipamento
-                        ncu_nome_original = ncu_dict[ncu_selecionada_formatada]
-                        
-                        # Buscar teleobjetos da NCU selecionada
-                        df_teleobjetos_ncu = obter_teleobjetos_ncu(
-                            usina_id, 
-                            periodos_validos, 
-                            ncu_nome_original, 
-                            LIMITE_TOP_20
+                    if not df_ncu.empty:
+                        # Gráfico de barras com NCUs
+                        grafico_ncu = criar_grafico_barras_horizontais(
+                            dataframe=df_ncu,
+                            titulo="Top NCUs por Tempo Total Alarmado",
+                            coluna_nome="equipamento_nome_formatado",
+                            coluna_valor="duracao_total_minutos",
+                            nome_serie="Tempo Total (min)",
+                            cor="#FF6B6B",
+                            mostrar_valor=True,
+                            formato_valor="tempo"
                         )
+                        st_echarts(grafico_ncu, height="400px")
                         
-                        if not df_teleobjetos_ncu.empty:
-                            st.markdown(f"**📊 Teleobjetos da NCU: {ncu_selecionada_formatada}**")
-                            
-                            # Gráfico de teleobjetos
-                            grafico_tele_ncu = criar_grafico_barras_horizontais(
-                                dataframe=df_teleobjetos_ncu,
-                                titulo=f"Teleobjetos - {ncu_selecionada_formatada}",
-                                coluna_nome="teleobjeto_nome",
-                                coluna_valor="duracao_total_minutos",
-                                nome_serie="Tempo Alarmado (min)",
-                                cor="#4ECDC4",
-                                mostrar_valor=True,
-                                formato_valor="tempo"
-                            )
-                            st_echarts(grafico_tele_ncu, height="500px")
-                            
-                            # Tabela detalhada
-                            with st.expander("📋 Ver Tabela Detalhada"):
-                                st.dataframe(
-                                    df_teleobjetos_ncu,
-                                    use_container_width=True,
-                                    hide_index=True
-                                )
-                        else:
-                            st.info(f"📄 Nenhum teleobjeto encontrado para a NCU {ncu_selecionada_formatada}.")
-                else:
-                    st.info("📄 Nenhum equipamento NCU encontrado no período selecionado.")
-            except Exception as e:
-                logger.error(f"Erro ao exibir análise de NCU: {e}")
-                st.error(f"❌ Erro ao carregar análise de NCU: {str(e)}")
-            
-            st.markdown("---")
-            
-            # GRÁFICO INTERMEDIÁRIO: Análise de Trackers (TR-XXX)
-            st.subheader("📍 Análise de Trackers (TR-XXX)")
-            
-            try:
-                # Buscar todos os alarmes agrupados por Tracker
-                df_trackers = obter_alarmes_trackers(usina_id, periodos_validos, limite=20)
-                
-                if not df_trackers.empty:
-                    # Gráfico de barras com Trackers
-                    from streamlit_echarts import st_echarts
+                        exibir_detalhes_ncu(usina_id, periodos_validos, df_ncu)
+                    else:
+                        st.info("📄 Nenhum equipamento NCU encontrado no período selecionado.")
+                except Exception as e:
+                    logger.error(f"Erro ao exibir análise de NCU: {e}")
+                    st.error(f"❌ Erro ao carregar análise de NCU: {str(e)}")
                     
-                    grafico_trackers = criar_grafico_barras_horizontais(
-                        dataframe=df_trackers,
-                        titulo="Tempo Total Alarmado por Tracker (TR-XXX)",
-                        coluna_nome="tracker_code",
-                        coluna_valor="duracao_total_minutos",
-                        nome_serie="Tempo Total (min)",
-                        cor="#9B59B6",
-                        mostrar_valor=True,
-                        formato_valor="tempo"
-                    )
-                    st_echarts(grafico_trackers, height="450px")
+            elif secao == "📍 Trackers":
+                # GRÁFICO INTERMEDIÁRIO: Análise de Trackers (TR-XXX)
+                st.subheader("📍 Análise de Trackers (TR-XXX)")
+                
+                try:
+                    # Buscar todos os alarmes agrupados por Tracker
+                    df_trackers = dados['trackers'].result()
                     
-                    # Seleção interativa de Tracker para ver teleobjetos
-                    st.markdown("### 🔍 Detalhes dos Teleobjetos por Tracker")
+                    if not df_trackers.empty:
+                        # Gráfico de barras com Trackers
+                        grafico_trackers = criar_grafico_barras_horizontais(
+                            dataframe=df_trackers,
+                            titulo="Tempo Total Alarmado por Tracker (TR-XXX)",
+                            coluna_nome="tracker_code",
+                            coluna_valor="duracao_total_minutos",
+                            nome_serie="Tempo Total (min)",
+                            cor="#9B59B6",
+                            mostrar_valor=True,
+                            formato_valor="tempo"
+                        )
+                        st_echarts(grafico_trackers, height="450px")
+                        
+                        exibir_detalhes_tracker(usina_id, periodos_validos, df_trackers)
+                    else:
+                        st.info("📄 Nenhum Tracker (TR-XXX) encontrado no período selecionado.")
+                except Exception as e:
+                    logger.error(f"Erro ao exibir análise de Trackers: {e}")
+                    st.error(f"❌ Erro ao carregar análise de Trackers: {str(e)}")
                     
-                    tracker_opcoes = df_trackers['tracker_code'].tolist()
+            elif secao == "✅ Reconhecimento":
+                # GRÁFICO 5: Tempo Médio de Reconhecimento por Severidade
+                st.subheader("✅ Tempo de Reconhecimento por Severidade")
+                df_reconh = dados['reconhecimento'].result()
+                if not df_reconh.empty:
+                    grafico_reconh = criar_grafico_barras_tempo_medio(df_reconh)
+                    st_echarts(grafico_reconh, height="400px")
+                else:
+                    st.info("📄 Nenhum dado disponível.")
                     
-                    tracker_selecionado = st.selectbox(
-                        "Selecione um Tracker para ver seus teleobjetos:",
-                        options=tracker_opcoes,
-                        key="tracker_selector"
-                    )
+                st.markdown("---")
+                
+                # GRÁFICO 6: Top Usuários Reconhecimento
+                st.subheader("👥 Top Usuários que Mais Reconhecem")
+                df_usuarios = dados['usuarios'].result()
+                if not df_usuarios.empty:
+                    grafico_usuarios = criar_grafico_top_usuarios(df_usuarios)
+                    st_echarts(grafico_usuarios, height="400px")
+                else:
+                    st.info("📄 Nenhum dado disponível.")
                     
-                    if tracker_selecionado:
-                        # Buscar teleobjetos do Tracker selecionado
-                        df_teleobjetos_tracker = obter_teleobjetos_tracker(
-                            usina_id, 
-                            periodos_validos, 
-                            tracker_selecionado, 
-                            limite=25
-                        )
-                        
-                        if not df_teleobjetos_tracker.empty:
-                            st.markdown(f"**📊 Teleobjetos do Tracker: {tracker_selecionado}**")
-                            
-                            # Gráfico de teleobjetos
-                            grafico_tele_tracker = criar_grafico_barras_horizontais(
-                                dataframe=df_teleobjetos_tracker,
-                                titulo=f"Teleobjetos - {tracker_selecionado}",
-                                coluna_nome="teleobjeto_nome",
-                                coluna_valor="duracao_total_minutos",
-                                nome_serie="Tempo Alarmado (min)",
-                                cor="#F39C12",
-                                mostrar_valor=True,
-                                formato_valor="tempo"
-                            )
-                            st_echarts(grafico_tele_tracker, height="500px")
-                            
-                            # Tabela detalhada
-                            with st.expander("📋 Ver Tabela Detalhada"):
-                                st.dataframe(
-                                    df_teleobjetos_tracker,
-                                    use_container_width=True,
-                                    hide_index=True
-                                )
-                        else:
-                            st.info(f"📄 Nenhum teleobjeto encontrado para o Tracker {tracker_selecionado}.")
+            elif secao == "🚨 Críticos":
+                # GRÁFICOS 7 e 8: Alarmes Críticos
+                st.subheader("🚨 Alarmes Críticos")
+                
+                # Equipamentos e teleobjetos no mesmo gráfico (uma instância ECharts)
+                df_crit_equip = dados['crit_equip'].result()
+                df_crit_tele = dados['crit_tele'].result()
+                grafico_criticos = criar_grafico_alarmes_criticos(df_crit_equip, df_crit_tele)
+                if grafico_criticos:
+                    st_echarts(grafico_criticos, height="400px")
                 else:
-                    st.info("📄 Nenhum Tracker (TR-XXX) encontrado no período selecionado.")
-            except Exception as e:
-                logger.error(f"Erro ao exibir análise de Trackers: {e}")
-                st.error(f"❌ Erro ao carregar análise de Trackers: {str(e)}")
-            
-            st.markdown("---")
-            
-            # GRÁFICO 5: Tempo Médio de Reconhecimento por Severidade
-            st.subheader("✅ Tempo de Reconhecimento por Severidade")
-            df_reconh = obter_tempo_reconhecimento_por_severidade(usina_id, periodos_validos)
-            if not df_reconh.empty:
-                from streamlit_echarts import st_echarts
-                grafico_reconh = criar_grafico_barras_tempo_medio(df_reconh)
-                st_echarts(grafico_reconh, height="400px")
-            else:
-                st.info("📄 Nenhum dado disponível.")
-            
-            st.markdown("---")
-            
-            # GRÁFICO 6: Top Usuários Reconhecimento
-            st.subheader("👥 Top Usuários que Mais Reconhecem")
-            df_usuarios = obter_top_usuarios_reconhecimento(usina_id, periodos, LIMITE_TOP_10)
-            if not df_usuarios.empty:
-                from streamlit_echarts import st_echarts
-                grafico_usuarios = criar_grafico_top_usuarios(df_usuarios)
-                st_echarts(grafico_usuarios, height="400px")
-            else:
-                st.info("📄 Nenhum dado disponível.")
-            
-            st.markdown("---")
-            
-            # GRÁFICOS 7 e 8: Alarmes Críticos
-            st.subheader("🚨 Alarmes Críticos")
-            
-            col_crit1, col_crit2 = st.columns(2)
-            
-            with col_crit1:
-                st.markdown("**Por Equipamento:**")
-                df_crit_equip = obter_alarmes_criticos_por_equipamento(usina_id, periodos, LIMITE_TOP_10)
-                if not df_crit_equip.empty:
-                    from streamlit_echarts import st_echarts
-                    grafico_crit_equip = criar_grafico_barras_horizontais(
-                        df_crit_equip,
-                        "Alarmes Críticos - Equipamentos",
+                    st.info("📄 Nenhum alarme crítico.")
+                    
+                st.markdown("---")
+                
+                # GRÁFICO 9: Alarmes Não Finalizados
+                st.subheader("⏳ Alarmes Não Finalizados (Ativos)")
+                df_nao_final = dados['nao_finalizados'].result()
+                if not df_nao_final.empty:
+                    grafico_nao_final = criar_grafico_barras_horizontais(
+                        df_nao_final,
+                        "Alarmes Não Finalizados - Top 10",
                         "equipamento_nome_formatado",
-                        "duracao_total_minutos",
-                        "Tempo Total (min)",
-                        "#c0392b",
-                        formato_valor="tempo"
+                        "quantidade_alarmes_ativos",
+                        "Quantidade de Alarmes Ativos",
+                        "#f39c12"
                     )
-                    st_echarts(grafico_crit_equip, height="400px")
+                    st_echarts(grafico_nao_final, height="400px")
                 else:
-                    st.info("📄 Nenhum alarme crítico.")
-            
-            with col_crit2:
-                st.markdown("**Por Teleobjeto:**")
-                df_crit_tele = obter_alarmes_criticos_por_teleobjeto(usina_id, periodos, LIMITE_TOP_10)
-                if not df_crit_tele.empty:
-                    from streamlit_echarts import st_echarts
-                    grafico_crit_tele = criar_grafico_alarmes_criticos_teleobjeto(df_crit_tele)
-                    st_echarts(grafico_crit_tele, height="400px")
+                    st.info("📄 Todos os alarmes foram finalizados.")
+                    
+            elif secao == "📈 Evolução":
+                # GRÁFICO 10: Evolução Diária
+                st.subheader("📈 Evolução Diária de Alarmes")
+                
+                # Quantidade/Duração alternam pela legenda do gráfico (no navegador)
+                st.caption("Use a legenda do gráfico para alternar entre Quantidade e Duração.")
+                df_evolucao = dados['evolucao'].result()
+                if not df_evolucao.empty:
+                    grafico_evolucao = criar_grafico_linha_evolucao(df_evolucao)
+                    st_echarts(grafico_evolucao, height="400px")
                 else:
-                    st.info("📄 Nenhum alarme crítico.")
-            
-            st.markdown("---")
-            
-            # GRÁFICO 9: Alarmes Não Finalizados
-            st.subheader("⏳ Alarmes Não Finalizados (Ativos)")
-            df_nao_final = obter_alarmes_nao_finalizados(usina_id, periodos, LIMITE_TOP_10)
-            if not df_nao_final.empty:
-                from streamlit_echarts import st_echarts
-                grafico_nao_final = criar_grafico_barras_horizontais(
-                    df_nao_final,
-                    "Alarmes Não Finalizados - Top 10",
-                    "equipamento_nome_formatado",
-                    "quantidade_alarmes_ativos",
-                    "Quantidade de Alarmes Ativos",
-                    "#f39c12"
-                )
-                st_echarts(grafico_nao_final, height="400px")
-            else:
-                st.info("📄 Todos os alarmes foram finalizados.")
-            
-            st.markdown("---")
-            
-            # GRÁFICO 10: Evolução Diária
-            st.subheader("📈 Evolução Diária de Alarmes")
-            
-            # Toggle entre Quantidade e Duração
-            modo_evolucao = st.radio(
-                "Exibir:",
-                options=["Quantidade", "Duração Total"],
-                horizontal=True,
-                key="modo_evolucao"
-            )
-            
-            df_evolucao = obter_evolucao_diaria(usina_id, periodos_validos)
-            if not df_evolucao.empty:
-                from streamlit_echarts import st_echarts
-                modo = "quantidade" if modo_evolucao == "Quantidade" else "duracao"
-                grafico_evolucao = criar_grafico_linha_evolucao(df_evolucao, modo=modo)
-                st_echarts(grafico_evolucao, height="400px")
-            else:
-                st.info("📄 Nenhum dado disponível.")
-            
-            st.markdown("---")
-            
-            # Tabela de Alarmes
-            st.subheader("📋 Lista de Alarmes Detalhada")
-            
-            # Obter página atual
-            pagina_atual = st.session_state.get('pagina_tabela', 1)
-            
-            # Calcular offset
-            from config import ALARMES_POR_PAGINA
-            offset = (pagina_atual - 1) * ALARMES_POR_PAGINA
-            
-            df_alarmes = obter_lista_alarmes(usina_id, periodos, offset=offset, limite=ALARMES_POR_PAGINA)
-            
-            if not df_alarmes.empty:
-                exibir_tabela_alarmes(df_alarmes, pagina_atual=pagina_atual)
-            else:
-                st.info("📄 Nenhum alarme encontrado para o período selecionado.")
+                    st.info("📄 Nenhum dado disponível.")
+                    
+            elif secao == "📋 Lista de Alarmes":
+                # Tabela de Alarmes
+                st.subheader("📋 Lista de Alarmes Detalhada")
+                
+                exibir_lista_alarmes(usina_id, periodos)
             
         except Exception as e:
             logger.error(f"Erro ao processar análise detalhada: {e}")
@@ -862,6 +800,178 @@ def pagina_analise():
             """)
 
 
+@st.fragment
+def exibir_detalhes_ncu(usina_id: int, periodos_validos: Periodos, df_ncu: pd.DataFrame):
+    """
+    Drill-down de teleobjetos por NCU.
+    
+    Roda como fragmento: trocar a NCU selecionada só reexecuta este bloco
+    (uma consulta), e não a página de análise inteira.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos_validos: Períodos com dados
+        df_ncu: Resultado de obter_alarmes_ncu
+    """
+    # Seleção interativa de NCU para ver teleobjetos
+    st.markdown("### 🔍 Detalhes dos Teleobjetos por NCU")
+    
+    # Mapeamento nome formatado -> nome original (Series indexada)
+    ncu_nomes = df_ncu.set_index('equipamento_nome_formatado')['equipamento_nome']
+    
+    ncu_selecionada_formatada = st.selectbox(
+        "Selecione uma NCU para ver seus teleobjetos:",
+        options=ncu_nomes.index,
+        key="ncu_selector"
+    )
+    
+    if ncu_selecionada_formatada:
+        # Obter nome original do equipamento
+        ncu_nome_original = ncu_nomes.loc[ncu_selecionada_formatada]
+        
+        # Buscar teleobjetos da NCU selecionada
+        df_teleobjetos_ncu = obter_teleobjetos_ncu(
+            usina_id, 
+            periodos_validos, 
+            ncu_nome_original, 
+            LIMITE_TOP_20
+        )
+        
+        if not df_teleobjetos_ncu.empty:
+            st.markdown(f"**📊 Teleobjetos da NCU: {ncu_selecionada_formatada}**")
+            
+            # Gráfico de teleobjetos
+            grafico_tele_ncu = criar_grafico_barras_horizontais(
+                dataframe=df_teleobjetos_ncu,
+                titulo=f"Teleobjetos - {ncu_selecionada_formatada}",
+                coluna_nome="teleobjeto_nome",
+                coluna_valor="duracao_total_minutos",
+                nome_serie="Tempo Alarmado (min)",
+                cor="#4ECDC4",
+                mostrar_valor=True,
+                formato_valor="tempo"
+            )
+            st_echarts(grafico_tele_ncu, height="500px")
+            
+            # Tabela detalhada
+            with st.expander("📋 Ver Tabela Detalhada"):
+                st.dataframe(
+                    df_teleobjetos_ncu,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400
+                )
+        else:
+            st.info(f"📄 Nenhum teleobjeto encontrado para a NCU {ncu_selecionada_formatada}.")
+
+
+@st.fragment
+def exibir_detalhes_tracker(usina_id: int, periodos_validos: Periodos, df_trackers: pd.DataFrame):
+    """
+    Drill-down de teleobjetos por Tracker (TR-XXX), como fragmento.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos_validos: Períodos com dados
+        df_trackers: Resultado de obter_alarmes_trackers
+    """
+    # Seleção interativa de Tracker para ver teleobjetos
+    st.markdown("### 🔍 Detalhes dos Teleobjetos por Tracker")
+    
+    tracker_selecionado = st.selectbox(
+        "Selecione um Tracker para ver seus teleobjetos:",
+        options=df_trackers['tracker_code'],
+        key="tracker_selector"
+    )
+    
+    if tracker_selecionado:
+        # Buscar teleobjetos do Tracker selecionado
+        df_teleobjetos_tracker = obter_teleobjetos_tracker(
+            usina_id, 
+            periodos_validos, 
+            tracker_selecionado, 
+            limite=25
+        )
+        
+        if not df_teleobjetos_tracker.empty:
+            st.markdown(f"**📊 Teleobjetos do Tracker: {tracker_selecionado}**")
+            
+            # Gráfico de teleobjetos
+            grafico_tele_tracker = criar_grafico_barras_horizontais(
+                dataframe=df_teleobjetos_tracker,
+                titulo=f"Teleobjetos - {tracker_selecionado}",
+                coluna_nome="teleobjeto_nome",
+                coluna_valor="duracao_total_minutos",
+                nome_serie="Tempo Alarmado (min)",
+                cor="#F39C12",
+                mostrar_valor=True,
+                formato_valor="tempo"
+            )
+            st_echarts(grafico_tele_tracker, height="500px")
+            
+            # Tabela detalhada
+            with st.expander("📋 Ver Tabela Detalhada"):
+                st.dataframe(
+                    df_teleobjetos_tracker,
+                    use_container_width=True,
+                    hide_index=True,
+                    height=400
+                )
+        else:
+            st.info(f"📄 Nenhum teleobjeto encontrado para o Tracker {tracker_selecionado}.")
+
+
+@st.fragment
+def exibir_lista_alarmes(usina_id: int, periodos: Periodos):
+    """
+    Lista de alarmes paginada, como fragmento: mudar de página só consulta
+    e redesenha a tabela.
+    
+    A paginação é por cursor: cursores[i] é o (data_inicio, alarme_id) do
+    último alarme da página i + 1. Trocar de usina/período recomeça da
+    primeira página.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Períodos selecionados
+    """
+    filtro_tabela = (usina_id, periodos)
+    if st.session_state.get('pagina_filtro') != filtro_tabela:
+        st.session_state['pagina_filtro'] = filtro_tabela
+        st.session_state['pagina_cursores'] = []
+        st.session_state['pagina_tabela'] = 1
+    
+    cursores = st.session_state['pagina_cursores']
+    pagina_atual = st.session_state.get('pagina_tabela', 1)
+    if pagina_atual - 1 > len(cursores):
+        pagina_atual = st.session_state['pagina_tabela'] = 1
+    cursor = cursores[pagina_atual - 2] if pagina_atual > 1 else None
+    
+    df_alarmes = obter_lista_alarmes(usina_id, periodos, cursor, ALARMES_POR_PAGINA)
+    
+    # Página fora do intervalo (ex: dados alterados): voltar à primeira na
+    # mesma execução (sem rerun, que falha quando o fragmento roda junto
+    # com a página inteira)
+    if df_alarmes.empty and pagina_atual > 1:
+        del cursores[:]
+        pagina_atual = st.session_state['pagina_tabela'] = 1
+        df_alarmes = obter_lista_alarmes(usina_id, periodos, None, ALARMES_POR_PAGINA)
+    
+    if not df_alarmes.empty:
+        # Guardar o cursor da próxima página
+        ultimo = df_alarmes.iloc[-1]
+        del cursores[pagina_atual - 1:]
+        cursores.append((ultimo['data_inicio'], int(ultimo['alarme_id'])))
+        
+        exibir_tabela_alarmes(
+            df_alarmes,
+            pagina_atual=pagina_atual,
+            total_registros=contar_alarmes(usina_id, periodos)
+        )
+    else:
+        st.info("📄 Nenhum alarme encontrado para o período selecionado.")
+
+
 # ============================================================================
 # ROTEAMENTO DE PÁGINAS
 # ============================================================================
@@ -873,6 +983,11 @@ def main():
     # Título principal da aplicação
     st.title(f"{ICONE_APLICACAO} Sistema de Análise de Alarmes")
     
+    # Um único botão de atualização para as duas abas (descarta o cache de queries)
+    if st.button("🔄 Atualizar Dados", key="refresh_dados", help="Clique para recarregar dados"):
+        st.cache_data.clear()
+        st.rerun()
+    
     # Inicializar session_state para controle de aba
     if 'aba_ativa' not in st.session_state:
         st.session_state['aba_ativa'] = 0  # 0 = HOME, 1 = Análise
@@ -885,17 +1000,9 @@ def main():
     
     # Renderizar conteúdo apropriado em cada aba
     with tab_home:
-        # Indicador de que esta aba foi acessada
-        if st.button("🔄 Atualizar Página HOME", key="refresh_home", help="Clique para recarregar dados"):
-            st.rerun()
-        
         pagina_home()
     
     with tab_analise:
-        # Indicador de que esta aba foi acessada
-        if st.button("🔄 Atualizar Página Análise", key="refresh_analise", help="Clique para recarregar dados"):
-            st.rerun()
-        
         pagina_analise()
     
     # Rodapé
@@ -6,11 +6,14 @@ e formatação de valores para exibição.
 """
 
 from .kpis import (
+    KPIsPrincipais,
     calcular_kpis_principais,
     calcular_tempo_medio_por_alarme,
+    calcular_tempo_medio_por_alarme_vec,
 )
 from .formatacao import (
     formatar_tempo_minutos,
+    formatar_tempo_minutos_vec,
     formatar_tempo_horas,
     formatar_numero,
     formatar_percentual,
@@ -22,9 +25,12 @@ from .agregacoes import (
 )
 
 __all__ = [
+    "KPIsPrincipais",
     "calcular_kpis_principais",
     "calcular_tempo_medio_por_alarme",
+    "calcular_tempo_medio_por_alarme_vec",
     "formatar_tempo_minutos",
+    "formatar_tempo_minutos_vec",
     "formatar_tempo_horas",
     "formatar_numero",
     "formatar_percentual",
@@ -5,10 +5,42 @@ Este módulo contém funções para agregar dados de alarmes por diferentes
 critérios (severidade, equipamento, teleobjeto, etc).
 """
 
+import numpy as np
 import pandas as pd
 from typing import List, Dict, Any
 
 
+def _somar_por_categoria(categorias: pd.Series, valores: pd.Series) -> pd.DataFrame:
+    """
+    Soma `valores` por categoria com np.bincount sobre os códigos da coluna categórica.
+    
+    Equivale a groupby(observed=True).sum() para poucas categorias (ex: severidades):
+    uma única passada sequencial pelo array, sem tabela hash. Nulos são ignorados.
+    
+    Parâmetros:
+        categorias: Série com dtype category
+        valores: Série numérica alinhada a `categorias`
+    
+    Retorna:
+        DataFrame com as colunas [nome de `categorias`, nome de `valores`]
+    """
+    codigos = categorias.cat.codes.to_numpy()
+    pesos = np.nan_to_num(valores.to_numpy(dtype=np.float64))
+    
+    # Código -1 representa nulo: fica fora da soma
+    validos = codigos >= 0
+    codigos, pesos = codigos[validos], pesos[validos]
+    
+    num_categorias = len(categorias.cat.categories)
+    somas = np.bincount(codigos, weights=pesos, minlength=num_categorias)
+    observadas = np.bincount(codigos, minlength=num_categorias) > 0
+    
+    return pd.DataFrame({
+        categorias.name: np.asarray(categorias.cat.categories)[observadas],
+        valores.name: somas[observadas],
+    })
+
+
 def agregar_por_severidade(dataframe: pd.DataFrame) -> pd.DataFrame:
     """
     Agrega dados de alarmes por severidade.
@@ -30,14 +62,18 @@ def agregar_por_severidade(dataframe: pd.DataFrame) -> pd.DataFrame:
     if dataframe.empty:
         return pd.DataFrame()
     
-    # Agrupar por severidade
-    agregado = dataframe.groupby('severidade_nome').agg({
-        'duracao_minutos': 'sum'
-    }).reset_index()
+    # Agrupar por severidade (categórica: soma direta pelos códigos, sem hash)
+    if isinstance(dataframe['severidade_nome'].dtype, pd.CategoricalDtype):
+        agregado = _somar_por_categoria(dataframe['severidade_nome'], dataframe['duracao_minutos'])
+    else:
+        agregado = dataframe.groupby(
+            'severidade_nome', observed=True, sort=False, as_index=False
+        )['duracao_minutos'].sum()
     
-    # Calcular percentual
-    total = agregado['duracao_minutos'].sum()
-    agregado['percentual'] = (agregado['duracao_minutos'] / total * 100).round(2)
+    # Calcular percentual direto no array (sem alinhamento de índice do pandas)
+    duracoes = agregado['duracao_minutos'].to_numpy()
+    total = duracoes.sum()
+    agregado['percentual'] = np.round(duracoes * (100.0 / total if total else 0.0), 2)
     
     # Ordenar por duração
     agregado = agregado.sort_values('duracao_minutos', ascending=False)
@@ -71,23 +107,17 @@ def agregar_por_equipamento(
         return pd.DataFrame()
     
     # Agrupar por equipamento
-    agregado = dataframe.groupby('equipamento_nome').agg({
-        'duracao_minutos': ['sum', 'mean', 'count']
-    }).reset_index()
-    
-    # Renomear colunas
-    agregado.columns = [
-        'equipamento_nome', 
-        'duracao_total', 
-        'duracao_media', 
-        'quantidade'
-    ]
-    
-    # Ordenar por duração total
-    agregado = agregado.sort_values('duracao_total', ascending=False)
-    
-    # Retornar top N
-    return agregado.head(top_n)
+    # (agregação nomeada: uma passada só, sem MultiIndex para achatar)
+    agregado = dataframe.groupby('equipamento_nome', observed=True, sort=False, as_index=False).agg(
+        duracao_total=('duracao_minutos', 'sum'),
+        quantidade=('duracao_minutos', 'count')
+    )
+    agregado['duracao_media'] = agregado['duracao_total'] / agregado['quantidade']
+    
+    # Top N por duração total (seleção parcial, sem ordenar todos os grupos)
+    agregado = agregado.nlargest(top_n, 'duracao_total')
+    
+    return agregado[['equipamento_nome', 'duracao_total', 'duracao_media', 'quantidade']].reset_index(drop=True)
 
 
 def agregar_por_teleobjeto(
@@ -116,23 +146,30 @@ def agregar_por_teleobjeto(
         return pd.DataFrame()
     
     # Agrupar por teleobjeto
-    agregado = dataframe.groupby('teleobjeto_nome').agg({
-        'duracao_minutos': ['sum', 'mean', 'count']
-    }).reset_index()
-    
-    # Renomear colunas
-    agregado.columns = [
-        'teleobjeto_nome', 
-        'duracao_total', 
-        'duracao_media', 
-        'quantidade'
-    ]
-    
-    # Ordenar por duração total
-    agregado = agregado.sort_values('duracao_total', ascending=False)
-    
-    # Retornar top N
-    return agregado.head(top_n)
+    # (agregação nomeada: uma passada só, sem MultiIndex para achatar)
+    agregado = dataframe.groupby('teleobjeto_nome', observed=True, sort=False, as_index=False).agg(
+        duracao_total=('duracao_minutos', 'sum'),
+        quantidade=('duracao_minutos', 'count')
+    )
+    agregado['duracao_media'] = agregado['duracao_total'] / agregado['quantidade']
+    
+    # Top N por duração total (seleção parcial, sem ordenar todos os grupos)
+    agregado = agregado.nlargest(top_n, 'duracao_total')
+    
+    return agregado[['teleobjeto_nome', 'duracao_total', 'duracao_media', 'quantidade']].reset_index(drop=True)
+
+
+def _coluna_data(dataframe: pd.DataFrame) -> pd.Series:
+    """
+    Retorna a coluna 'data' como datetime, sem alterar o DataFrame recebido.
+    
+    Só converte (pd.to_datetime) quando a coluna ainda não é datetime; datas
+    repetidas (vários alarmes no mesmo dia) são convertidas uma única vez.
+    """
+    datas = dataframe['data']
+    if datas.dtype.kind == 'M':  # datetime64 (com ou sem fuso)
+        return datas
+    return pd.to_datetime(datas, format='ISO8601', cache=True)
 
 
 def agregar_por_dia(dataframe: pd.DataFrame) -> pd.DataFrame:
@@ -156,22 +193,13 @@ def agregar_por_dia(dataframe: pd.DataFrame) -> pd.DataFrame:
     if dataframe.empty:
         return pd.DataFrame()
     
-    # Converter data para datetime se necessário
-    if not pd.api.types.is_datetime64_any_dtype(dataframe['data']):
-        dataframe['data'] = pd.to_datetime(dataframe['data'])
-    
-    # Agrupar por data
-    agregado = dataframe.groupby('data').agg({
-        'duracao_minutos': ['sum', 'count']
-    }).reset_index()
-    
-    # Renomear colunas
-    agregado.columns = ['data', 'duracao_total', 'quantidade']
-    
-    # Ordenar por data
-    agregado = agregado.sort_values('data')
+    # Agrupar por data (groupby já devolve as chaves ordenadas)
+    agregado = dataframe.groupby(_coluna_data(dataframe)).agg(
+        duracao_total=('duracao_minutos', 'sum'),
+        quantidade=('duracao_minutos', 'count')
+    )
     
-    return agregado
+    return agregado.reset_index()
 
 
 def agregar_por_mes(dataframe: pd.DataFrame) -> pd.DataFrame:
@@ -195,26 +223,21 @@ def agregar_por_mes(dataframe: pd.DataFrame) -> pd.DataFrame:
     if dataframe.empty:
         return pd.DataFrame()
     
-    # Converter data para datetime se necessário
-    if not pd.api.types.is_datetime64_any_dtype(dataframe['data']):
-        dataframe['data'] = pd.to_datetime(dataframe['data'])
-    
-    # Extrair ano-mês
-    dataframe['ano_mes'] = dataframe['data'].dt.to_period('M')
-    
-    # Agrupar por mês
-    agregado = dataframe.groupby('ano_mes').agg({
-        'duracao_minutos': ['sum', 'count']
-    }).reset_index()
-    
-    # Renomear colunas
-    agregado.columns = ['ano_mes', 'duracao_total', 'quantidade']
+    # Truncar para o mês com um único cast vetorizado (sem criar Period por linha)
+    datas = _coluna_data(dataframe).dt.tz_localize(None)
+    ano_mes = datas.to_numpy().astype('datetime64[M]')
     
-    # Formatar ano_mes como string
-    agregado['ano_mes'] = agregado['ano_mes'].astype(str)
+    # Agrupar em um DataFrame temporário, sem tocar no DataFrame de entrada
+    agregado = pd.DataFrame({
+        'ano_mes': ano_mes,
+        'duracao_minutos': dataframe['duracao_minutos'].to_numpy()
+    }).groupby('ano_mes').agg(
+        duracao_total=('duracao_minutos', 'sum'),
+        quantidade=('duracao_minutos', 'count')
+    ).reset_index()
     
-    # Ordenar por mês
-    agregado = agregado.sort_values('ano_mes')
+    # Formatar ano_mes como string "AAAA-MM" (poucos grupos, conversão barata)
+    agregado['ano_mes'] = np.datetime_as_string(agregado['ano_mes'].to_numpy(), unit='M')
     
     return agregado
 
@@ -249,17 +272,20 @@ def calcular_ranking(
     if dataframe.empty:
         return pd.DataFrame()
     
-    # Ordenar
-    df_ordenado = dataframe.sort_values(
-        coluna_ordenacao, 
-        ascending=ordem_crescente
-    )
-    
-    # Adicionar coluna de posição
-    df_ordenado['posicao'] = range(1, len(df_ordenado) + 1)
-    
-    # Selecionar colunas e limitar
-    colunas_final = ['posicao'] + colunas_exibicao
-    df_resultado = df_ordenado[colunas_final].head(limite)
-    
-    return df_resultado.reset_index(drop=True)
+    # Top N por seleção parcial quando possível (nlargest/nsmallest só aceitam colunas numéricas)
+    if limite < len(dataframe) and pd.api.types.is_numeric_dtype(dataframe[coluna_ordenacao]):
+        if ordem_crescente:
+            df_ordenado = dataframe.nsmallest(limite, coluna_ordenacao)
+        else:
+            df_ordenado = dataframe.nlargest(limite, coluna_ordenacao)
+    else:
+        df_ordenado = dataframe.sort_values(
+            coluna_ordenacao, 
+            ascending=ordem_crescente
+        ).head(limite)
+    
+    # Selecionar colunas e adicionar posição
+    df_resultado = df_ordenado[colunas_exibicao].reset_index(drop=True)
+    df_resultado.insert(0, 'posicao', np.arange(1, len(df_resultado) + 1, dtype=np.int64))
+    
+    return df_resultado
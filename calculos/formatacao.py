@@ -6,8 +6,15 @@ e percentuais para exibição amigável ao usuário.
 """
 
 from typing import Union
+from datetime import datetime
 import math
 
+import numpy as np
+import pandas as pd
+
+# Tabela de tradução "1,234.56" -> "1.234,56" (milhares com ponto, decimais com vírgula)
+_TROCA_SEPARADORES_BR = str.maketrans({",": ".", ".": ","})
+
 
 def formatar_tempo_minutos(minutos: float) -> str:
     """
@@ -31,27 +38,71 @@ def formatar_tempo_minutos(minutos: float) -> str:
     if minutos == 0:
         return "0 minutos"
     
-    # Converter para valores inteiros
-    minutos_totais = int(minutos)
+    # Calcular dias, horas e minutos (1 dia = 1440 minutos)
+    dias, resto = divmod(int(minutos), 1440)
+    horas, mins = divmod(resto, 60)
     
-    # Calcular dias, horas e minutos
-    dias = minutos_totais // 1440  # 1 dia = 1440 minutos
-    horas = (minutos_totais % 1440) // 60
-    mins = minutos_totais % 60
+    # Construir string formatada (minutos aparecem também quando é a única parte)
+    partes = [
+        *((f"{dias} dia" if dias == 1 else f"{dias} dias",) if dias > 0 else ()),
+        *((f"{horas} hora" if horas == 1 else f"{horas} horas",) if horas > 0 else ()),
+    ]
+    
+    if mins > 0 or not partes:
+        partes.append(f"{mins} minuto" if mins == 1 else f"{mins} minutos")
+    
+    return ", ".join(partes)
+
+
+def formatar_tempo_minutos_vec(minutos: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `formatar_tempo_minutos` para arrays/colunas inteiras.
     
-    # Construir string formatada
-    partes = []
+    Faz o cálculo de dias, horas e minutos com operações do NumPy em vez
+    de chamar a função Python linha a linha. Valores nulos (NaN) são
+    tratados como 0.
     
-    if dias > 0:
-        partes.append(f"{dias} dia" if dias == 1 else f"{dias} dias")
+    Parâmetros:
+        minutos: Array com tempos em minutos
     
-    if horas > 0:
-        partes.append(f"{horas} hora" if horas == 1 else f"{horas} horas")
+    Retorna:
+        np.ndarray: Array de strings no padrão "X dias, Y horas, Z minutos"
     
-    if mins > 0 or len(partes) == 0:
-        partes.append(f"{mins} minuto" if mins == 1 else f"{mins} minutos")
+    Exemplo:
+        >>> formatar_tempo_minutos_vec(np.array([1500, 65, 0]))
+        array(['1 dia, 1 hora', '1 hora, 5 minutos', '0 minutos'], dtype='<U...')
+    """
+    minutos_totais = np.trunc(np.nan_to_num(np.asarray(minutos, dtype=float))).astype(np.int64)
     
-    return ", ".join(partes)
+    if minutos_totais.size == 0:
+        return np.array([], dtype=str)
+    
+    # Calcular dias, horas e minutos
+    dias = minutos_totais // 1440  # 1 dia = 1440 minutos
+    horas = (minutos_totais % 1440) // 60
+    mins = minutos_totais % 60
+    
+    def construir_parte(valores, singular, plural, exibir):
+        texto = np.where(
+            valores == 1,
+            f"1 {singular}",
+            np.char.add(valores.astype(str), f" {plural}")
+        )
+        return np.where(exibir, texto, "")
+    
+    partes = [
+        construir_parte(dias, "dia", "dias", dias > 0),
+        construir_parte(horas, "hora", "horas", horas > 0),
+        construir_parte(mins, "minuto", "minutos", (mins > 0) | ((dias == 0) & (horas == 0))),
+    ]
+    
+    # Juntar as partes com ", " apenas entre partes não vazias
+    resultado = partes[0]
+    for parte in partes[1:]:
+        separador = np.where((resultado != "") & (parte != ""), ", ", "")
+        resultado = np.char.add(np.char.add(resultado, separador), parte)
+    
+    return resultado
 
 
 def formatar_tempo_horas(horas: float) -> str:
@@ -95,29 +146,62 @@ def formatar_tempo_compacto(minutos: float) -> str:
     if minutos == 0:
         return "0m"
     
-    # Converter para valores inteiros
-    minutos_totais = int(minutos)
-    
     # Calcular dias, horas e minutos
-    dias = minutos_totais // 1440
-    horas = (minutos_totais % 1440) // 60
-    mins = minutos_totais % 60
+    dias, resto = divmod(int(minutos), 1440)
+    horas, mins = divmod(resto, 60)
     
-    # Construir string formatada
-    partes = []
+    # Construir string formatada (minutos aparecem também quando é a única parte)
+    partes = [
+        *((f"{dias}d",) if dias > 0 else ()),
+        *((f"{horas}h",) if horas > 0 else ()),
+    ]
     
-    if dias > 0:
-        partes.append(f"{dias}d")
-    
-    if horas > 0:
-        partes.append(f"{horas}h")
-    
-    if mins > 0 or len(partes) == 0:
+    if mins > 0 or not partes:
         partes.append(f"{mins}m")
     
     return " ".join(partes)
 
 
+def formatar_tempo_compacto_vec(minutos: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `formatar_tempo_compacto` para arrays/colunas inteiras.
+    
+    Valores nulos (NaN) são tratados como 0.
+    
+    Parâmetros:
+        minutos: Array com tempos em minutos
+    
+    Retorna:
+        np.ndarray: Array de strings no padrão compacto "Xd Yh Zm"
+    
+    Exemplo:
+        >>> formatar_tempo_compacto_vec(np.array([1500, 65, 0]))
+        array(['1d 1h', '1h 5m', '0m'], dtype='<U...')
+    """
+    minutos_totais = np.trunc(np.nan_to_num(np.asarray(minutos, dtype=float))).astype(np.int64)
+    
+    if minutos_totais.size == 0:
+        return np.array([], dtype=str)
+    
+    # Calcular dias, horas e minutos
+    dias, resto = np.divmod(minutos_totais, 1440)
+    horas, mins = np.divmod(resto, 60)
+    
+    partes = [
+        np.where(dias > 0, np.char.add(dias.astype(str), "d"), ""),
+        np.where(horas > 0, np.char.add(horas.astype(str), "h"), ""),
+        np.where((mins > 0) | ((dias == 0) & (horas == 0)), np.char.add(mins.astype(str), "m"), ""),
+    ]
+    
+    # Juntar as partes com " " apenas entre partes não vazias
+    resultado = partes[0]
+    for parte in partes[1:]:
+        separador = np.where((resultado != "") & (parte != ""), " ", "")
+        resultado = np.char.add(np.char.add(resultado, separador), parte)
+    
+    return resultado
+
+
 def formatar_numero(numero: Union[int, float], casas_decimais: int = 0) -> str:
     """
     Formata número com separador de milhares.
@@ -140,12 +224,9 @@ def formatar_numero(numero: Union[int, float], casas_decimais: int = 0) -> str:
     """
     if casas_decimais == 0:
         return f"{int(numero):,}".replace(",", ".")
-    else:
-        # Formatar com casas decimais
-        numero_str = f"{numero:,.{casas_decimais}f}"
-        # Substituir separadores para padrão brasileiro
-        numero_str = numero_str.replace(",", "_").replace(".", ",").replace("_", ".")
-        return numero_str
+    
+    # Trocar separadores para o padrão brasileiro em uma única passada
+    return f"{numero:,.{casas_decimais}f}".translate(_TROCA_SEPARADORES_BR)
 
 
 def formatar_percentual(valor: float, casas_decimais: int = 2) -> str:
@@ -197,16 +278,15 @@ def formatar_duracao_para_grafico(minutos: float) -> str:
     
     # Se for mais de 24 horas, mostrar em dias
     if minutos_totais >= 1440:
-        dias = minutos_totais // 1440
-        horas = (minutos_totais % 1440) // 60
+        dias, resto = divmod(minutos_totais, 1440)
+        horas = resto // 60
         if horas > 0:
             return f"{dias}d {horas}h"
         return f"{dias}d"
     
     # Se for mais de 1 hora, mostrar em horas e minutos
     if minutos_totais >= 60:
-        horas = minutos_totais // 60
-        mins = minutos_totais % 60
+        horas, mins = divmod(minutos_totais, 60)
         if mins > 0:
             return f"{horas}h {mins}m"
         return f"{horas}h"
@@ -215,6 +295,57 @@ def formatar_duracao_para_grafico(minutos: float) -> str:
     return f"{minutos_totais}m"
 
 
+def formatar_duracao_para_grafico_vec(minutos: np.ndarray) -> np.ndarray:
+    """
+    Versão vetorizada de `formatar_duracao_para_grafico` para arrays/colunas inteiras.
+    
+    Valores nulos (NaN) são tratados como 0.
+    
+    Parâmetros:
+        minutos: Array com tempos em minutos
+    
+    Retorna:
+        np.ndarray: Array de strings no formato curto dos gráficos
+    
+    Exemplo:
+        >>> formatar_duracao_para_grafico_vec(np.array([125, 45, 1500]))
+        array(['2h 5m', '45m', '1d 1h'], dtype='<U...')
+    """
+    minutos_totais = np.trunc(np.nan_to_num(np.asarray(minutos, dtype=float))).astype(np.int64)
+    
+    if minutos_totais.size == 0:
+        return np.array([], dtype=str)
+    
+    dias, resto = np.divmod(minutos_totais, 1440)
+    horas_do_dia = resto // 60
+    horas, mins = np.divmod(minutos_totais, 60)
+    
+    # Mais de 24 horas: "Xd Yh" (ou "Xd")
+    texto_dias = np.char.add(dias.astype(str), "d")
+    texto_dias = np.where(
+        horas_do_dia > 0,
+        np.char.add(np.char.add(texto_dias, " "), np.char.add(horas_do_dia.astype(str), "h")),
+        texto_dias
+    )
+    
+    # Mais de 1 hora: "Xh Ym" (ou "Xh")
+    texto_horas = np.char.add(horas.astype(str), "h")
+    texto_horas = np.where(
+        mins > 0,
+        np.char.add(np.char.add(texto_horas, " "), np.char.add(mins.astype(str), "m")),
+        texto_horas
+    )
+    
+    # Menos de 1 hora: "Xm"
+    texto_minutos = np.char.add(minutos_totais.astype(str), "m")
+    
+    return np.where(
+        minutos_totais >= 1440,
+        texto_dias,
+        np.where(minutos_totais >= 60, texto_horas, texto_minutos)
+    )
+
+
 def formatar_data_brasileira(data_str: str) -> str:
     """
     Formata data para padrão brasileiro DD/MM/YYYY.
@@ -230,18 +361,21 @@ def formatar_data_brasileira(data_str: str) -> str:
         >>> print(data)
         "15/06/2025"
     """
-    from datetime import datetime
-    
-    # Se já é um objeto datetime
+    # Se já é um objeto datetime (inclui pd.Timestamp)
     if isinstance(data_str, datetime):
         return data_str.strftime("%d/%m/%Y")
     
-    # Se é string, tentar parsear
+    texto = str(data_str)
+    
+    # Caminho rápido: string ISO "YYYY-MM-DD..." é só recortada, sem parsear
+    if _eh_data_iso(texto):
+        return f"{texto[8:10]}/{texto[5:7]}/{texto[0:4]}"
+    
+    # Outros formatos: tentar parsear
     try:
-        data = datetime.fromisoformat(str(data_str))
-        return data.strftime("%d/%m/%Y")
-    except:
-        return str(data_str)
+        return datetime.fromisoformat(texto).strftime("%d/%m/%Y")
+    except ValueError:
+        return texto
 
 
 def formatar_data_hora_brasileira(data_str: str) -> str:
@@ -259,18 +393,91 @@ def formatar_data_hora_brasileira(data_str: str) -> str:
         >>> print(data_hora)
         "15/06/2025 14:30"
     """
-    from datetime import datetime
-    
-    # Se já é um objeto datetime
+    # Se já é um objeto datetime (inclui pd.Timestamp)
     if isinstance(data_str, datetime):
         return data_str.strftime("%d/%m/%Y %H:%M")
     
-    # Se é string, tentar parsear
+    texto = str(data_str)
+    
+    # Caminho rápido: string ISO "YYYY-MM-DD HH:MM..." é só recortada, sem parsear
+    if len(texto) >= 16 and _eh_data_iso(texto) and texto[10] in " T" and texto[13] == ":":
+        return f"{texto[8:10]}/{texto[5:7]}/{texto[0:4]} {texto[11:16]}"
+    
+    # Outros formatos: tentar parsear
     try:
-        data = datetime.fromisoformat(str(data_str))
-        return data.strftime("%d/%m/%Y %H:%M")
-    except:
-        return str(data_str)
+        return datetime.fromisoformat(texto).strftime("%d/%m/%Y %H:%M")
+    except ValueError:
+        return texto
+
+
+def formatar_data_brasileira_vec(datas: pd.Series, texto_nulo: str = "-") -> pd.Series:
+    """
+    Versão vetorizada de `formatar_data_brasileira` para colunas inteiras.
+    
+    Parâmetros:
+        datas: Série com datas (datetime64 ou strings ISO)
+        texto_nulo: Texto usado para valores nulos (padrão: "-")
+    
+    Retorna:
+        pd.Series: Série de strings no formato DD/MM/YYYY
+    
+    Exemplo:
+        >>> formatar_data_brasileira_vec(pd.Series(["2025-06-15", None]))
+        0    15/06/2025
+        1             -
+        dtype: object
+    """
+    return _formatar_datas_vec(datas, "%d/%m/%Y", texto_nulo)
+
+
+def formatar_data_hora_brasileira_vec(datas: pd.Series, texto_nulo: str = "-") -> pd.Series:
+    """
+    Versão vetorizada de `formatar_data_hora_brasileira` para colunas inteiras.
+    
+    Parâmetros:
+        datas: Série com datas/horas (datetime64 ou strings ISO)
+        texto_nulo: Texto usado para valores nulos (padrão: "-")
+    
+    Retorna:
+        pd.Series: Série de strings no formato DD/MM/YYYY HH:MM
+    
+    Exemplo:
+        >>> formatar_data_hora_brasileira_vec(pd.Series(["2025-06-15 14:30:00", None]))
+        0    15/06/2025 14:30
+        1                   -
+        dtype: object
+    """
+    return _formatar_datas_vec(datas, "%d/%m/%Y %H:%M", texto_nulo)
+
+
+def _formatar_datas_vec(datas: pd.Series, formato: str, texto_nulo: str) -> pd.Series:
+    """
+    Aplica `formato` (strftime) à coluna inteira de uma vez.
+    
+    Valores nulos viram `texto_nulo`; textos que não são datas são mantidos
+    como estão, assim como nas versões escalares.
+    """
+    if datas.dtype.kind == "M":  # datetime64 (com ou sem fuso)
+        return datas.dt.strftime(formato).fillna(texto_nulo)
+    
+    convertidas = pd.to_datetime(datas, errors="coerce", format="ISO8601")
+    return (
+        convertidas.dt.strftime(formato)
+        .fillna(datas.astype(str).where(datas.notna()))
+        .fillna(texto_nulo)
+    )
+
+
+def _eh_data_iso(texto: str) -> bool:
+    """Indica se o texto começa com uma data ISO "YYYY-MM-DD"."""
+    return (
+        len(texto) >= 10
+        and texto[4] == "-"
+        and texto[7] == "-"
+        and texto[0:4].isdigit()
+        and texto[5:7].isdigit()
+        and texto[8:10].isdigit()
+    )
 
 
 def abreviar_texto(texto: str, tamanho_maximo: int = 50) -> str:
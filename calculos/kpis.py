@@ -5,10 +5,23 @@ Este módulo contém funções para calcular os principais indicadores
 de performance (KPIs) do sistema de análise de alarmes.
 """
 
-from typing import Dict, Any, List
+from typing import List, NamedTuple
+import numpy as np
 import pandas as pd
 
 
+class KPIsPrincipais(NamedTuple):
+    """
+    KPIs principais de uma usina/período (imutável, acesso por atributo).
+    
+    Use `._asdict()` quando precisar do formato de dicionário.
+    """
+    total_alarmes: int
+    tempo_total_minutos: float
+    tempo_medio_por_alarme: float
+    tempo_medio_reconhecimento: float
+
+
 def calcular_tempo_medio_por_alarme(tempo_total_minutos: float, total_alarmes: int) -> float:
     """
     Calcula o tempo médio por alarme.
@@ -31,11 +44,40 @@ def calcular_tempo_medio_por_alarme(tempo_total_minutos: float, total_alarmes: i
     return tempo_total_minutos / total_alarmes
 
 
+def calcular_tempo_medio_por_alarme_vec(
+    tempo_total_minutos: np.ndarray,
+    total_alarmes: np.ndarray
+) -> np.ndarray:
+    """
+    Versão vetorizada de `calcular_tempo_medio_por_alarme` para colunas inteiras.
+    
+    Parâmetros:
+        tempo_total_minutos: Array com o tempo total (minutos) de cada linha
+        total_alarmes: Array com o total de alarmes de cada linha
+    
+    Retorna:
+        np.ndarray: Tempo médio por alarme (0.0 onde não há alarmes)
+    
+    Exemplo:
+        >>> calcular_tempo_medio_por_alarme_vec(np.array([1000.0, 0.0]), np.array([50, 0]))
+        array([20.,  0.])
+    """
+    tempo_total = np.asarray(tempo_total_minutos, dtype=float)
+    total = np.asarray(total_alarmes, dtype=float)
+    
+    return np.divide(
+        tempo_total,
+        total,
+        out=np.zeros_like(tempo_total),
+        where=total != 0
+    )
+
+
 def calcular_kpis_principais(
     total_alarmes: int,
     tempo_total_minutos: float,
     tempo_medio_reconhecimento_minutos: float
-) -> Dict[str, Any]:
+) -> KPIsPrincipais:
     """
     Calcula todos os KPIs principais do sistema.
     
@@ -45,7 +87,7 @@ def calcular_kpis_principais(
         tempo_medio_reconhecimento_minutos: Tempo médio de reconhecimento (minutos)
     
     Retorna:
-        Dict contendo:
+        KPIsPrincipais contendo:
             - total_alarmes: Total de alarmes
             - tempo_total_minutos: Tempo total em minutos
             - tempo_medio_por_alarme: Tempo médio por alarme
@@ -53,25 +95,22 @@ def calcular_kpis_principais(
     
     Exemplo:
         >>> kpis = calcular_kpis_principais(100, 5000.0, 30.5)
-        >>> print(kpis)
-        {
-            'total_alarmes': 100,
-            'tempo_total_minutos': 5000.0,
-            'tempo_medio_por_alarme': 50.0,
-            'tempo_medio_reconhecimento': 30.5
-        }
+        >>> kpis
+        KPIsPrincipais(total_alarmes=100, tempo_total_minutos=5000.0, tempo_medio_por_alarme=50.0, tempo_medio_reconhecimento=30.5)
+        >>> kpis.tempo_medio_por_alarme
+        50.0
     """
     tempo_medio_por_alarme = calcular_tempo_medio_por_alarme(
         tempo_total_minutos, 
         total_alarmes
     )
     
-    return {
-        'total_alarmes': total_alarmes,
-        'tempo_total_minutos': tempo_total_minutos,
-        'tempo_medio_por_alarme': tempo_medio_por_alarme,
-        'tempo_medio_reconhecimento': tempo_medio_reconhecimento_minutos,
-    }
+    return KPIsPrincipais(
+        total_alarmes=total_alarmes,
+        tempo_total_minutos=tempo_total_minutos,
+        tempo_medio_por_alarme=tempo_medio_por_alarme,
+        tempo_medio_reconhecimento=tempo_medio_reconhecimento_minutos,
+    )
 
 
 def calcular_percentual(parte: float, total: float) -> float:
@@ -216,10 +255,12 @@ def calcular_top_n_percentual(
     if dataframe.empty:
         return dataframe
     
-    # Calcula o total
-    total = dataframe[coluna_valor].sum()
+    # Calcula o total direto no array (sem alinhamento de índice do pandas)
+    valores = dataframe[coluna_valor].to_numpy()
+    total = valores.sum()
+    fator = 100.0 / total if total else 0.0
     
-    # Adiciona coluna de percentual
-    dataframe['percentual_do_total'] = (dataframe[coluna_valor] / total * 100).round(2)
-    
-    return dataframe.head(n)
+    # Adiciona coluna de percentual só nos top N, sem alterar o DataFrame recebido
+    return dataframe.head(n).assign(
+        percentual_do_total=np.round(valores[:n] * fator, 2)
+    )
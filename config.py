@@ -26,12 +26,42 @@ LIMITE_MAXIMO_MESES: Final[int] = 3
 # Quantidade de alarmes por página na tabela
 ALARMES_POR_PAGINA: Final[int] = 50
 
+# Quantidade padrão de usinas por página no ranking da HOME
+USINAS_POR_PAGINA_RANKING: Final[int] = 20
+
 # Limite de registros para rankings
 LIMITE_TOP_5: Final[int] = 5
 LIMITE_TOP_10: Final[int] = 10
 LIMITE_TOP_20: Final[int] = 20
 LIMITE_TOP_50: Final[int] = 50
 
+# Tempo (em segundos) que o resultado de cada query fica em cache
+CACHE_TTL_SEGUNDOS: Final[int] = 600
+
+# Tempo (em segundos) de cache dos dados de referência (lista de usinas)
+CACHE_TTL_REFERENCIA_SEGUNDOS: Final[int] = 3600
+
+# Tempo (em segundos) de cache dos totais de um mês fechado ainda não consolidado
+CACHE_TTL_MES_FECHADO_SEGUNDOS: Final[int] = 21600
+
+# Tabela com os totais mensais consolidados por usina (ver database/consolidacao.py)
+TABELA_CONSOLIDADA_MENSAL: Final[str] = "fato_alarmes_mensal"
+
+# Tabela com os totais diários consolidados por usina (evolução diária dos meses fechados)
+TABELA_CONSOLIDADA_DIARIA: Final[str] = "fato_alarmes_diario"
+
+# Quantidade máxima de queries executadas em paralelo (deve caber no pool de conexões)
+MAX_CONSULTAS_PARALELAS: Final[int] = 8
+
+# Tempo (em segundos) após o qual uma conexão do pool é descartada e reaberta
+TEMPO_RECICLAGEM_CONEXAO_SEGUNDOS: Final[int] = 1800
+
+# Tempo máximo (em segundos) de uma query do app (statement_timeout do PostgreSQL)
+TEMPO_LIMITE_CONSULTA_SEGUNDOS: Final[int] = 30
+
+# Linhas buscadas por vez nas leituras com cursor do lado do servidor
+TAMANHO_LOTE_LEITURA: Final[int] = 10_000
+
 # ============================================================================
 # CONFIGURAÇÕES DE SEVERIDADE
 # ============================================================================
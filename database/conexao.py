@@ -5,29 +5,54 @@ Este módulo gerencia a conexão com o PostgreSQL usando SQLAlchemy.
 Fornece funções para obter engine, sessões e testar a conexão.
 """
 
+import streamlit as st
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional
+from sqlalchemy.pool import NullPool
+from typing import Dict, Optional
+import functools
 import logging
 
-from config import DATABASE_URL
+from config import (
+    DATABASE_URL,
+    MAX_CONSULTAS_PARALELAS,
+    TEMPO_RECICLAGEM_CONEXAO_SEGUNDOS,
+    TEMPO_LIMITE_CONSULTA_SEGUNDOS,
+)
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Variáveis globais para engine e session factory
-_engine = None
-_SessionFactory = None
+# Engines já criados por obter_engine, por tipo de pool: reutilizados nas
+# chamadas seguintes, e fechar_conexao descarta só estes (sem criar um
+# engine novo apenas para fechá-lo)
+_engines_criados: Dict[str, Engine] = {}
 
+# Keepalive TCP (libpq): detecta conexões mortas sem um SELECT 1 a cada checkout
+ARGUMENTOS_KEEPALIVE = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
 
-def obter_engine():
+
+@st.cache_resource(show_spinner=False)
+def obter_engine(pool: str = "fila"):
     """
     Obtém ou cria o engine do SQLAlchemy para conexão com PostgreSQL.
     
-    Esta função implementa um padrão singleton para garantir que apenas
-    uma instância do engine seja criada durante a execução da aplicação.
+    O engine fica em `st.cache_resource`, garantindo que apenas uma
+    instância (e um único pool de conexões) seja criada por processo,
+    compartilhada entre todas as sessões e reruns do Streamlit.
+    
+    Parâmetros:
+        pool: "fila" (padrão) para o pool de conexões do app, ou "null"
+              para scripts em lote (ex: consolidação), que abrem e fecham
+              uma conexão por uso e não têm limite de tempo por query
     
     Retorna:
         Engine: Instância do engine SQLAlchemy
@@ -37,32 +62,60 @@ def obter_engine():
         >>> with engine.connect() as conexao:
         ...     resultado = conexao.execute(text("SELECT 1"))
     """
-    global _engine
+    # Fora do runtime do Streamlit (ex: cron da consolidação) o cache_resource
+    # não guarda o engine: o dicionário mantém um único engine por pool
+    if pool in _engines_criados:
+        return _engines_criados[pool]
     
-    if _engine is None:
-        try:
-            logger.info("Criando engine do SQLAlchemy...")
-            _engine = create_engine(
+    try:
+        logger.info("Criando engine do SQLAlchemy...")
+        if pool == "null":
+            engine = create_engine(
+                DATABASE_URL,
+                poolclass=NullPool,  # Sem pool: cada uso abre (e fecha) sua conexão
+                connect_args=dict(ARGUMENTOS_KEEPALIVE),
+                echo=False,
+            )
+        else:
+            engine = create_engine(
                 DATABASE_URL,
-                pool_size=10,  # Número de conexões no pool
+                pool_size=MAX_CONSULTAS_PARALELAS + 2,  # Um lote de queries paralelas + folga
                 max_overflow=20,  # Conexões extras além do pool_size
-                pool_pre_ping=True,  # Testa conexão antes de usar
+                pool_pre_ping=False,  # Sem SELECT 1 por checkout (keepalive + recycle)
+                pool_recycle=TEMPO_RECICLAGEM_CONEXAO_SEGUNDOS,
+                connect_args={
+                    **ARGUMENTOS_KEEPALIVE,
+                    "options": f"-c statement_timeout={TEMPO_LIMITE_CONSULTA_SEGUNDOS * 1000}",
+                },
                 echo=False,  # Não logar SQL (mudar para True em debug)
             )
-            logger.info("Engine criado com sucesso!")
-        except SQLAlchemyError as erro:
-            logger.error(f"Erro ao criar engine: {erro}")
-            raise
+        logger.info("Engine criado com sucesso!")
+    except SQLAlchemyError as erro:
+        logger.error(f"Erro ao criar engine: {erro}")
+        raise
+    
+    _engines_criados[pool] = engine
+    return engine
+
+
+@functools.cache
+def _obter_fabrica_sessao() -> sessionmaker:
+    """
+    Cria (uma única vez por processo) o sessionmaker ligado ao engine do app.
     
-    return _engine
+    Retorna:
+        sessionmaker: Fábrica de sessões do SQLAlchemy
+    """
+    return sessionmaker(bind=obter_engine())
 
 
 def obter_sessao() -> Session:
     """
     Obtém uma nova sessão do SQLAlchemy para executar queries.
     
-    Esta função cria uma nova sessão a partir do SessionFactory.
-    É importante sempre fechar a sessão após o uso (use with statement).
+    Esta função cria uma nova sessão a partir do sessionmaker em cache.
+    A Session é um context manager: usada com `with`, é fechada ao final
+    do bloco mesmo em caso de erro.
     
     Retorna:
         Session: Nova sessão do SQLAlchemy
@@ -73,13 +126,7 @@ def obter_sessao() -> Session:
         ...     for usina in usinas:
         ...         print(usina.nome)
     """
-    global _SessionFactory
-    
-    if _SessionFactory is None:
-        engine = obter_engine()
-        _SessionFactory = sessionmaker(bind=engine)
-    
-    return _SessionFactory()
+    return _obter_fabrica_sessao()()
 
 
 def testar_conexao() -> bool:
@@ -112,7 +159,8 @@ def testar_conexao() -> bool:
 
 def fechar_conexao():
     """
-    Fecha todas as conexões do pool e descarta o engine.
+    Fecha todas as conexões do pool e descarta os engines já criados
+    (o do app e o de scripts em lote, pool="null").
     
     Esta função deve ser chamada ao finalizar a aplicação para
     liberar recursos de forma adequada.
@@ -120,10 +168,9 @@ def fechar_conexao():
     Exemplo:
         >>> fechar_conexao()
     """
-    global _engine, _SessionFactory
-    
-    if _engine is not None:
-        _engine.dispose()
-        _engine = None
-        _SessionFactory = None
-        logger.info("Conexões fechadas com sucesso.")
+    while _engines_criados:
+        _, engine = _engines_criados.popitem()
+        engine.dispose()
+    obter_engine.clear()
+    _obter_fabrica_sessao.cache_clear()
+    logger.info("Conexões fechadas com sucesso.")
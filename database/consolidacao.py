@@ -0,0 +1,433 @@
+"""
+Módulo de Consolidação Mensal
+
+Este módulo mantém a tabela `fato_alarmes_mensal`, com os totais de alarmes
+de cada usina por mês. A página HOME e os KPIs da análise leem os meses
+fechados dessa tabela em vez de reagregar todas as tabelas
+`alarm_{usina_id}_{ano}_{mes}` a cada acesso.
+
+Na mesma execução também é mantida a `fato_alarmes_diario`, com os totais de
+cada usina por dia, usada na evolução diária da página de análise, e são
+criados os índices dos rankings nas tabelas de alarmes do mês anterior e do
+mês atual.
+
+Cada execução também consolida de novo os meses que ainda tinham alarmes
+abertos: enquanto isso, o app agrega esses meses ao vivo.
+
+Deve ser executado periodicamente (ex: cron noturno):
+
+    python -m database.consolidacao            # consolida o mês anterior
+    python -m database.consolidacao 2025 6     # consolida um mês específico
+    python -m database.consolidacao --indices  # indexa todas as tabelas de alarmes
+"""
+
+from sqlalchemy import text
+from typing import List, Optional, Tuple
+from datetime import datetime
+import logging
+import sys
+
+from .conexao import obter_engine
+from .queries import listar_tabelas_alarme_periodos
+from config import TABELA_CONSOLIDADA_MENSAL, TABELA_CONSOLIDADA_DIARIA
+from utils.helpers import Periodos
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# ESTRUTURA DA TABELA CONSOLIDADA
+# ============================================================================
+
+# Alarmes ainda abertos não têm duração fixa (dependem de NOW() e podem ser
+# finalizados depois), então a tabela guarda a quantidade de abertos e a soma
+# dos seus inícios em epoch. Os meses com alarmes_abertos > 0 não são usados
+# pelo app (são agregados ao vivo) e são consolidados de novo a cada execução
+SQL_CRIAR_TABELA_CONSOLIDADA = f"""
+    CREATE TABLE IF NOT EXISTS public.{TABELA_CONSOLIDADA_MENSAL} (
+        usina_id INTEGER NOT NULL,
+        ano INTEGER NOT NULL,
+        mes INTEGER NOT NULL,
+        total_alarmes BIGINT NOT NULL,
+        tempo_fechado_minutos DOUBLE PRECISION NOT NULL,
+        alarmes_abertos BIGINT NOT NULL,
+        soma_inicio_abertos_epoch DOUBLE PRECISION NOT NULL,
+        tempo_reconhecimento_minutos DOUBLE PRECISION,
+        alarmes_reconhecidos BIGINT,
+        atualizado_em TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (usina_id, ano, mes)
+    )
+"""
+
+# Tabelas criadas antes das colunas de reconhecimento: linhas antigas ficam
+# com NULL e são ignoradas pelos KPIs até o mês ser consolidado de novo
+SQL_MIGRAR_TABELA_CONSOLIDADA = f"""
+    ALTER TABLE public.{TABELA_CONSOLIDADA_MENSAL}
+        ADD COLUMN IF NOT EXISTS tempo_reconhecimento_minutos DOUBLE PRECISION,
+        ADD COLUMN IF NOT EXISTS alarmes_reconhecidos BIGINT
+"""
+
+# Mesmos totais, quebrados por dia de início do alarme (DATE(date_time))
+SQL_CRIAR_TABELA_CONSOLIDADA_DIARIA = f"""
+    CREATE TABLE IF NOT EXISTS public.{TABELA_CONSOLIDADA_DIARIA} (
+        usina_id INTEGER NOT NULL,
+        ano INTEGER NOT NULL,
+        mes INTEGER NOT NULL,
+        data DATE NOT NULL,
+        total_alarmes BIGINT NOT NULL,
+        tempo_fechado_minutos DOUBLE PRECISION NOT NULL,
+        alarmes_abertos BIGINT NOT NULL,
+        soma_inicio_abertos_epoch DOUBLE PRECISION NOT NULL,
+        atualizado_em TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (usina_id, ano, mes, data)
+    )
+"""
+
+
+def criar_tabela_consolidada() -> bool:
+    """
+    Cria as tabelas consolidadas (mensal e diária), caso ainda não existam.
+    
+    Retorna:
+        bool: True se as tabelas existem ao final, False em caso de erro
+    
+    Exemplo:
+        >>> criar_tabela_consolidada()
+        True
+    """
+    try:
+        engine = obter_engine(pool="null")
+        with engine.begin() as conexao:
+            conexao.execute(text(SQL_CRIAR_TABELA_CONSOLIDADA))
+            conexao.execute(text(SQL_MIGRAR_TABELA_CONSOLIDADA))
+            conexao.execute(text(SQL_CRIAR_TABELA_CONSOLIDADA_DIARIA))
+        return True
+    except Exception as erro:
+        logger.error(f"Erro ao criar tabela consolidada: {erro}")
+        return False
+
+
+# ============================================================================
+# CONSOLIDAÇÃO
+# ============================================================================
+
+def consolidar_periodo(ano: int, mes: int) -> int:
+    """
+    Recalcula os totais de um mês para todas as usinas com tabela de alarmes.
+    
+    Linhas já existentes para o mesmo (usina, ano, mês) são sobrescritas,
+    então a função pode ser executada novamente sem duplicar dados.
+    
+    Parâmetros:
+        ano: Ano (ex: 2025)
+        mes: Mês (1-12)
+    
+    Retorna:
+        int: Quantidade de usinas consolidadas
+    
+    Exemplo:
+        >>> consolidar_periodo(2025, 6)
+        55
+    """
+    if not criar_tabela_consolidada():
+        return 0
+    
+    tabelas = listar_tabelas_alarme_periodos(((ano, mes),))
+    
+    try:
+        engine = obter_engine(pool="null")
+        with engine.begin() as conexao:
+            for tabela in tabelas:
+                query_sql = f"""
+                    INSERT INTO public.{TABELA_CONSOLIDADA_MENSAL} (
+                        usina_id, ano, mes, total_alarmes, tempo_fechado_minutos,
+                        alarmes_abertos, soma_inicio_abertos_epoch,
+                        tempo_reconhecimento_minutos, alarmes_reconhecidos, atualizado_em
+                    )
+                    SELECT
+                        :usina_id,
+                        :ano,
+                        :mes,
+                        COUNT(a.id),
+                        COALESCE(SUM(
+                            EXTRACT(EPOCH FROM (a.clear_date - a.date_time)) / 60
+                        ) FILTER (WHERE a.clear_date IS NOT NULL), 0),
+                        COUNT(a.id) FILTER (WHERE a.clear_date IS NULL),
+                        COALESCE(SUM(
+                            EXTRACT(EPOCH FROM a.date_time::TIMESTAMPTZ)
+                        ) FILTER (WHERE a.clear_date IS NULL), 0),
+                        COALESCE(SUM(
+                            EXTRACT(EPOCH FROM (a.acknowledgement_date - a.date_time)) / 60
+                        ) FILTER (WHERE a.acknowledgement_date IS NOT NULL), 0),
+                        COUNT(a.id) FILTER (WHERE a.acknowledgement_date IS NOT NULL),
+                        NOW()
+                    FROM public.{tabela['nome_tabela']} a
+                    WHERE a.power_station_id = :usina_id
+                    ON CONFLICT (usina_id, ano, mes) DO UPDATE SET
+                        total_alarmes = EXCLUDED.total_alarmes,
+                        tempo_fechado_minutos = EXCLUDED.tempo_fechado_minutos,
+                        alarmes_abertos = EXCLUDED.alarmes_abertos,
+                        soma_inicio_abertos_epoch = EXCLUDED.soma_inicio_abertos_epoch,
+                        tempo_reconhecimento_minutos = EXCLUDED.tempo_reconhecimento_minutos,
+                        alarmes_reconhecidos = EXCLUDED.alarmes_reconhecidos,
+                        atualizado_em = EXCLUDED.atualizado_em
+                """
+                parametros = {"usina_id": tabela['usina_id'], "ano": ano, "mes": mes}
+                conexao.execute(text(query_sql), parametros)
+                
+                # Totais diários: o mês é regravado inteiro (dias sem alarme somem)
+                conexao.execute(text(f"""
+                    DELETE FROM public.{TABELA_CONSOLIDADA_DIARIA}
+                    WHERE usina_id = :usina_id AND ano = :ano AND mes = :mes
+                """), parametros)
+                conexao.execute(text(f"""
+                    INSERT INTO public.{TABELA_CONSOLIDADA_DIARIA} (
+                        usina_id, ano, mes, data, total_alarmes, tempo_fechado_minutos,
+                        alarmes_abertos, soma_inicio_abertos_epoch, atualizado_em
+                    )
+                    SELECT
+                        :usina_id,
+                        :ano,
+                        :mes,
+                        DATE(a.date_time),
+                        COUNT(a.id),
+                        COALESCE(SUM(
+                            EXTRACT(EPOCH FROM (a.clear_date - a.date_time)) / 60
+                        ) FILTER (WHERE a.clear_date IS NOT NULL), 0),
+                        COUNT(a.id) FILTER (WHERE a.clear_date IS NULL),
+                        COALESCE(SUM(
+                            EXTRACT(EPOCH FROM a.date_time::TIMESTAMPTZ)
+                        ) FILTER (WHERE a.clear_date IS NULL), 0),
+                        NOW()
+                    FROM public.{tabela['nome_tabela']} a
+                    WHERE a.power_station_id = :usina_id
+                    GROUP BY DATE(a.date_time)
+                """), parametros)
+        logger.info(f"Período {ano}/{mes:02d} consolidado para {len(tabelas)} usinas")
+        return len(tabelas)
+    except Exception as erro:
+        logger.error(f"Erro ao consolidar período {ano}/{mes:02d}: {erro}")
+        return 0
+
+
+def listar_periodos_com_alarmes_abertos() -> List[Tuple[int, int]]:
+    """
+    Lista os meses consolidados que ainda tinham alarmes abertos.
+    
+    Retorna:
+        List[Tuple[int, int]]: (ano, mes) em ordem; vazia se a tabela não existir
+    
+    Exemplo:
+        >>> listar_periodos_com_alarmes_abertos()
+        [(2025, 4), (2025, 5)]
+    """
+    query = text(f"""
+        SELECT DISTINCT ano, mes
+        FROM public.{TABELA_CONSOLIDADA_MENSAL}
+        WHERE alarmes_abertos > 0
+        ORDER BY ano, mes
+    """)
+    
+    try:
+        engine = obter_engine(pool="null")
+        with engine.connect() as conexao:
+            if conexao.execute(
+                text("SELECT to_regclass(:nome_tabela)"),
+                {"nome_tabela": f"public.{TABELA_CONSOLIDADA_MENSAL}"}
+            ).scalar() is None:
+                return []
+            return [(int(ano), int(mes)) for ano, mes in conexao.execute(query)]
+    except Exception as erro:
+        logger.error(f"Erro ao listar meses com alarmes abertos: {erro}")
+        return []
+
+
+# ============================================================================
+# ÍNDICES DAS TABELAS DE ALARMES
+# ============================================================================
+
+# Os rankings filtram a usina e agrupam por equipamento ou teleobjeto, lendo
+# só id (COUNT), date_time e clear_date: com essas colunas no INCLUDE, o
+# PostgreSQL responde com index-only scan, sem ler as linhas da tabela. Os
+# demais índices seguem o filtro de cada seção (severidade, não finalizados, lista)
+SQL_CRIAR_INDICES_ALARME = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS {tabela}_equipamento_idx "
+    "ON public.{tabela} (power_station_id, equipment_id) INCLUDE (id, date_time, clear_date)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS {tabela}_teleobjeto_idx "
+    "ON public.{tabela} (power_station_id, tele_object_id) INCLUDE (id, date_time, clear_date)",
+    # Seções de críticos e distribuição por severidade (alarm_severity_id = 1 / GROUP BY)
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS {tabela}_severidade_idx "
+    "ON public.{tabela} (power_station_id, alarm_severity_id) "
+    "INCLUDE (id, equipment_id, tele_object_id, date_time, clear_date)",
+    # Alarmes não finalizados: índice parcial, só com as linhas clear_date IS NULL
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS {tabela}_nao_finalizados_idx "
+    "ON public.{tabela} (power_station_id) INCLUDE (id, equipment_id, date_time) "
+    "WHERE clear_date IS NULL",
+    # Lista de alarmes: cada tabela é lida de trás para frente no índice, com o
+    # cursor (date_time, id) como condição do index scan, e para no LIMIT da
+    # página (as linhas da página ainda vêm da tabela). O COUNT da lista e a
+    # evolução diária ao vivo (clear_date no INCLUDE) podem usar index-only scan
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS {tabela}_data_idx "
+    "ON public.{tabela} (power_station_id, date_time, id) INCLUDE (clear_date)",
+)
+
+# O filtro "sem comunicação" é um ILIKE '%...%', que só usa índice de
+# trigramas (extensão pg_trgm); sem a extensão, o índice não é criado
+SQL_CRIAR_EXTENSAO_TRIGRAMAS = "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+SQL_CRIAR_INDICE_DESCRICAO = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS {tabela}_descricao_trgm_idx "
+    "ON public.{tabela} USING GIN (description gin_trgm_ops)"
+)
+
+# Índice de trigramas do nome dos equipamentos: atende o ILIKE '%NCU%' da
+# seção NCUs (tabela única, criado junto com os índices de descrição)
+SQL_CRIAR_INDICE_NOME_EQUIPAMENTO = (
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS equipment_name_trgm_idx "
+    "ON public.equipment USING GIN (name gin_trgm_ops)"
+)
+
+
+def listar_todas_tabelas_alarme() -> List[str]:
+    """
+    Lista os nomes de todas as tabelas de alarmes do banco.
+    
+    Retorna:
+        List[str]: Nomes das tabelas 'alarm_{usina_id}_{ano}_{mes}'
+    
+    Exemplo:
+        >>> listar_todas_tabelas_alarme()[:2]
+        ['alarm_86_2025_05', 'alarm_86_2025_06']
+    """
+    query = text("""
+        SELECT tablename
+        FROM pg_catalog.pg_tables
+        WHERE schemaname = 'public'
+        AND tablename ~ '^alarm_[0-9]+_[0-9]+_[0-9]+$'
+        ORDER BY tablename
+    """)
+    
+    try:
+        engine = obter_engine(pool="null")
+        with engine.connect() as conexao:
+            return [row[0] for row in conexao.execute(query)]
+    except Exception as erro:
+        logger.error(f"Erro ao listar tabelas de alarmes: {erro}")
+        return []
+
+
+def criar_extensao_trigramas() -> bool:
+    """
+    Habilita a extensão pg_trgm, usada pelo índice da descrição dos alarmes.
+    
+    Retorna:
+        bool: True se a extensão está disponível, False caso contrário
+              (ex: usuário sem permissão ou extensão não instalada no servidor)
+    
+    Exemplo:
+        >>> criar_extensao_trigramas()
+        True
+    """
+    try:
+        engine = obter_engine(pool="null")
+        with engine.connect() as conexao:
+            conexao = conexao.execution_options(isolation_level="AUTOCOMMIT")
+            conexao.execute(text(SQL_CRIAR_EXTENSAO_TRIGRAMAS))
+        return True
+    except Exception as erro:
+        logger.warning(f"Extensão pg_trgm indisponível, índice de descrição não será criado: {erro}")
+        return False
+
+
+def criar_indices_alarme(periodos: Optional[Periodos] = None) -> int:
+    """
+    Cria os índices dos rankings nas tabelas de alarmes, caso ainda não existam.
+    
+    Os índices são criados com CONCURRENTLY, então as tabelas continuam
+    recebendo alarmes durante a criação (cada índice roda fora de transação).
+    Os índices de trigramas (descrição dos alarmes e nome dos equipamentos)
+    só são criados se a extensão pg_trgm estiver disponível.
+    
+    Parâmetros:
+        periodos: Tupla de períodos (ano, mes) a indexar (padrão: todas as tabelas)
+    
+    Retorna:
+        int: Quantidade de tabelas indexadas sem erro
+    
+    Exemplo:
+        >>> criar_indices_alarme(((2025, 6),))
+        55
+    """
+    if periodos is None:
+        tabelas = listar_todas_tabelas_alarme()
+    else:
+        tabelas = [tabela['nome_tabela'] for tabela in listar_tabelas_alarme_periodos(periodos)]
+    
+    engine = obter_engine(pool="null")
+    sqls_indices = list(SQL_CRIAR_INDICES_ALARME)
+    if tabelas and criar_extensao_trigramas():
+        sqls_indices.append(SQL_CRIAR_INDICE_DESCRICAO)
+        try:
+            with engine.connect() as conexao:
+                conexao = conexao.execution_options(isolation_level="AUTOCOMMIT")
+                conexao.execute(text(SQL_CRIAR_INDICE_NOME_EQUIPAMENTO))
+        except Exception as erro:
+            logger.error(f"Erro ao criar índice do nome dos equipamentos: {erro}")
+    
+    indexadas = 0
+    for tabela in tabelas:
+        try:
+            with engine.connect() as conexao:
+                conexao = conexao.execution_options(isolation_level="AUTOCOMMIT")
+                for sql_indice in sqls_indices:
+                    conexao.execute(text(sql_indice.format(tabela=tabela)))
+            indexadas += 1
+        except Exception as erro:
+            logger.error(f"Erro ao criar índices da tabela {tabela}: {erro}")
+    
+    logger.info(f"Índices verificados em {indexadas} de {len(tabelas)} tabelas de alarmes")
+    return indexadas
+
+
+def obter_mes_anterior(data: datetime = None) -> Tuple[int, int]:
+    """
+    Retorna o (ano, mês) anterior ao mês da data informada.
+    
+    Parâmetros:
+        data: Data de referência (padrão: agora)
+    
+    Retorna:
+        Tuple[int, int]: (ano, mes)
+    
+    Exemplo:
+        >>> obter_mes_anterior(datetime(2025, 1, 15))
+        (2024, 12)
+    """
+    if data is None:
+        data = datetime.now()
+    
+    if data.month == 1:
+        return data.year - 1, 12
+    return data.year, data.month - 1
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--indices"]:
+        criar_indices_alarme()
+        sys.exit(0)
+    
+    if len(sys.argv) == 3:
+        ano_consolidar, mes_consolidar = int(sys.argv[1]), int(sys.argv[2])
+    else:
+        ano_consolidar, mes_consolidar = obter_mes_anterior()
+    
+    # Meses com alarmes abertos na última consolidação: regravados até todos
+    # os alarmes serem finalizados (antes de consolidar o mês pedido)
+    for ano_aberto, mes_aberto in listar_periodos_com_alarmes_abertos():
+        if (ano_aberto, mes_aberto) != (ano_consolidar, mes_consolidar):
+            consolidar_periodo(ano_aberto, mes_aberto)
+    
+    consolidar_periodo(ano_consolidar, mes_consolidar)
+    
+    # Tabelas novas (criadas no início do mês) ganham os índices na primeira execução
+    agora = datetime.now()
+    criar_indices_alarme(((ano_consolidar, mes_consolidar), (agora.year, agora.month)))
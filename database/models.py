@@ -6,6 +6,11 @@ as tabelas do banco de dados.
 
 NOTA: As tabelas alarm_* são dinâmicas e não possuem modelo ORM fixo.
       Elas são acessadas via queries SQL diretas.
+
+NOTA: Os relacionamentos usam lazy="raise": acessar um relacionamento que
+      não foi carregado gera erro em vez de disparar uma query por objeto
+      (N+1). Carregue-os explicitamente na consulta, ex:
+      select(Usina).options(selectinload(Usina.equipamentos))
 """
 
 from sqlalchemy import Column, Integer, String, DateTime, Float, Text, ForeignKey, Boolean
@@ -37,8 +42,8 @@ class Usina(Base):
     customer_id = Column(Integer)
     
     # Relacionamentos
-    equipamentos = relationship("Equipamento", back_populates="usina")
-    skids = relationship("Skid", back_populates="usina")
+    equipamentos = relationship("Equipamento", back_populates="usina", lazy="raise")
+    skids = relationship("Skid", back_populates="usina", lazy="raise")
     
     def __repr__(self):
         return f"<Usina(id={self.id}, nome='{self.name}')>"
@@ -60,8 +65,8 @@ class Skid(Base):
     power_station_id = Column(Integer, ForeignKey("power_station.id"))
     
     # Relacionamentos
-    usina = relationship("Usina", back_populates="skids")
-    equipamentos = relationship("Equipamento", back_populates="skid")
+    usina = relationship("Usina", back_populates="skids", lazy="raise")
+    equipamentos = relationship("Equipamento", back_populates="skid", lazy="raise")
     
     def __repr__(self):
         return f"<Skid(id={self.id}, nome='{self.name}')>"
@@ -88,9 +93,9 @@ class Equipamento(Base):
     power_station_id = Column(Integer, ForeignKey("power_station.id"))
     
     # Relacionamentos
-    usina = relationship("Usina", back_populates="equipamentos")
-    skid = relationship("Skid", back_populates="equipamentos")
-    teleobjetos = relationship("Teleobjeto", back_populates="equipamento")
+    usina = relationship("Usina", back_populates="equipamentos", lazy="raise")
+    skid = relationship("Skid", back_populates="equipamentos", lazy="raise")
+    teleobjetos = relationship("Teleobjeto", back_populates="equipamento", lazy="raise")
     
     def __repr__(self):
         return f"<Equipamento(id={self.id}, nome='{self.name}')>"
@@ -114,7 +119,7 @@ class TeleobjetoConfig(Base):
     alarm_severity_id = Column(Integer, ForeignKey("alarm_severity.id"))
     
     # Relacionamentos
-    teleobjetos = relationship("Teleobjeto", back_populates="configuracao")
+    teleobjetos = relationship("Teleobjeto", back_populates="configuracao", lazy="raise")
     
     def __repr__(self):
         return f"<TeleobjetoConfig(id={self.id}, nome='{self.name}')>"
@@ -137,8 +142,8 @@ class Teleobjeto(Base):
     tele_object_config_id = Column(Integer, ForeignKey("tele_object_config.id"))
     
     # Relacionamentos
-    equipamento = relationship("Equipamento", back_populates="teleobjetos")
-    configuracao = relationship("TeleobjetoConfig", back_populates="teleobjetos")
+    equipamento = relationship("Equipamento", back_populates="teleobjetos", lazy="raise")
+    configuracao = relationship("TeleobjetoConfig", back_populates="teleobjetos", lazy="raise")
     
     def __repr__(self):
         return f"<Teleobjeto(id={self.id})>"
@@ -9,17 +9,137 @@ TODAS as funções usam NOMES (não IDs) fazendo JOINs apropriados.
 """
 
 from sqlalchemy import text
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable, Set, Sequence, FrozenSet
+from concurrent.futures import ThreadPoolExecutor, Future
 from datetime import datetime
+import threading
+import functools
+import time
+import copy
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import logging
 
 from .conexao import obter_engine
-from config import LIMITE_TOP_5, LIMITE_TOP_10, LIMITE_TOP_20, LIMITE_TOP_50
+from config import (
+    LIMITE_TOP_5,
+    LIMITE_TOP_10,
+    LIMITE_TOP_20,
+    LIMITE_TOP_50,
+    CACHE_TTL_SEGUNDOS,
+    CACHE_TTL_REFERENCIA_SEGUNDOS,
+    CACHE_TTL_MES_FECHADO_SEGUNDOS,
+    MAX_CONSULTAS_PARALELAS,
+    TABELA_CONSOLIDADA_MENSAL,
+    TABELA_CONSOLIDADA_DIARIA,
+    TAMANHO_LOTE_LEITURA,
+)
+from utils.helpers import Periodos, normalizar_periodos
 
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# CACHE DE QUERIES
+# ============================================================================
+
+# Todas as queries abaixo são somente leitura: o resultado fica em cache por
+# CACHE_TTL_SEGUNDOS, chaveado pelos argumentos (usina_id, períodos, limites...).
+# Os períodos chegam como tupla de (ano, mes) (ver utils.helpers.normalizar_periodos),
+# que o Streamlit hasheia de forma barata.
+consulta_em_cache = st.cache_data(
+    ttl=CACHE_TTL_SEGUNDOS,
+    show_spinner=False
+)
+
+# Totais de meses fechados (ver obter_componentes_kpis_mes_fechado): só mudam
+# com alarmes encerrados ou reconhecidos depois do fim do mês
+consulta_mes_fechado_em_cache = st.cache_data(
+    ttl=CACHE_TTL_MES_FECHADO_SEGUNDOS,
+    show_spinner=False
+)
+
+
+# ============================================================================
+# EXECUÇÃO PARALELA
+# ============================================================================
+
+def iniciar_consultas_em_paralelo(
+    consultas: Dict[str, Tuple[Callable, tuple]]
+) -> Dict[str, Future]:
+    """
+    Dispara várias queries independentes ao mesmo tempo, sem esperar o resultado.
+    
+    Cada resultado é obtido com `.result()` apenas quando for usado, então a
+    página pode ir renderizando as primeiras seções enquanto as queries das
+    seções seguintes ainda estão rodando no banco.
+    
+    Parâmetros:
+        consultas: Dicionário {chave: (função, argumentos)}
+    
+    Retorna:
+        Dict[str, Future]: Dicionário {chave: futuro com o resultado da função}
+    
+    Exemplo:
+        >>> futuros = iniciar_consultas_em_paralelo({
+        ...     'total': (calcular_total_alarmes, (86, periodos)),
+        ... })
+        >>> futuros['total'].result()
+        1523
+    """
+    # Propagar o contexto do Streamlit para as threads (evita avisos do cache).
+    # Cada thread recebe uma cópia rasa: os flags internos do cache não podem
+    # ser compartilhados com a thread principal, que segue renderizando widgets.
+    contexto = get_script_run_ctx()
+    
+    def inicializar_thread():
+        if contexto is not None:
+            add_script_run_ctx(threading.current_thread(), copy.copy(contexto))
+    
+    executor = ThreadPoolExecutor(
+        max_workers=min(MAX_CONSULTAS_PARALELAS, max(len(consultas), 1)),
+        initializer=inicializar_thread
+    )
+    futuros = {
+        chave: executor.submit(funcao, *argumentos)
+        for chave, (funcao, argumentos) in consultas.items()
+    }
+    
+    # Não bloqueia: as threads terminam as queries pendentes e se encerram
+    executor.shutdown(wait=False)
+    
+    return futuros
+
+
+def executar_consultas_em_paralelo(
+    consultas: Dict[str, Tuple[Callable, tuple]]
+) -> Dict[str, Any]:
+    """
+    Executa várias queries independentes ao mesmo tempo.
+    
+    As queries passam a maior parte do tempo esperando o PostgreSQL
+    (o psycopg2 libera o GIL durante a espera), então threads permitem
+    sobrepor os round-trips usando conexões diferentes do pool.
+    
+    Parâmetros:
+        consultas: Dicionário {chave: (função, argumentos)}
+    
+    Retorna:
+        Dict[str, Any]: Dicionário {chave: resultado da função}
+    
+    Exemplo:
+        >>> dados = executar_consultas_em_paralelo({
+        ...     'total': (calcular_total_alarmes, (86, periodos)),
+        ...     'tempo': (calcular_tempo_total_alarmado, (86, periodos)),
+        ... })
+        >>> dados['total']
+        1523
+    """
+    futuros = iniciar_consultas_em_paralelo(consultas)
+    return {chave: futuro.result() for chave, futuro in futuros.items()}
+
+
 # ============================================================================
 # FUNÇÕES AUXILIARES
 # ============================================================================
@@ -43,40 +163,184 @@ def construir_nome_tabela_alarme(usina_id: int, ano: int, mes: int) -> str:
     return f"alarm_{usina_id}_{ano}_{mes:02d}"
 
 
-def construir_union_all_tabelas(usina_id: int, periodos: List[Dict[str, int]]) -> str:
+# Colunas das tabelas alarm_* lidas pelas queries (com o tipo usado quando
+# nenhuma tabela existe e a união precisa ser um SELECT vazio com o mesmo schema)
+COLUNAS_ALARME: Tuple[Tuple[str, str], ...] = (
+    ("id", "INTEGER"),
+    ("power_station_id", "INTEGER"),
+    ("equipment_id", "INTEGER"),
+    ("tele_object_id", "INTEGER"),
+    ("alarm_severity_id", "INTEGER"),
+    ("date_time", "TIMESTAMP"),
+    ("clear_date", "TIMESTAMP"),
+    ("acknowledgement_date", "TIMESTAMP"),
+    ("acknowledged_user_id", "INTEGER"),
+    ("description", "TEXT"),
+)
+
+# Duração de um alarme em minutos (alarmes ainda abertos contam até agora)
+SQL_DURACAO_MINUTOS = "EXTRACT(EPOCH FROM (COALESCE(clear_date, NOW()) - date_time)) / 60"
+
+# Colunas calculadas em cada SELECT da união: {nome: (expressão, tipo)}.
+# A duração é avaliada uma vez por linha, e as queries que agregam soma e
+# média reutilizam o mesmo valor em vez de repetir o EXTRACT
+COLUNAS_CALCULADAS_ALARME: Dict[str, Tuple[str, str]] = {
+    "duracao_minutos": (SQL_DURACAO_MINUTOS, "NUMERIC"),
+}
+
+
+def construir_union_all_tabelas(
+    usina_id: int,
+    periodos: Periodos,
+    colunas: Sequence[str] = (),
+    filtro_extra: str = "",
+    ordem_limite: str = ""
+) -> str:
     """
     Constrói uma query UNION ALL para combinar múltiplas tabelas de alarmes.
     
+    O filtro da usina (e o `filtro_extra`, se houver) vai dentro de cada
+    SELECT da união, então cada tabela é filtrada pelos próprios índices
+    antes de as linhas serem combinadas. As queries que usam a união só
+    precisam filtrar as colunas das tabelas de junção.
+    
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de dicionários com 'ano' e 'mes'
-                  Ex: [{'ano': 2025, 'mes': 5}, {'ano': 2025, 'mes': 6}]
+        periodos: Tupla de períodos (ano, mes)
+                  Ex: ((2025, 5), (2025, 6))
+        colunas: Colunas de COLUNAS_ALARME (ou de COLUNAS_CALCULADAS_ALARME)
+                 que a query usa (padrão: todas as de COLUNAS_ALARME);
+                 o PostgreSQL só lê e carrega pela união as colunas pedidas
+        filtro_extra: Condição SQL adicional sobre as colunas da tabela de
+                      alarmes, sem alias (ex: "alarm_severity_id = 1")
+        ordem_limite: ORDER BY/LIMIT aplicado dentro de cada SELECT da união
+                      (ex: "ORDER BY date_time DESC LIMIT :limite"): cada
+                      tabela para no LIMIT, e a query externa só ordena o
+                      que sobrou das tabelas
     
     Retorna:
-        str: Query SQL com UNION ALL
+        str: Query SQL com UNION ALL (usa o parâmetro :usina_id)
     
     Exemplo:
-        >>> periodos = [{'ano': 2025, 'mes': 5}, {'ano': 2025, 'mes': 6}]
-        >>> query = construir_union_all_tabelas(86, periodos)
+        >>> periodos = ((2025, 5), (2025, 6))
+        >>> query = construir_union_all_tabelas(
+        ...     86, periodos, ("id", "date_time"), filtro_extra="clear_date IS NULL"
+        ... )
+    """
+    periodos = normalizar_periodos(periodos)
+    
+    # VALIDAÇÃO: Só adiciona tabelas que existem (uma consulta ao catálogo para todos os períodos)
+    tabelas_existentes = frozenset(listar_tabelas_existentes(usina_id, periodos))
+    
+    return _montar_union_all_tabelas(
+        usina_id, periodos, tabelas_existentes, tuple(colunas), filtro_extra, ordem_limite
+    )
+
+
+# O texto da união só depende dos argumentos e das tabelas existentes (que
+# fazem parte da chave): as várias queries de uma página montam o SQL uma
+# vez por combinação, e uma tabela nova gera outra chave em vez de SQL velho
+@functools.lru_cache(maxsize=256)
+def _montar_union_all_tabelas(
+    usina_id: int,
+    periodos: Periodos,
+    tabelas_existentes: FrozenSet[str],
+    colunas: Tuple[str, ...],
+    filtro_extra: str,
+    ordem_limite: str
+) -> str:
+    """
+    Monta o texto da query UNION ALL (ver construir_union_all_tabelas).
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla normalizada de períodos (ano, mes)
+        tabelas_existentes: Tabelas da usina que existem para os períodos
+        colunas: Colunas selecionadas (vazio: todas de COLUNAS_ALARME)
+        filtro_extra: Condição SQL adicional sobre as colunas da tabela de alarmes
+        ordem_limite: ORDER BY/LIMIT aplicado dentro de cada SELECT da união
+    
+    Retorna:
+        str: Query SQL com UNION ALL
     """
+    tipos_colunas = dict(COLUNAS_ALARME)
+    colunas = colunas or tuple(tipos_colunas)
+    lista_colunas = ", ".join(
+        f"{COLUNAS_CALCULADAS_ALARME[nome][0]} AS {nome}"
+        if nome in COLUNAS_CALCULADAS_ALARME else nome
+        for nome in colunas
+    )
+    tipos_colunas.update(
+        (nome, tipo) for nome, (_, tipo) in COLUNAS_CALCULADAS_ALARME.items()
+    )
+    filtro = "power_station_id = :usina_id"
+    if filtro_extra:
+        filtro += f" AND ({filtro_extra})"
+    
     subqueries = []
-    for periodo in periodos:
-        ano = periodo['ano']
-        mes = periodo['mes']
+    for ano, mes in periodos:
         nome_tabela = construir_nome_tabela_alarme(usina_id, ano, mes)
         
-        # VALIDAÇÃO: Só adiciona se a tabela existir
-        if verificar_tabela_existe(usina_id, ano, mes):
-            subqueries.append(f"SELECT * FROM public.{nome_tabela}")
+        if nome_tabela in tabelas_existentes:
+            subquery = f"SELECT {lista_colunas} FROM public.{nome_tabela} WHERE {filtro}"
+            if ordem_limite:
+                subquery = f"({subquery} {ordem_limite})"
+            subqueries.append(subquery)
         else:
             logger.warning(f"Tabela {nome_tabela} não existe - pulando período {ano}/{mes:02d}")
     
     if not subqueries:
         # Retorna uma query que não retorna nada mas é sintaticamente válida
-        return "SELECT * FROM (SELECT NULL AS id LIMIT 0) AS empty_result"
+        colunas_vazias = ", ".join(f"NULL::{tipos_colunas[nome]} AS {nome}" for nome in colunas)
+        return f"SELECT {colunas_vazias} LIMIT 0"
     return " UNION ALL ".join(subqueries)
 
 
+@consulta_em_cache
+def listar_tabelas_existentes(usina_id: int, periodos: Periodos) -> Set[str]:
+    """
+    Retorna quais tabelas de alarmes da usina existem para os períodos.
+    
+    Faz uma única consulta ao catálogo para todos os períodos, em vez de
+    um EXISTS por período.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        Set[str]: Nomes das tabelas existentes (ex: {'alarm_86_2025_06'})
+    
+    Exemplo:
+        >>> listar_tabelas_existentes(86, ((2025, 5), (2025, 6)))
+        {'alarm_86_2025_05', 'alarm_86_2025_06'}
+    """
+    nomes_tabelas = [
+        construir_nome_tabela_alarme(usina_id, ano, mes)
+        for ano, mes in normalizar_periodos(periodos)
+    ]
+    
+    if not nomes_tabelas:
+        return set()
+    
+    query = text("""
+        SELECT tablename
+        FROM pg_catalog.pg_tables
+        WHERE schemaname = 'public'
+        AND tablename = ANY(:nomes_tabelas)
+    """)
+    
+    try:
+        engine = obter_engine()
+        with engine.connect() as conexao:
+            resultado = conexao.execute(query, {"nomes_tabelas": nomes_tabelas})
+            return {row[0] for row in resultado}
+    except Exception as erro:
+        logger.error(f"Erro ao listar tabelas existentes da usina {usina_id}: {erro}")
+        return set()
+
+
+@consulta_em_cache
 def verificar_tabela_existe(usina_id: int, ano: int, mes: int) -> bool:
     """
     Verifica se uma tabela de alarmes existe no banco de dados.
@@ -98,9 +362,9 @@ def verificar_tabela_existe(usina_id: int, ano: int, mes: int) -> bool:
     query = text("""
         SELECT EXISTS (
             SELECT 1
-            FROM information_schema.tables
-            WHERE table_schema = 'public'
-            AND table_name = :nome_tabela
+            FROM pg_catalog.pg_tables
+            WHERE schemaname = 'public'
+            AND tablename = :nome_tabela
         ) AS existe
     """)
     
@@ -114,16 +378,110 @@ def verificar_tabela_existe(usina_id: int, ano: int, mes: int) -> bool:
         return False
 
 
+# Tipos das métricas dos rankings: o PostgreSQL devolve as durações como
+# NUMERIC, que o psycopg2 entrega como Decimal (coluna object no pandas)
+TIPOS_RANKING: Dict[str, str] = {
+    "quantidade_alarmes": "int64",
+    "duracao_total_minutos": "float64",
+    "duracao_media_minutos": "float64",
+}
+
+
+def formatar_nomes_equipamentos(df: pd.DataFrame, com_parenteses: bool = True) -> pd.DataFrame:
+    """
+    Adiciona a coluna equipamento_nome_formatado ('INV-01 - (SK1)') a um
+    ranking de equipamentos e troca o skid ausente por 'N/A'.
+    
+    As queries devolvem o nome do skid cru (NULL quando o equipamento não
+    tem skid); a concatenação é feita aqui de uma vez para a coluna inteira,
+    em vez de um CASE por linha no banco.
+    
+    Parâmetros:
+        df: DataFrame com as colunas equipamento_nome e skid_nome
+        com_parenteses: Se True, 'EQUIPAMENTO - (SKID)'; se False, 'EQUIPAMENTO - SKID'
+    
+    Retorna:
+        DataFrame: O mesmo DataFrame, com equipamento_nome_formatado logo após skid_nome
+    
+    Exemplo:
+        >>> df = formatar_nomes_equipamentos(df_ranking)
+        >>> df['equipamento_nome_formatado'].iloc[0]
+        'INV-01 - (SK1)'
+    """
+    if 'skid_nome' not in df.columns:
+        return df
+    
+    tem_skid = df['skid_nome'].notna()
+    skids = df['skid_nome'].fillna('').astype(str)
+    sufixo = (' - (' + skids + ')') if com_parenteses else (' - ' + skids)
+    
+    df.insert(
+        df.columns.get_loc('skid_nome') + 1,
+        'equipamento_nome_formatado',
+        df['equipamento_nome'].where(~tem_skid, df['equipamento_nome'] + sufixo)
+    )
+    df['skid_nome'] = skids.where(tem_skid, 'N/A')
+    return df
+
+
+def ler_sql_em_lotes(
+    query_sql: str,
+    parametros: Dict[str, Any],
+    tamanho_lote: int = TAMANHO_LOTE_LEITURA,
+    tipos: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Executa uma query e monta o DataFrame lote a lote.
+    
+    A conexão usa cursor do lado do servidor (stream_results), então o
+    psycopg2 não guarda todas as linhas na memória antes do pandas montar
+    o DataFrame: cada lote de `tamanho_lote` linhas é convertido e descartado.
+    
+    Com `tipos`, cada lote já sai com as colunas numéricas em arrays NumPy
+    nativos (em vez de objetos Python), e lotes ou resultados vazios mantêm
+    o mesmo schema.
+    
+    Parâmetros:
+        query_sql: Texto da query (com parâmetros nomeados :nome)
+        parametros: Valores dos parâmetros da query
+        tamanho_lote: Linhas buscadas por vez (padrão: TAMANHO_LOTE_LEITURA)
+        tipos: Dicionário {coluna: dtype} aplicado a cada lote (opcional)
+    
+    Retorna:
+        DataFrame: Resultado completo da query (vazio, com as colunas, se não houver linhas)
+    
+    Exemplo:
+        >>> ler_sql_em_lotes("SELECT id FROM public.power_station", {}, tipos={"id": "int64"})
+    """
+    engine = obter_engine()
+    with engine.connect() as conexao:
+        conexao = conexao.execution_options(stream_results=True)
+        lotes = pd.read_sql_query(
+            text(query_sql),
+            conexao,
+            params=parametros,
+            chunksize=tamanho_lote,
+            dtype=tipos
+        )
+        return pd.concat(list(lotes), ignore_index=True, copy=False)
+
+
 # ============================================================================
 # QUERIES DE DESCOBERTA
 # ============================================================================
 
-def listar_usinas_disponiveis() -> List[Dict[str, Any]]:
+@st.cache_resource(ttl=CACHE_TTL_REFERENCIA_SEGUNDOS, show_spinner=False)
+def listar_usinas_disponiveis() -> Tuple[Dict[str, Any], ...]:
     """
     Lista todas as usinas disponíveis no sistema.
     
+    A lista de usinas é dado de referência (muda raramente e é igual para
+    todas as sessões), por isso fica em `st.cache_resource`: uma única cópia
+    compartilhada, sem serialização a cada leitura. Use
+    `listar_usinas_disponiveis.clear()` para forçar uma nova consulta.
+    
     Retorna:
-        List[Dict]: Lista de dicionários com 'id' e 'nome' das usinas
+        Tuple[Dict]: Tupla (somente leitura) de dicionários com 'id' e 'nome' das usinas
     
     Exemplo:
         >>> usinas = listar_usinas_disponiveis()
@@ -142,16 +500,25 @@ def listar_usinas_disponiveis() -> List[Dict[str, Any]]:
         engine = obter_engine()
         with engine.connect() as conexao:
             resultado = conexao.execute(query)
-            return [dict(row._mapping) for row in resultado]
+            # Colunas lidas por posição: evita montar um RowMapping por linha
+            return tuple(
+                {"id": id_usina, "nome": nome}
+                for id_usina, nome in resultado.fetchall()
+            )
     except Exception as erro:
         logger.error(f"Erro ao listar usinas: {erro}")
-        return []
+        return ()
 
 
+@consulta_em_cache
 def descobrir_periodos_disponiveis(usina_id: int) -> List[Dict[str, Any]]:
     """
     Descobre quais períodos (ano/mês) estão disponíveis para uma usina.
     
+    Os períodos vêm dos nomes das tabelas 'alarm_{usina_id}_{ano}_{mes}',
+    lidos direto do catálogo do PostgreSQL (pg_catalog.pg_tables), que é
+    bem mais leve que as views do information_schema.
+    
     Parâmetros:
         usina_id: ID da usina
     
@@ -163,180 +530,792 @@ def descobrir_periodos_disponiveis(usina_id: int) -> List[Dict[str, Any]]:
         >>> for periodo in periodos:
         ...     print(f"{periodo['ano']}-{periodo['mes']:02d}")
     """
-    query = text(f"""
+    query = text("""
         SELECT
-            table_name AS nome_tabela,
-            SUBSTRING(table_name FROM 'alarm_\\d+_(\\d+)_\\d+')::INTEGER AS ano,
-            SUBSTRING(table_name FROM 'alarm_\\d+_\\d+_(\\d+)')::INTEGER AS mes
-        FROM information_schema.tables
-        WHERE table_schema = 'public'
-        AND table_name ~ '^alarm_[0-9]+_[0-9]+_[0-9]+$'
-        AND table_name LIKE 'alarm_{usina_id}_%'
+            tablename AS nome_tabela,
+            SUBSTRING(tablename FROM 'alarm_\\d+_(\\d+)_\\d+')::INTEGER AS ano,
+            SUBSTRING(tablename FROM 'alarm_\\d+_\\d+_(\\d+)')::INTEGER AS mes
+        FROM pg_catalog.pg_tables
+        WHERE schemaname = 'public'
+        AND tablename ~ :padrao_tabelas
         ORDER BY ano DESC, mes DESC
     """)
     
+    # Padrão exato da usina (evita que a usina 1 case com 'alarm_10_...')
+    padrao_tabelas = f"^alarm_{int(usina_id)}_[0-9]+_[0-9]+$"
+    
     try:
         engine = obter_engine()
         with engine.connect() as conexao:
-            resultado = conexao.execute(query)
-            return [dict(row._mapping) for row in resultado]
+            resultado = conexao.execute(query, {"padrao_tabelas": padrao_tabelas})
+            return [
+                {"nome_tabela": nome_tabela, "ano": ano, "mes": mes}
+                for nome_tabela, ano, mes in resultado.fetchall()
+            ]
     except Exception as erro:
         logger.error(f"Erro ao descobrir períodos para usina {usina_id}: {erro}")
         return []
 
 
-def filtrar_periodos_validos(usina_id: int, periodos: List[Dict[str, int]]) -> List[Dict[str, int]]:
+@consulta_em_cache
+def obter_indice_periodos(usina_id: int) -> Dict[int, List[int]]:
+    """
+    Agrupa os períodos disponíveis de uma usina por ano.
+    
+    Monta o índice uma única vez (em cache) para que a barra lateral só
+    precise consultar o dicionário a cada interação.
+    
+    Parâmetros:
+        usina_id: ID da usina
+    
+    Retorna:
+        Dict[int, List[int]]: {ano: [meses em ordem crescente]}, com os anos
+                              do mais recente para o mais antigo
+    
+    Exemplo:
+        >>> indice = obter_indice_periodos(86)
+        >>> list(indice)
+        [2025, 2024]
+        >>> indice[2025]
+        [1, 2, 3, 4, 5, 6]
+    """
+    indice: Dict[int, List[int]] = {}
+    for periodo in descobrir_periodos_disponiveis(usina_id):
+        indice.setdefault(periodo['ano'], []).append(periodo['mes'])
+    
+    return {
+        ano: sorted(meses)
+        for ano, meses in sorted(indice.items(), reverse=True)
+    }
+
+
+@consulta_em_cache
+def filtrar_periodos_validos(usina_id: int, periodos: Periodos) -> Periodos:
     """
     Filtra apenas os períodos que possuem tabelas existentes no banco.
     
+    Usa a lista de `descobrir_periodos_disponiveis` (uma única consulta ao
+    catálogo) em vez de verificar a existência de cada tabela separadamente.
+    
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
-        List[Dict]: Lista filtrada apenas com períodos válidos
+        Periodos: Tupla filtrada apenas com períodos válidos
     
     Exemplo:
-        >>> periodos = [{'ano': 2025, 'mes': 1}, {'ano': 2025, 'mes': 2}]
+        >>> periodos = ((2025, 1), (2025, 2))
         >>> validos = filtrar_periodos_validos(100, periodos)
     """
+    periodos_existentes = {
+        (periodo['ano'], periodo['mes'])
+        for periodo in descobrir_periodos_disponiveis(usina_id)
+    }
+    
     periodos_validos = []
-    for periodo in periodos:
-        if verificar_tabela_existe(usina_id, periodo['ano'], periodo['mes']):
-            periodos_validos.append(periodo)
+    for ano, mes in normalizar_periodos(periodos):
+        if (ano, mes) in periodos_existentes:
+            periodos_validos.append((ano, mes))
         else:
-            logger.info(f"Período {periodo['ano']}/{periodo['mes']:02d} não possui dados para usina {usina_id}")
+            logger.info(f"Período {ano}/{mes:02d} não possui dados para usina {usina_id}")
     
-    return periodos_validos
+    return tuple(periodos_validos)
+
+
+def invalidar_cache_catalogo():
+    """
+    Descarta apenas os caches derivados do catálogo do banco.
+    
+    Usinas, períodos disponíveis e existência de tabelas ficam em cache por
+    um bom tempo; quando uma usina ou um mês novo passa a existir, esta função
+    força uma nova leitura do catálogo sem descartar o cache das demais queries.
+    
+    Exemplo:
+        >>> invalidar_cache_catalogo()
+    """
+    listar_usinas_disponiveis.clear()
+    descobrir_periodos_disponiveis.clear()
+    obter_indice_periodos.clear()
+    listar_tabelas_existentes.clear()
+    verificar_tabela_existe.clear()
+    listar_tabelas_alarme_periodos.clear()
 
 
 # ============================================================================
 # QUERIES DE KPIs
 # ============================================================================
 
-def calcular_total_alarmes(usina_id: int, periodos: List[Dict[str, int]]) -> int:
+@consulta_em_cache
+def verificar_existem_alarmes(usina_id: int, periodos: Periodos) -> bool:
     """
-    Calcula o total de alarmes para uma usina em determinados períodos.
+    Verifica se a usina tem pelo menos um alarme nos períodos.
+    
+    Usa EXISTS, que para no primeiro alarme encontrado: é bem mais barato
+    que disparar todas as consultas da página para descobrir que estão vazias.
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
-        int: Total de alarmes
+        bool: True se houver alarmes (ou em caso de erro, para não esconder dados)
     
     Exemplo:
-        >>> total = calcular_total_alarmes(86, [{'ano': 2025, 'mes': 6}])
-        >>> print(f"Total de alarmes: {total}")
+        >>> if not verificar_existem_alarmes(86, ((2025, 6),)):
+        ...     print("Sem alarmes no período")
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(usina_id, periodos, ("id",))
     
     query_sql = f"""
-        SELECT COUNT(*) AS total
+        SELECT EXISTS (
+            SELECT 1
+            FROM (
+                {union_tabelas}
+            ) a
+        )
+    """
+    
+    try:
+        engine = obter_engine()
+        with engine.connect() as conexao:
+            resultado = conexao.execute(text(query_sql), {"usina_id": usina_id})
+            return bool(resultado.scalar())
+    except Exception as erro:
+        logger.error(f"Erro ao verificar existência de alarmes: {erro}")
+        return True
+
+
+@consulta_em_cache
+def listar_meses_consolidados_usina(usina_id: int, periodos: Periodos) -> Set[Tuple[int, int]]:
+    """
+    Lista quais meses da usina já estão na tabela consolidada mensal com
+    os totais de reconhecimento preenchidos.
+    
+    Apenas meses fechados (anteriores ao mês atual) são considerados: o mês
+    corrente é sempre calculado ao vivo nas tabelas de alarmes.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        Set[Tuple]: Conjunto de (ano, mes). Vazio se a tabela consolidada não existir.
+    
+    Exemplo:
+        >>> listar_meses_consolidados_usina(86, ((2025, 5), (2025, 6)))
+        {(2025, 5)}
+    """
+    return {
+        (ano, mes)
+        for usina, ano, mes in listar_periodos_consolidados(
+            periodos, TABELA_CONSOLIDADA_MENSAL, apenas_com_reconhecimento=True
+        )
+        if usina == usina_id
+    }
+
+
+def construir_parciais_kpis(usina_id: int, periodos: Periodos) -> Optional[str]:
+    """
+    Monta as linhas parciais de KPIs da usina: meses consolidados vêm da
+    tabela `fato_alarmes_mensal` e os demais são agregados ao vivo.
+    
+    Cada linha tem as colunas [total_alarmes, tempo_total_minutos,
+    tempo_reconhecimento_minutos, alarmes_reconhecidos]; os KPIs são as
+    somas dessas colunas (o tempo médio de reconhecimento é a razão entre
+    as duas últimas). A query usa o parâmetro :usina_id.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        Optional[str]: SQL com UNION ALL das partes, ou None se não houver dados
+    """
+    meses_consolidados = listar_meses_consolidados_usina(usina_id, periodos)
+    tabelas_existentes = listar_tabelas_existentes(usina_id, periodos)
+    periodos_ao_vivo = tuple(
+        (ano, mes) for ano, mes in normalizar_periodos(periodos)
+        if (ano, mes) not in meses_consolidados
+        and construir_nome_tabela_alarme(usina_id, ano, mes) in tabelas_existentes
+    )
+    
+    parciais = []
+    
+    if periodos_ao_vivo:
+        union_tabelas = construir_union_all_tabelas(
+            usina_id, periodos_ao_vivo,
+            ("date_time", "acknowledgement_date", "duracao_minutos")
+        )
+        parciais.append(f"""
+        SELECT
+            COUNT(*) AS total_alarmes,
+            COALESCE(SUM(a.duracao_minutos), 0) AS tempo_total_minutos,
+            COALESCE(SUM(
+                EXTRACT(EPOCH FROM (
+                    a.acknowledgement_date - a.date_time
+                )) / 60
+            ) FILTER (WHERE a.acknowledgement_date IS NOT NULL), 0) AS tempo_reconhecimento_minutos,
+            COUNT(*) FILTER (WHERE a.acknowledgement_date IS NOT NULL) AS alarmes_reconhecidos
         FROM (
             {union_tabelas}
         ) a
-        WHERE a.power_station_id = :usina_id
+        """)
+    
+    if meses_consolidados:
+        # Só meses sem alarmes abertos são lidos consolidados: o tempo é o fechado
+        lista_periodos = ", ".join(f"({int(ano)}, {int(mes)})" for ano, mes in sorted(meses_consolidados))
+        parciais.append(f"""
+        SELECT
+            f.total_alarmes,
+            f.tempo_fechado_minutos AS tempo_total_minutos,
+            f.tempo_reconhecimento_minutos,
+            f.alarmes_reconhecidos
+        FROM public.{TABELA_CONSOLIDADA_MENSAL} f
+        WHERE f.usina_id = :usina_id
+        AND (f.ano, f.mes) IN ({lista_periodos})
+        """)
+    
+    if not parciais:
+        return None
+    return " UNION ALL ".join(parciais)
+
+
+@consulta_em_cache
+def somar_parciais_kpis(usina_id: int, periodos: Periodos) -> Optional[Tuple[int, float, float, int]]:
+    """
+    Soma as linhas de construir_parciais_kpis em uma única query.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        Optional[Tuple]: (total_alarmes, tempo_total_minutos,
+                         tempo_reconhecimento_minutos, alarmes_reconhecidos),
+                         ou None em caso de erro
+    
+    Exemplo:
+        >>> somar_parciais_kpis(86, ((2025, 6),))
+        (1523, 98765.4, 4321.0, 1200)
+    """
+    parciais = construir_parciais_kpis(usina_id, periodos)
+    
+    if parciais is None:
+        return 0, 0.0, 0.0, 0
+    
+    query_sql = f"""
+        SELECT
+            COALESCE(SUM(k.total_alarmes), 0)::BIGINT AS total_alarmes,
+            COALESCE(SUM(k.tempo_total_minutos), 0) AS tempo_total_minutos,
+            COALESCE(SUM(k.tempo_reconhecimento_minutos), 0) AS tempo_reconhecimento_minutos,
+            COALESCE(SUM(k.alarmes_reconhecidos), 0)::BIGINT AS alarmes_reconhecidos
+        FROM (
+            {parciais}
+        ) k
+    """
+    
+    try:
+        engine = obter_engine()
+        with engine.connect() as conexao:
+            resultado = conexao.execute(text(query_sql), {"usina_id": usina_id}).fetchone()
+            return (
+                int(resultado.total_alarmes),
+                float(resultado.tempo_total_minutos),
+                float(resultado.tempo_reconhecimento_minutos),
+                int(resultado.alarmes_reconhecidos),
+            )
+    except Exception as erro:
+        logger.error(f"Erro ao somar KPIs da usina: {erro}")
+        return None
+
+
+@consulta_mes_fechado_em_cache
+def obter_componentes_kpis_mes_fechado(
+    usina_id: int,
+    ano: int,
+    mes: int
+) -> Optional[Tuple[int, float, int, float, float, int]]:
+    """
+    Agrega a tabela de alarmes de um mês fechado que ainda não foi consolidado.
+    
+    Usa a mesma decomposição da `fato_alarmes_mensal` (ver
+    database/consolidacao.py): a duração dos alarmes ainda abertos depende de
+    NOW(), então guarda a quantidade de abertos e a soma dos seus inícios em
+    epoch. Assim o resultado não envelhece e pode ficar em cache por
+    CACHE_TTL_MES_FECHADO_SEGUNDOS.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        ano: Ano (ex: 2025)
+        mes: Mês (1-12)
+    
+    Retorna:
+        Optional[Tuple]: (total_alarmes, tempo_fechado_minutos, alarmes_abertos,
+                         soma_inicio_abertos_epoch, tempo_reconhecimento_minutos,
+                         alarmes_reconhecidos), ou None em caso de erro
+    """
+    nome_tabela = construir_nome_tabela_alarme(usina_id, ano, mes)
+    
+    if nome_tabela not in listar_tabelas_existentes(usina_id, ((ano, mes),)):
+        return 0, 0.0, 0, 0.0, 0.0, 0
+    
+    query_sql = f"""
+        SELECT
+            COUNT(*) AS total_alarmes,
+            COALESCE(SUM(
+                EXTRACT(EPOCH FROM (clear_date - date_time)) / 60
+            ) FILTER (WHERE clear_date IS NOT NULL), 0) AS tempo_fechado_minutos,
+            COUNT(*) FILTER (WHERE clear_date IS NULL) AS alarmes_abertos,
+            COALESCE(SUM(
+                EXTRACT(EPOCH FROM date_time::TIMESTAMPTZ)
+            ) FILTER (WHERE clear_date IS NULL), 0) AS soma_inicio_abertos_epoch,
+            COALESCE(SUM(
+                EXTRACT(EPOCH FROM (acknowledgement_date - date_time)) / 60
+            ) FILTER (WHERE acknowledgement_date IS NOT NULL), 0) AS tempo_reconhecimento_minutos,
+            COUNT(*) FILTER (WHERE acknowledgement_date IS NOT NULL) AS alarmes_reconhecidos
+        FROM public.{nome_tabela}
+        WHERE power_station_id = :usina_id
     """
     
     try:
         engine = obter_engine()
         with engine.connect() as conexao:
-            resultado = conexao.execute(text(query_sql), {"usina_id": usina_id})
-            return resultado.fetchone()[0]
+            resultado = conexao.execute(text(query_sql), {"usina_id": usina_id}).fetchone()
+            return (
+                int(resultado.total_alarmes),
+                float(resultado.tempo_fechado_minutos),
+                int(resultado.alarmes_abertos),
+                float(resultado.soma_inicio_abertos_epoch),
+                float(resultado.tempo_reconhecimento_minutos),
+                int(resultado.alarmes_reconhecidos),
+            )
+    except Exception as erro:
+        logger.error(f"Erro ao agregar mês fechado {ano}/{mes:02d} da usina {usina_id}: {erro}")
+        return None
+
+
+def somar_kpis_mes_fechado(
+    usina_id: int,
+    ano: int,
+    mes: int
+) -> Optional[Tuple[int, float, float, int]]:
+    """
+    Soma os KPIs de um mês fechado não consolidado a partir dos componentes em cache.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        ano: Ano (ex: 2025)
+        mes: Mês (1-12)
+    
+    Retorna:
+        Optional[Tuple]: Mesmo formato de somar_parciais_kpis, ou None em caso de erro
+    """
+    componentes = obter_componentes_kpis_mes_fechado(usina_id, ano, mes)
+    
+    if componentes is None:
+        return None
+    
+    total_alarmes, tempo_fechado, abertos, soma_inicio_abertos, tempo_reconhecimento, reconhecidos = componentes
+    tempo_total = tempo_fechado + (abertos * time.time() - soma_inicio_abertos) / 60
+    return total_alarmes, tempo_total, tempo_reconhecimento, reconhecidos
+
+
+@consulta_em_cache
+def calcular_kpis_consolidados(usina_id: int, periodos: Periodos) -> Dict[str, Any]:
+    """
+    Calcula os três KPIs da usina (total, tempo total e tempo médio de
+    reconhecimento).
+    
+    As três agregações saem da mesma leitura das tabelas de alarmes (e da
+    tabela consolidada, ver construir_parciais_kpis). Cada mês calculado ao
+    vivo é somado por uma query própria, em paralelo, e os meses
+    consolidados saem juntos da tabela mensal; os totais são combinados
+    aqui. As somas de cada mês ficam em cache, então trocar a seleção de
+    meses só consulta os meses novos; meses fechados ainda não consolidados
+    ficam em cache por mais tempo (ver obter_componentes_kpis_mes_fechado).
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        Dict contendo:
+            - total_alarmes: Total de alarmes (int)
+            - tempo_total_minutos: Tempo total em alarme (float)
+            - tempo_medio_reconhecimento_minutos: Tempo médio de reconhecimento (float)
+    
+    Exemplo:
+        >>> kpis = calcular_kpis_consolidados(86, ((2025, 6),))
+        >>> print(kpis['total_alarmes'])
+    """
+    kpis_vazios = {
+        'total_alarmes': 0,
+        'tempo_total_minutos': 0.0,
+        'tempo_medio_reconhecimento_minutos': 0.0,
+    }
+    
+    periodos = normalizar_periodos(periodos)
+    meses_consolidados = listar_meses_consolidados_usina(usina_id, periodos)
+    hoje = datetime.now()
+    
+    partes: Dict[Any, Tuple[Callable, tuple]] = {}
+    for ano, mes in periodos:
+        if (ano, mes) in meses_consolidados:
+            continue
+        if (ano, mes) < (hoje.year, hoje.month):
+            partes[(ano, mes)] = (somar_kpis_mes_fechado, (usina_id, ano, mes))
+        else:
+            partes[(ano, mes)] = (somar_parciais_kpis, (usina_id, ((ano, mes),)))
+    
+    periodos_consolidados = tuple(periodo for periodo in periodos if periodo in meses_consolidados)
+    if periodos_consolidados:
+        partes['consolidados'] = (somar_parciais_kpis, (usina_id, periodos_consolidados))
+    
+    if not partes:
+        return kpis_vazios
+    
+    if len(partes) == 1:
+        funcao, argumentos = next(iter(partes.values()))
+        somas = [funcao(*argumentos)]
+    else:
+        somas = list(executar_consultas_em_paralelo(partes).values())
+    
+    if any(soma is None for soma in somas):
+        return kpis_vazios
+    
+    total_alarmes, tempo_total, tempo_reconhecimento, alarmes_reconhecidos = (
+        sum(coluna) for coluna in zip(*somas)
+    )
+    return {
+        'total_alarmes': total_alarmes,
+        'tempo_total_minutos': tempo_total,
+        'tempo_medio_reconhecimento_minutos': (
+            tempo_reconhecimento / alarmes_reconhecidos if alarmes_reconhecidos else 0.0
+        ),
+    }
+
+
+def calcular_total_alarmes(usina_id: int, periodos: Periodos) -> int:
+    """
+    Calcula o total de alarmes para uma usina em determinados períodos.
+    
+    Atalho para `calcular_kpis_consolidados(...)['total_alarmes']`.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        int: Total de alarmes
+    
+    Exemplo:
+        >>> total = calcular_total_alarmes(86, ((2025, 6),))
+        >>> print(f"Total de alarmes: {total}")
+    """
+    return calcular_kpis_consolidados(usina_id, periodos)['total_alarmes']
+
+
+def calcular_tempo_total_alarmado(usina_id: int, periodos: Periodos) -> float:
+    """
+    Calcula o tempo total em minutos que a usina ficou em estado de alarme.
+    
+    Atalho para `calcular_kpis_consolidados(...)['tempo_total_minutos']`.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        float: Tempo total em minutos
+    
+    Exemplo:
+        >>> tempo = calcular_tempo_total_alarmado(86, ((2025, 6),))
+        >>> print(f"Tempo total: {tempo:.2f} minutos")
+    """
+    return calcular_kpis_consolidados(usina_id, periodos)['tempo_total_minutos']
+
+
+def calcular_tempo_medio_reconhecimento(usina_id: int, periodos: Periodos) -> float:
+    """
+    Calcula o tempo médio de reconhecimento de alarmes em minutos.
+    
+    Atalho para `calcular_kpis_consolidados(...)['tempo_medio_reconhecimento_minutos']`.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        float: Tempo médio em minutos
+    
+    Exemplo:
+        >>> tempo = calcular_tempo_medio_reconhecimento(86, ((2025, 6),))
+        >>> print(f"Tempo médio: {tempo:.2f} minutos")
+    """
+    return calcular_kpis_consolidados(usina_id, periodos)['tempo_medio_reconhecimento_minutos']
+
+
+# ============================================================================
+# QUERIES DE RANKINGS - USINAS
+# ============================================================================
+
+@consulta_em_cache
+def listar_tabelas_alarme_periodos(periodos: Periodos) -> List[Dict[str, Any]]:
+    """
+    Lista as tabelas de alarmes existentes de TODAS as usinas para os períodos.
+    
+    Faz uma única consulta ao catálogo, em vez de verificar tabela por tabela.
+    
+    Parâmetros:
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        List[Dict]: Lista de dicionários com 'usina_id', 'ano', 'mes' e 'nome_tabela'
+    
+    Exemplo:
+        >>> tabelas = listar_tabelas_alarme_periodos(((2025, 6),))
+        >>> for tabela in tabelas:
+        ...     print(tabela['usina_id'], tabela['nome_tabela'])
+    """
+    if not periodos:
+        return []
+    
+    # Ex: '^alarm_[0-9]+_(2025_05|2025_06)$'
+    sufixos = "|".join(
+        f"{ano}_{mes:02d}" for ano, mes in normalizar_periodos(periodos)
+    )
+    padrao_tabelas = f"^alarm_[0-9]+_({sufixos})$"
+    
+    query = text("""
+        SELECT
+            SUBSTRING(tablename FROM 'alarm_(\\d+)_\\d+_\\d+')::INTEGER AS usina_id,
+            SUBSTRING(tablename FROM 'alarm_\\d+_(\\d+)_\\d+')::INTEGER AS ano,
+            SUBSTRING(tablename FROM 'alarm_\\d+_\\d+_(\\d+)')::INTEGER AS mes,
+            tablename AS nome_tabela
+        FROM pg_catalog.pg_tables
+        WHERE schemaname = 'public'
+        AND tablename ~ :padrao_tabelas
+        ORDER BY usina_id, nome_tabela
+    """)
+    
+    try:
+        engine = obter_engine()
+        with engine.connect() as conexao:
+            resultado = conexao.execute(query, {"padrao_tabelas": padrao_tabelas})
+            return [
+                {"usina_id": usina_id, "ano": ano, "mes": mes, "nome_tabela": nome_tabela}
+                for usina_id, ano, mes, nome_tabela in resultado.fetchall()
+            ]
     except Exception as erro:
-        logger.error(f"Erro ao calcular total de alarmes: {erro}")
-        return 0
+        logger.error(f"Erro ao listar tabelas de alarmes dos períodos: {erro}")
+        return []
 
 
-def calcular_tempo_total_alarmado(usina_id: int, periodos: List[Dict[str, int]]) -> float:
+@consulta_em_cache
+def listar_periodos_consolidados(
+    periodos: Periodos,
+    tabela_consolidada: str = TABELA_CONSOLIDADA_MENSAL,
+    apenas_com_reconhecimento: bool = False
+) -> List[Tuple[int, int, int]]:
     """
-    Calcula o tempo total em minutos que a usina ficou em estado de alarme.
+    Lista quais (usina, ano, mês) já estão na tabela consolidada mensal.
+    
+    Apenas meses fechados (anteriores ao mês atual) são considerados: o mês
+    corrente é sempre calculado ao vivo nas tabelas de alarmes. Meses que
+    tinham alarmes abertos na consolidação também ficam de fora (e são
+    agregados ao vivo): esses alarmes podem ter sido finalizados depois, e
+    o total consolidado não acompanharia. A consolidação diária regrava
+    esses meses até não restarem alarmes abertos.
     
     Parâmetros:
-        usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
+        tabela_consolidada: Tabela consultada (padrão: a mensal; use
+                            TABELA_CONSOLIDADA_DIARIA para os totais por dia)
+        apenas_com_reconhecimento: Ignora linhas mensais consolidadas antes das
+                                   colunas de reconhecimento existirem (NULL)
     
     Retorna:
-        float: Tempo total em minutos
+        List[Tuple]: Lista de tuplas (usina_id, ano, mes). Vazia se a tabela
+        consolidada não existir.
     
     Exemplo:
-        >>> tempo = calcular_tempo_total_alarmado(86, [{'ano': 2025, 'mes': 6}])
-        >>> print(f"Tempo total: {tempo:.2f} minutos")
+        >>> listar_periodos_consolidados(((2025, 5),))
+        [(86, 2025, 5), (87, 2025, 5)]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    hoje = datetime.now()
+    periodos_fechados = [
+        (ano, mes)
+        for ano, mes in normalizar_periodos(periodos)
+        if (ano, mes) < (hoje.year, hoje.month)
+    ]
     
-    query_sql = f"""
-        SELECT 
-            COALESCE(SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ), 0) AS tempo_total_minutos
-        FROM (
-            {union_tabelas}
-        ) a
-        WHERE a.power_station_id = :usina_id
-    """
+    if not periodos_fechados:
+        return []
+    
+    # Tabela (e, se pedido, a coluna de reconhecimento) precisam existir
+    coluna_obrigatoria = "alarmes_reconhecidos" if apenas_com_reconhecimento else "usina_id"
+    query_existe = text("""
+        SELECT EXISTS (
+            SELECT 1
+            FROM pg_catalog.pg_attribute
+            WHERE attrelid = to_regclass('public.' || :nome_tabela)
+            AND attname = :coluna
+            AND NOT attisdropped
+        ) AS existe
+    """)
+    
+    lista_periodos = ", ".join(f"({ano}, {mes})" for ano, mes in periodos_fechados)
+    filtro_reconhecimento = (
+        "AND alarmes_reconhecidos IS NOT NULL" if apenas_com_reconhecimento else ""
+    )
+    query = text(f"""
+        SELECT usina_id, ano, mes
+        FROM public.{tabela_consolidada}
+        WHERE (ano, mes) IN ({lista_periodos})
+        {filtro_reconhecimento}
+        GROUP BY usina_id, ano, mes
+        HAVING SUM(alarmes_abertos) = 0
+    """)
     
     try:
         engine = obter_engine()
         with engine.connect() as conexao:
-            resultado = conexao.execute(text(query_sql), {"usina_id": usina_id})
-            return float(resultado.fetchone()[0] or 0)
+            existe = conexao.execute(
+                query_existe, {"nome_tabela": tabela_consolidada, "coluna": coluna_obrigatoria}
+            ).fetchone()[0]
+            if not existe:
+                return []
+            resultado = conexao.execute(query)
+            return [tuple(row) for row in resultado]
     except Exception as erro:
-        logger.error(f"Erro ao calcular tempo total alarmado: {erro}")
-        return 0.0
+        logger.error(f"Erro ao listar períodos consolidados: {erro}")
+        return []
 
 
-def calcular_tempo_medio_reconhecimento(usina_id: int, periodos: List[Dict[str, int]]) -> float:
+@consulta_em_cache
+def obter_ranking_usinas(
+    periodos: Periodos,
+    limite: Optional[int] = None,
+    offset: int = 0
+) -> pd.DataFrame:
     """
-    Calcula o tempo médio de reconhecimento de alarmes em minutos.
+    Obtém total de alarmes e tempo total alarmado de TODAS as usinas em uma única query.
+    
+    Substitui as chamadas de calcular_total_alarmes / calcular_tempo_total_alarmado
+    feitas usina por usina. Usinas sem alarmes no período aparecem com zero.
+    
+    O ranking já vem ordenado (mais alarmes primeiro) e paginado pelo banco.
+    As colunas *_geral / total_usinas trazem os totais de TODAS as usinas,
+    independente da página retornada.
+    
+    Meses fechados já consolidados em `fato_alarmes_mensal` são lidos direto
+    da tabela consolidada; os demais (mês atual ou ainda não consolidados)
+    são agregados ao vivo nas tabelas de alarmes.
     
     Parâmetros:
-        usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
+        limite: Quantidade de usinas a retornar (padrão: todas)
+        offset: Quantidade de usinas a pular (paginação)
     
     Retorna:
-        float: Tempo médio em minutos
+        DataFrame: Colunas [usina_id, usina_nome, total_alarmes, tempo_total_minutos,
+                   total_usinas, total_alarmes_geral, tempo_total_geral]
     
     Exemplo:
-        >>> tempo = calcular_tempo_medio_reconhecimento(86, [{'ano': 2025, 'mes': 6}])
-        >>> print(f"Tempo médio: {tempo:.2f} minutos")
-    """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+        >>> df = obter_ranking_usinas(((2025, 6),), limite=20, offset=0)
+        >>> print(df['total_alarmes_geral'].iloc[0])
+    """
+    tabelas = listar_tabelas_alarme_periodos(periodos)
+    consolidados = listar_periodos_consolidados(periodos)
+    chaves_consolidadas = set(consolidados)
+    
+    # Cada tabela só contribui com os alarmes da própria usina
+    subqueries = [
+        f"SELECT id, power_station_id, {SQL_DURACAO_MINUTOS} AS duracao_minutos "
+        f"FROM public.{tabela['nome_tabela']} "
+        f"WHERE power_station_id = {int(tabela['usina_id'])}"
+        for tabela in tabelas
+        if (tabela['usina_id'], tabela['ano'], tabela['mes']) not in chaves_consolidadas
+    ]
+    
+    if subqueries:
+        union_tabelas = " UNION ALL ".join(subqueries)
+    else:
+        # Nenhuma tabela a agregar ao vivo
+        union_tabelas = (
+            "SELECT NULL::INTEGER AS id, NULL::INTEGER AS power_station_id, "
+            "NULL::NUMERIC AS duracao_minutos LIMIT 0"
+        )
     
-    query_sql = f"""
-        SELECT 
-            COALESCE(AVG(
-                EXTRACT(EPOCH FROM (
-                    a.acknowledgement_date - a.date_time
-                )) / 60
-            ), 0) AS tempo_medio_minutos
+    parciais = [f"""
+        SELECT
+            a.power_station_id AS usina_id,
+            COUNT(a.id) AS total_alarmes,
+            SUM(a.duracao_minutos) AS tempo_total_minutos
         FROM (
             {union_tabelas}
         ) a
-        WHERE a.power_station_id = :usina_id
-        AND a.acknowledgement_date IS NOT NULL
+        GROUP BY a.power_station_id
+    """]
+    
+    if consolidados:
+        # Só meses sem alarmes abertos são lidos consolidados: o tempo é o fechado
+        lista_chaves = ", ".join(
+            f"({int(usina_id)}, {int(ano)}, {int(mes)})" for usina_id, ano, mes in consolidados
+        )
+        parciais.append(f"""
+        SELECT
+            f.usina_id,
+            f.total_alarmes,
+            f.tempo_fechado_minutos AS tempo_total_minutos
+        FROM public.{TABELA_CONSOLIDADA_MENSAL} f
+        WHERE (f.usina_id, f.ano, f.mes) IN ({lista_chaves})
+        """)
+    
+    # Janelas (OVER ()) são calculadas antes do LIMIT: totais de todas as usinas
+    query_sql = f"""
+        SELECT
+            r.*,
+            COUNT(*) OVER () AS total_usinas,
+            SUM(r.total_alarmes) OVER () AS total_alarmes_geral,
+            SUM(r.tempo_total_minutos) OVER () AS tempo_total_geral
+        FROM (
+            SELECT
+                ps.id AS usina_id,
+                ps.name AS usina_nome,
+                COALESCE(SUM(t.total_alarmes), 0)::BIGINT AS total_alarmes,
+                COALESCE(SUM(t.tempo_total_minutos), 0) AS tempo_total_minutos
+            FROM public.power_station ps
+            LEFT JOIN (
+                {" UNION ALL ".join(parciais)}
+            ) t ON t.usina_id = ps.id
+            GROUP BY ps.id, ps.name
+        ) r
+        ORDER BY r.total_alarmes DESC, r.usina_nome ASC
+        LIMIT :limite OFFSET :offset
     """
     
     try:
         engine = obter_engine()
-        with engine.connect() as conexao:
-            resultado = conexao.execute(text(query_sql), {"usina_id": usina_id})
-            return float(resultado.fetchone()[0] or 0)
+        return pd.read_sql_query(
+            text(query_sql),
+            engine,
+            params={"limite": limite, "offset": offset}
+        )
     except Exception as erro:
-        logger.error(f"Erro ao calcular tempo médio de reconhecimento: {erro}")
-        return 0.0
+        logger.error(f"Erro ao obter ranking de usinas: {erro}")
+        return pd.DataFrame()
 
 
 # ============================================================================
 # QUERIES DE RANKINGS - EQUIPAMENTOS
 # ============================================================================
 
+@consulta_em_cache
 def obter_top_equipamentos_por_quantidade(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -344,7 +1323,7 @@ def obter_top_equipamentos_por_quantidade(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de equipamentos no ranking (padrão: 10)
     
     Retorna:
@@ -352,58 +1331,45 @@ def obter_top_equipamentos_por_quantidade(
                            quantidade_alarmes, duracao_total_minutos, duracao_media_minutos]
     
     Exemplo:
-        >>> df = obter_top_equipamentos_por_quantidade(86, [{'ano': 2025, 'mes': 6}], limite=5)
+        >>> df = obter_top_equipamentos_por_quantidade(86, ((2025, 6),), limite=5)
         >>> print(df.head())
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "duracao_minutos")
+    )
     
     query_sql = f"""
         SELECT
             e.name AS equipamento_nome,
-            COALESCE(s.name, 'N/A') AS skid_nome,
-            CASE 
-                WHEN s.name IS NOT NULL THEN e.name || ' - ' || s.name
-                ELSE e.name
-            END AS equipamento_nome_formatado,
+            s.name AS skid_nome,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos,
-            ROUND(
-                AVG(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
-            ) AS duracao_media_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos,
+            ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.equipment e ON a.equipment_id = e.id
         LEFT JOIN public.skid s ON e.skid_id = s.id
-        WHERE a.power_station_id = :usina_id
         GROUP BY e.id, e.name, s.name
         ORDER BY quantidade_alarmes DESC
         LIMIT :limite
     """
     
     try:
-        engine = obter_engine()
-        return pd.read_sql_query(
-            text(query_sql), 
-            engine, 
-            params={"usina_id": usina_id, "limite": limite}
+        df = ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
         )
+        return formatar_nomes_equipamentos(df, com_parenteses=False)
     except Exception as erro:
         logger.error(f"Erro ao obter top equipamentos por quantidade: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_top_equipamentos_por_duracao(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -411,62 +1377,132 @@ def obter_top_equipamentos_por_duracao(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de equipamentos no ranking (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [equipamento_nome, skid_nome, equipamento_nome_formatado,
                            quantidade_alarmes, duracao_total_minutos, duracao_media_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "duracao_minutos")
+    )
     
     query_sql = f"""
         SELECT
             e.name AS equipamento_nome,
-            COALESCE(s.name, 'N/A') AS skid_nome,
-            CASE 
-                WHEN s.name IS NOT NULL THEN e.name || ' - (' || s.name || ')'
-                ELSE e.name
-            END AS equipamento_nome_formatado,
+            s.name AS skid_nome,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos,
-            ROUND(
-                AVG(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
-            ) AS duracao_media_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos,
+            ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.equipment e ON a.equipment_id = e.id
         LEFT JOIN public.skid s ON e.skid_id = s.id
-        WHERE a.power_station_id = :usina_id
         GROUP BY e.id, e.name, s.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
     """
     
     try:
-        engine = obter_engine()
-        return pd.read_sql_query(
-            text(query_sql), 
-            engine, 
-            params={"usina_id": usina_id, "limite": limite}
+        df = ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
         )
+        return formatar_nomes_equipamentos(df)
     except Exception as erro:
         logger.error(f"Erro ao obter top equipamentos por duração: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
+def obter_top_equipamentos_com_qtd_e_duracao(
+    usina_id: int, 
+    periodos: Periodos, 
+    limite: int = LIMITE_TOP_10
+) -> pd.DataFrame:
+    """
+    Obtém os equipamentos que estão no top por quantidade OU por duração.
+    
+    Uma única agregação calcula quantidade e duração de todos os equipamentos;
+    o resultado é a união do top N por quantidade com o top N por duração,
+    já com as duas métricas em cada linha (até 2 x limite linhas).
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+        limite: Número de equipamentos em cada um dos dois rankings (padrão: 10)
+    
+    Retorna:
+        DataFrame: Colunas [equipamento_nome, skid_nome, equipamento_nome_formatado,
+                           quantidade_alarmes, duracao_total_minutos, duracao_media_minutos]
+                   ordenadas por quantidade de alarmes
+    
+    Exemplo:
+        >>> df = obter_top_equipamentos_com_qtd_e_duracao(86, ((2025, 6),), limite=10)
+        >>> df.nlargest(5, 'duracao_total_minutos')
+    """
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "duracao_minutos")
+    )
+    
+    query_sql = f"""
+        WITH agregado AS (
+            SELECT
+                e.id AS equipamento_id,
+                e.name AS equipamento_nome,
+                s.name AS skid_nome,
+                COUNT(a.id) AS quantidade_alarmes,
+                SUM(a.duracao_minutos) AS duracao_total_minutos,
+                ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
+            FROM (
+                {union_tabelas}
+            ) a
+            JOIN public.equipment e ON a.equipment_id = e.id
+            LEFT JOIN public.skid s ON e.skid_id = s.id
+            GROUP BY e.id, e.name, s.name
+        ),
+        top_quantidade AS (
+            SELECT equipamento_id FROM agregado
+            ORDER BY quantidade_alarmes DESC
+            LIMIT :limite
+        ),
+        top_duracao AS (
+            SELECT equipamento_id FROM agregado
+            ORDER BY duracao_total_minutos DESC
+            LIMIT :limite
+        )
+        SELECT
+            equipamento_nome,
+            skid_nome,
+            quantidade_alarmes,
+            duracao_total_minutos,
+            duracao_media_minutos
+        FROM agregado
+        WHERE equipamento_id IN (
+            SELECT equipamento_id FROM top_quantidade
+            UNION ALL
+            SELECT equipamento_id FROM top_duracao
+        )
+        ORDER BY quantidade_alarmes DESC, duracao_total_minutos DESC
+    """
+    
+    try:
+        df = ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
+        )
+        return formatar_nomes_equipamentos(df)
+    except Exception as erro:
+        logger.error(f"Erro ao obter top equipamentos por quantidade e duração: {erro}")
+        return pd.DataFrame()
+
+
+@consulta_em_cache
 def obter_equipamentos_sem_comunicacao(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -474,59 +1510,41 @@ def obter_equipamentos_sem_comunicacao(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de equipamentos (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [equipamento_nome, skid_nome, equipamento_nome_formatado,
                            quantidade_alarmes, duracao_total_minutos, duracao_media_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "duracao_minutos"),
+        filtro_extra="description ILIKE '%sem comunica%'"
+    )
     
     query_sql = f"""
         SELECT
             e.name AS equipamento_nome,
-            COALESCE(s.name, 'N/A') AS skid_nome,
-            CASE 
-                WHEN s.name IS NOT NULL THEN e.name || ' - (' || s.name || ')'
-                ELSE e.name
-            END AS equipamento_nome_formatado,
+            s.name AS skid_nome,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos,
-            ROUND(
-                AVG(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
-            ) AS duracao_media_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos,
+            ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.equipment e ON a.equipment_id = e.id
         LEFT JOIN public.skid s ON e.skid_id = s.id
-        WHERE a.power_station_id = :usina_id
-        AND (
-            a.description ILIKE '%sem comunica%'
-            OR a.description ILIKE '%sem comunicacao%'
-            OR a.description ILIKE '%sem comunicação%'
-        )
         GROUP BY e.id, e.name, s.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
     """
     
     try:
-        engine = obter_engine()
-        return pd.read_sql_query(
-            text(query_sql), 
-            engine, 
-            params={"usina_id": usina_id, "limite": limite}
+        df = ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
         )
+        return formatar_nomes_equipamentos(df)
     except Exception as erro:
         logger.error(f"Erro ao obter equipamentos sem comunicação: {erro}")
         return pd.DataFrame()
@@ -536,9 +1554,10 @@ def obter_equipamentos_sem_comunicacao(
 # QUERIES DE RANKINGS - TELEOBJETOS
 # ============================================================================
 
+@consulta_em_cache
 def obter_top_teleobjetos_por_quantidade(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -546,57 +1565,47 @@ def obter_top_teleobjetos_por_quantidade(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de teleobjetos (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [teleobjeto_nome, quantidade_alarmes, 
                            duracao_total_minutos, duracao_media_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "tele_object_id", "duracao_minutos")
+    )
     
     query_sql = f"""
         SELECT
             toc.name AS teleobjeto_nome,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos,
-            ROUND(
-                AVG(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
-            ) AS duracao_media_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos,
+            ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
         JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-        WHERE a.power_station_id = :usina_id
         GROUP BY toc.id, toc.name
         ORDER BY quantidade_alarmes DESC
         LIMIT :limite
     """
     
     try:
-        engine = obter_engine()
-        return pd.read_sql_query(
-            text(query_sql), 
-            engine, 
-            params={"usina_id": usina_id, "limite": limite}
+        return ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
         )
     except Exception as erro:
         logger.error(f"Erro ao obter top teleobjetos por quantidade: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_top_teleobjetos_por_duracao(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -604,75 +1613,146 @@ def obter_top_teleobjetos_por_duracao(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de teleobjetos (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [teleobjeto_nome, quantidade_alarmes, 
                            duracao_total_minutos, duracao_media_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "tele_object_id", "duracao_minutos")
+    )
     
     query_sql = f"""
         SELECT
             toc.name AS teleobjeto_nome,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos,
-            ROUND(
-                AVG(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
-            ) AS duracao_media_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos,
+            ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
         JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-        WHERE a.power_station_id = :usina_id
         GROUP BY toc.id, toc.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
     """
     
     try:
-        engine = obter_engine()
-        return pd.read_sql_query(
-            text(query_sql), 
-            engine, 
-            params={"usina_id": usina_id, "limite": limite}
+        return ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
         )
     except Exception as erro:
         logger.error(f"Erro ao obter top teleobjetos por duração: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
+def obter_top_teleobjetos_com_qtd_e_duracao(
+    usina_id: int, 
+    periodos: Periodos, 
+    limite: int = LIMITE_TOP_10
+) -> pd.DataFrame:
+    """
+    Obtém os teleobjetos que estão no top por quantidade OU por duração.
+    
+    Mesma estratégia de obter_top_equipamentos_com_qtd_e_duracao: uma única
+    agregação e a união dos dois rankings, com as duas métricas por linha.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+        limite: Número de teleobjetos em cada um dos dois rankings (padrão: 10)
+    
+    Retorna:
+        DataFrame: Colunas [teleobjeto_nome, quantidade_alarmes, 
+                           duracao_total_minutos, duracao_media_minutos]
+                   ordenadas por quantidade de alarmes
+    """
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "tele_object_id", "duracao_minutos")
+    )
+    
+    query_sql = f"""
+        WITH agregado AS (
+            SELECT
+                toc.id AS teleobjeto_config_id,
+                toc.name AS teleobjeto_nome,
+                COUNT(a.id) AS quantidade_alarmes,
+                SUM(a.duracao_minutos) AS duracao_total_minutos,
+                ROUND(AVG(a.duracao_minutos), 2) AS duracao_media_minutos
+            FROM (
+                {union_tabelas}
+            ) a
+            JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
+            JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
+            GROUP BY toc.id, toc.name
+        ),
+        top_quantidade AS (
+            SELECT teleobjeto_config_id FROM agregado
+            ORDER BY quantidade_alarmes DESC
+            LIMIT :limite
+        ),
+        top_duracao AS (
+            SELECT teleobjeto_config_id FROM agregado
+            ORDER BY duracao_total_minutos DESC
+            LIMIT :limite
+        )
+        SELECT
+            teleobjeto_nome,
+            quantidade_alarmes,
+            duracao_total_minutos,
+            duracao_media_minutos
+        FROM agregado
+        WHERE teleobjeto_config_id IN (
+            SELECT teleobjeto_config_id FROM top_quantidade
+            UNION ALL
+            SELECT teleobjeto_config_id FROM top_duracao
+        )
+        ORDER BY quantidade_alarmes DESC, duracao_total_minutos DESC
+    """
+    
+    try:
+        return ler_sql_em_lotes(
+            query_sql, {"usina_id": usina_id, "limite": limite}, tipos=TIPOS_RANKING
+        )
+    except Exception as erro:
+        logger.error(f"Erro ao obter top teleobjetos por quantidade e duração: {erro}")
+        return pd.DataFrame()
+
+
 # ============================================================================
 # QUERIES DE SEVERIDADE
 # ============================================================================
 
+@consulta_em_cache
 def obter_tempo_por_severidade(
     usina_id: int, 
-    periodos: List[Dict[str, int]]
+    periodos: Periodos
 ) -> pd.DataFrame:
     """
     Obtém o tempo total e percentual por severidade de alarme.
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
         DataFrame: Colunas [severidade_nome, severidade_cor, quantidade_alarmes,
                            duracao_total_minutos, percentual_do_total]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "alarm_severity_id", "duracao_minutos")
+    )
     
+    # O total do percentual é uma janela sobre os grupos (SUM(SUM(...)) OVER ()):
+    # as tabelas de alarmes são lidas uma vez só, em vez de uma segunda vez
+    # numa subquery
     query_sql = f"""
         SELECT
             asev.id AS severidade_id,
@@ -680,22 +1760,15 @@ def obter_tempo_por_severidade(
             asev.color AS severidade_cor,
             asev.level AS severidade_level,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos,
+            SUM(a.duracao_minutos) AS duracao_total_minutos,
             ROUND(
-                (SUM(EXTRACT(EPOCH FROM (COALESCE(a.clear_date, NOW()) - a.date_time)) / 60) * 100.0) /
-                NULLIF((SELECT SUM(EXTRACT(EPOCH FROM (COALESCE(clear_date, NOW()) - date_time)) / 60)
-                 FROM ({union_tabelas}) sub
-                 WHERE sub.power_station_id = :usina_id), 0)
+                (SUM(a.duracao_minutos) * 100.0) /
+                NULLIF(SUM(SUM(a.duracao_minutos)) OVER (), 0)
                 , 2) AS percentual_do_total
         FROM (
             {union_tabelas}
         ) a
         JOIN public.alarm_severity asev ON a.alarm_severity_id = asev.id
-        WHERE a.power_station_id = :usina_id
         GROUP BY asev.id, asev.name, asev.color, asev.level
         ORDER BY asev.level ASC
     """
@@ -712,9 +1785,10 @@ def obter_tempo_por_severidade(
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_alarmes_criticos_por_equipamento(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -722,36 +1796,30 @@ def obter_alarmes_criticos_por_equipamento(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de equipamentos (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [equipamento_nome, skid_nome, equipamento_nome_formatado,
                            quantidade_alarmes_criticos, duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "duracao_minutos"),
+        filtro_extra="alarm_severity_id = 1"
+    )
     
     query_sql = f"""
         SELECT
             e.name AS equipamento_nome,
-            COALESCE(s.name, 'N/A') AS skid_nome,
-            CASE 
-                WHEN s.name IS NOT NULL THEN e.name || ' - (' || s.name || ')'
-                ELSE e.name
-            END AS equipamento_nome_formatado,
+            s.name AS skid_nome,
             COUNT(a.id) AS quantidade_alarmes_criticos,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.equipment e ON a.equipment_id = e.id
         LEFT JOIN public.skid s ON e.skid_id = s.id
-        WHERE a.power_station_id = :usina_id
-        AND a.alarm_severity_id = 1
         GROUP BY e.id, e.name, s.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
@@ -759,19 +1827,21 @@ def obter_alarmes_criticos_por_equipamento(
     
     try:
         engine = obter_engine()
-        return pd.read_sql_query(
+        df = pd.read_sql_query(
             text(query_sql), 
             engine, 
             params={"usina_id": usina_id, "limite": limite}
         )
+        return formatar_nomes_equipamentos(df)
     except Exception as erro:
         logger.error(f"Erro ao obter alarmes críticos por equipamento: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_alarmes_criticos_por_teleobjeto(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -779,31 +1849,29 @@ def obter_alarmes_criticos_por_teleobjeto(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de teleobjetos (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [teleobjeto_nome, quantidade_alarmes_criticos,
                            duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "tele_object_id", "duracao_minutos"),
+        filtro_extra="alarm_severity_id = 1"
+    )
     
     query_sql = f"""
         SELECT
             toc.name AS teleobjeto_nome,
             COUNT(a.id) AS quantidade_alarmes_criticos,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
         JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-        WHERE a.power_station_id = :usina_id
-        AND a.alarm_severity_id = 1
         GROUP BY toc.id, toc.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
@@ -825,37 +1893,82 @@ def obter_alarmes_criticos_por_teleobjeto(
 # QUERIES DE EVOLUÇÃO TEMPORAL
 # ============================================================================
 
+@consulta_em_cache
 def obter_evolucao_diaria(
     usina_id: int, 
-    periodos: List[Dict[str, int]]
+    periodos: Periodos
 ) -> pd.DataFrame:
     """
     Obtém a evolução diária de alarmes (quantidade e duração).
     
+    Meses fechados já consolidados em `fato_alarmes_diario` são lidos direto
+    da tabela consolidada; os demais (mês atual ou ainda não consolidados)
+    são agregados ao vivo nas tabelas de alarmes.
+    
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
         DataFrame: Colunas [data, quantidade_alarmes, duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
-    
-    query_sql = f"""
+    meses_consolidados = {
+        (ano, mes)
+        for usina, ano, mes in listar_periodos_consolidados(periodos, TABELA_CONSOLIDADA_DIARIA)
+        if usina == usina_id
+    }
+    tabelas_existentes = listar_tabelas_existentes(usina_id, periodos)
+    periodos_ao_vivo = tuple(
+        (ano, mes) for ano, mes in normalizar_periodos(periodos)
+        if (ano, mes) not in meses_consolidados
+        and construir_nome_tabela_alarme(usina_id, ano, mes) in tabelas_existentes
+    )
+    
+    parciais = []
+    
+    if periodos_ao_vivo:
+        union_tabelas = construir_union_all_tabelas(
+            usina_id, periodos_ao_vivo,
+            ("id", "date_time", "duracao_minutos")
+        )
+        parciais.append(f"""
         SELECT
             DATE(a.date_time) AS data,
             COUNT(a.id) AS quantidade_alarmes,
-            SUM(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60
-            ) AS duracao_total_minutos
+            SUM(a.duracao_minutos) AS duracao_total_minutos
         FROM (
             {union_tabelas}
         ) a
-        WHERE a.power_station_id = :usina_id
         GROUP BY DATE(a.date_time)
-        ORDER BY data ASC
+        """)
+    
+    if meses_consolidados:
+        # Só meses sem alarmes abertos são lidos consolidados: o tempo é o fechado
+        lista_periodos = ", ".join(f"({int(ano)}, {int(mes)})" for ano, mes in sorted(meses_consolidados))
+        parciais.append(f"""
+        SELECT
+            f.data,
+            f.total_alarmes AS quantidade_alarmes,
+            f.tempo_fechado_minutos AS duracao_total_minutos
+        FROM public.{TABELA_CONSOLIDADA_DIARIA} f
+        WHERE f.usina_id = :usina_id
+        AND (f.ano, f.mes) IN ({lista_periodos})
+        """)
+    
+    if not parciais:
+        return pd.DataFrame()
+    
+    # Um mesmo dia pode vir das duas partes (alarmes fora do mês da tabela)
+    query_sql = f"""
+        SELECT
+            t.data,
+            SUM(t.quantidade_alarmes)::BIGINT AS quantidade_alarmes,
+            SUM(t.duracao_total_minutos) AS duracao_total_minutos
+        FROM (
+            {" UNION ALL ".join(parciais)}
+        ) t
+        GROUP BY t.data
+        ORDER BY t.data ASC
     """
     
     try:
@@ -870,9 +1983,10 @@ def obter_evolucao_diaria(
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_alarmes_nao_finalizados(
     usina_id: int, 
-    periodos: List[Dict[str, int]],
+    periodos: Periodos,
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -880,23 +1994,23 @@ def obter_alarmes_nao_finalizados(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de equipamentos (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [equipamento_nome, skid_nome, equipamento_nome_formatado,
                            quantidade_alarmes_ativos, duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "date_time"),
+        filtro_extra="clear_date IS NULL"
+    )
     
     query_sql = f"""
         SELECT
             e.name AS equipamento_nome,
-            COALESCE(s.name, 'N/A') AS skid_nome,
-            CASE 
-                WHEN s.name IS NOT NULL THEN e.name || ' - (' || s.name || ')'
-                ELSE e.name
-            END AS equipamento_nome_formatado,
+            s.name AS skid_nome,
             COUNT(a.id) AS quantidade_alarmes_ativos,
             SUM(
                 EXTRACT(EPOCH FROM (
@@ -908,8 +2022,6 @@ def obter_alarmes_nao_finalizados(
         ) a
         JOIN public.equipment e ON a.equipment_id = e.id
         LEFT JOIN public.skid s ON e.skid_id = s.id
-        WHERE a.power_station_id = :usina_id
-        AND a.clear_date IS NULL
         GROUP BY e.id, e.name, s.name
         ORDER BY quantidade_alarmes_ativos DESC
         LIMIT :limite
@@ -917,11 +2029,12 @@ def obter_alarmes_nao_finalizados(
     
     try:
         engine = obter_engine()
-        return pd.read_sql_query(
+        df = pd.read_sql_query(
             text(query_sql), 
             engine, 
             params={"usina_id": usina_id, "limite": limite}
         )
+        return formatar_nomes_equipamentos(df)
     except Exception as erro:
         logger.error(f"Erro ao obter alarmes não finalizados: {erro}")
         return pd.DataFrame()
@@ -931,22 +2044,27 @@ def obter_alarmes_nao_finalizados(
 # QUERIES DE RECONHECIMENTO
 # ============================================================================
 
+@consulta_em_cache
 def obter_tempo_reconhecimento_por_severidade(
     usina_id: int, 
-    periodos: List[Dict[str, int]]
+    periodos: Periodos
 ) -> pd.DataFrame:
     """
     Obtém o tempo médio de reconhecimento por severidade.
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
         DataFrame: Colunas [severidade_nome, severidade_cor, 
                            tempo_medio_reconhecimento_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "alarm_severity_id", "date_time", "acknowledgement_date"),
+        filtro_extra="acknowledgement_date IS NOT NULL"
+    )
     
     query_sql = f"""
         SELECT
@@ -962,8 +2080,6 @@ def obter_tempo_reconhecimento_por_severidade(
             {union_tabelas}
         ) a
         JOIN public.alarm_severity asev ON a.alarm_severity_id = asev.id
-        WHERE a.power_station_id = :usina_id
-        AND a.acknowledgement_date IS NOT NULL
         GROUP BY asev.id, asev.name, asev.color
         ORDER BY asev.level ASC
     """
@@ -980,9 +2096,10 @@ def obter_tempo_reconhecimento_por_severidade(
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_top_usuarios_reconhecimento(
     usina_id: int, 
-    periodos: List[Dict[str, int]],
+    periodos: Periodos,
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -990,13 +2107,17 @@ def obter_top_usuarios_reconhecimento(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de usuários (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [usuario_nome, quantidade_reconhecimentos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "acknowledged_user_id"),
+        filtro_extra="acknowledgement_date IS NOT NULL"
+    )
     
     query_sql = f"""
         SELECT
@@ -1006,8 +2127,6 @@ def obter_top_usuarios_reconhecimento(
             {union_tabelas}
         ) a
         JOIN public.users u ON a.acknowledged_user_id = u.id
-        WHERE a.power_station_id = :usina_id
-        AND a.acknowledgement_date IS NOT NULL
         GROUP BY u.id, u.name
         ORDER BY quantidade_reconhecimentos DESC
         LIMIT :limite
@@ -1029,37 +2148,72 @@ def obter_top_usuarios_reconhecimento(
 # QUERIES PARA TABELA DE ALARMES
 # ============================================================================
 
+@consulta_em_cache
 def obter_lista_alarmes(
     usina_id: int, 
-    periodos: List[Dict[str, int]],
-    offset: int = 0,
+    periodos: Periodos,
+    cursor: Optional[Tuple[datetime, int]] = None,
     limite: int = 50
 ) -> pd.DataFrame:
     """
-    Obtém lista completa de alarmes para exibição em tabela.
+    Obtém uma página da lista de alarmes para exibição em tabela.
+    
+    A paginação é por cursor (keyset): a página seguinte começa logo após o
+    (data_inicio, alarme_id) do último alarme da página anterior, então o
+    banco não precisa percorrer e descartar as páginas anteriores (OFFSET).
+    Cada tabela lê no máximo `limite` alarmes, de trás para frente no índice
+    (power_station_id, date_time, id); a página é escolhida entre eles antes
+    dos JOINs, e o total de alarmes do filtro vem de contar_alarmes.
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
-        offset: Deslocamento para paginação (padrão: 0)
+        periodos: Tupla de períodos (ano, mes)
+        cursor: (data_inicio, alarme_id) do último alarme da página anterior;
+                None para a primeira página
         limite: Número de alarmes por página (padrão: 50)
     
     Retorna:
-        DataFrame: Colunas [data_inicio, data_fim, duracao_minutos, equipamento_nome,
-                           teleobjeto_nome, severidade_nome, descricao, 
-                           data_reconhecimento, usuario_reconhecimento]
-    """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+        DataFrame: Colunas [alarme_id, data_inicio, data_fim, duracao_minutos,
+                           equipamento_nome, teleobjeto_nome, severidade_nome,
+                           descricao, data_reconhecimento, usuario_reconhecimento]
     
+    Exemplo:
+        >>> pagina1 = obter_lista_alarmes(86, ((2025, 6),), limite=50)
+        >>> ultimo = pagina1.iloc[-1]
+        >>> pagina2 = obter_lista_alarmes(
+        ...     86, ((2025, 6),), (ultimo['data_inicio'], ultimo['alarme_id']), 50
+        ... )
+    """
+    parametros = {"usina_id": usina_id, "limite": limite}
+    filtro_cursor = ""
+    if cursor is not None:
+        # Comparação de linha na ordem do índice: vira condição do index scan
+        filtro_cursor = (
+            "(power_station_id, date_time, id) < (:usina_id, :cursor_data, :cursor_id)"
+        )
+        parametros["cursor_data"] = pd.Timestamp(cursor[0]).to_pydatetime()
+        parametros["cursor_id"] = int(cursor[1])
+    
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        (
+            "id", "equipment_id", "tele_object_id", "alarm_severity_id", "date_time",
+            "clear_date", "acknowledgement_date", "acknowledged_user_id", "description",
+            "duracao_minutos",
+        ),
+        filtro_extra=filtro_cursor,
+        ordem_limite="ORDER BY date_time DESC, id DESC LIMIT :limite"
+    )
+    
+    # Cada tabela entrega já ordenado ao Merge Append, que para no LIMIT;
+    # os nomes são buscados só para os alarmes da página. LEFT JOIN: um alarme
+    # sem cadastro correspondente continua na página
     query_sql = f"""
         SELECT
+            a.id AS alarme_id,
             a.date_time AS data_inicio,
             COALESCE(a.clear_date, NULL) AS data_fim,
-            ROUND(
-                EXTRACT(EPOCH FROM (
-                    COALESCE(a.clear_date, NOW()) - a.date_time
-                )) / 60, 2
-            ) AS duracao_minutos,
+            ROUND(a.duracao_minutos, 2) AS duracao_minutos,
             e.name AS equipamento_nome,
             toc.name AS teleobjeto_nome,
             asev.name AS severidade_nome,
@@ -1068,37 +2222,81 @@ def obter_lista_alarmes(
             a.acknowledgement_date AS data_reconhecimento,
             u.name AS usuario_reconhecimento
         FROM (
-            {union_tabelas}
+            SELECT *
+            FROM (
+                {union_tabelas}
+            ) pagina
+            ORDER BY pagina.date_time DESC, pagina.id DESC
+            LIMIT :limite
         ) a
-        JOIN public.equipment e ON a.equipment_id = e.id
-        JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
-        JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-        JOIN public.alarm_severity asev ON a.alarm_severity_id = asev.id
+        LEFT JOIN public.equipment e ON a.equipment_id = e.id
+        LEFT JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
+        LEFT JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
+        LEFT JOIN public.alarm_severity asev ON a.alarm_severity_id = asev.id
         LEFT JOIN public.users u ON a.acknowledged_user_id = u.id
-        WHERE a.power_station_id = :usina_id
-        ORDER BY a.date_time DESC
-        LIMIT :limite OFFSET :offset
+        ORDER BY a.date_time DESC, a.id DESC
     """
     
     try:
-        engine = obter_engine()
-        return pd.read_sql_query(
-            text(query_sql), 
-            engine, 
-            params={"usina_id": usina_id, "limite": limite, "offset": offset}
+        # Tipos explícitos: o pandas não precisa inferir coluna a coluna, e
+        # uma página em que todas as datas são NULL mantém o mesmo schema.
+        # A leitura em lotes mantém a memória limitada mesmo com `limite` grande
+        return ler_sql_em_lotes(
+            query_sql,
+            parametros,
+            tipos={
+                "alarme_id": "int64",
+                "data_inicio": "datetime64[ns]",
+                "data_fim": "datetime64[ns]",
+                "duracao_minutos": "float64",
+                "data_reconhecimento": "datetime64[ns]",
+            }
         )
     except Exception as erro:
         logger.error(f"Erro ao obter lista de alarmes: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
+def contar_alarmes(usina_id: int, periodos: Periodos) -> int:
+    """
+    Conta os alarmes da usina nos períodos (total da lista de alarmes).
+    
+    Consulta separada da página, sem JOINs: pode ser respondida só pelo
+    índice (power_station_id, date_time, id) de cada tabela e fica em cache, então
+    trocar de página não conta tudo de novo.
+    
+    Parâmetros:
+        usina_id: ID da usina
+        periodos: Tupla de períodos (ano, mes)
+    
+    Retorna:
+        int: Quantidade de alarmes (0 em caso de erro)
+    
+    Exemplo:
+        >>> contar_alarmes(86, ((2025, 6),))
+        1234
+    """
+    union_tabelas = construir_union_all_tabelas(usina_id, periodos, ("id",))
+    query_sql = f"SELECT COUNT(*) FROM ({union_tabelas}) a"
+    
+    try:
+        engine = obter_engine()
+        with engine.connect() as conexao:
+            return int(conexao.execute(text(query_sql), {"usina_id": usina_id}).scalar())
+    except Exception as erro:
+        logger.error(f"Erro ao contar alarmes: {erro}")
+        return 0
+
+
 # ============================================================================
 # QUERIES ESPECÍFICAS PARA NCU (Network Control Unit)
 # ============================================================================
 
+@consulta_em_cache
 def obter_alarmes_ncu(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_10
 ) -> pd.DataFrame:
     """
@@ -1106,38 +2304,37 @@ def obter_alarmes_ncu(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de equipamentos NCU (padrão: 10)
     
     Retorna:
         DataFrame: Colunas [equipamento_nome, skid_nome, equipamento_nome_formatado,
                            quantidade_alarmes, duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    # As NCUs são resolvidas uma vez na tabela de equipamentos (pequena): cada
+    # tabela de alarmes lê só os alarmes desses equipamentos pelo índice
+    # (power_station_id, equipment_id), em vez de juntar todos e filtrar o nome depois
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "duracao_minutos"),
+        filtro_extra=(
+            "equipment_id IN (SELECT id FROM public.equipment WHERE name ILIKE '%NCU%')"
+        )
+    )
     
     query_sql = f"""
         SELECT
             e.name AS equipamento_nome,
-            COALESCE(s.name, 'N/A') AS skid_nome,
-            CASE 
-                WHEN s.name IS NOT NULL THEN e.name || ' - (' || s.name || ')'
-                ELSE e.name
-            END AS equipamento_nome_formatado,
+            s.name AS skid_nome,
             COUNT(a.id) AS quantidade_alarmes,
             ROUND(
-                SUM(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
+                SUM(a.duracao_minutos), 2
             ) AS duracao_total_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.equipment e ON a.equipment_id = e.id
         LEFT JOIN public.skid s ON e.skid_id = s.id
-        WHERE a.power_station_id = :usina_id
-        AND e.name ILIKE '%NCU%'
         GROUP BY e.id, e.name, s.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
@@ -1145,19 +2342,21 @@ def obter_alarmes_ncu(
     
     try:
         engine = obter_engine()
-        return pd.read_sql_query(
+        df = pd.read_sql_query(
             text(query_sql), 
             engine, 
             params={"usina_id": usina_id, "limite": limite}
         )
+        return formatar_nomes_equipamentos(df)
     except Exception as erro:
         logger.error(f"Erro ao obter alarmes de NCU: {erro}")
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_teleobjetos_ncu(
     usina_id: int, 
-    periodos: List[Dict[str, int]],
+    periodos: Periodos,
     ncu_nome: str,
     limite: int = LIMITE_TOP_20
 ) -> pd.DataFrame:
@@ -1166,25 +2365,24 @@ def obter_teleobjetos_ncu(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         ncu_nome: Nome do equipamento NCU
         limite: Número máximo de teleobjetos (padrão: 20)
     
     Retorna:
         DataFrame: Colunas [teleobjeto_nome, quantidade_alarmes, duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "equipment_id", "tele_object_id", "duracao_minutos")
+    )
     
     query_sql = f"""
         SELECT
             toc.name AS teleobjeto_nome,
             COUNT(a.id) AS quantidade_alarmes,
             ROUND(
-                SUM(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
+                SUM(a.duracao_minutos), 2
             ) AS duracao_total_minutos
         FROM (
             {union_tabelas}
@@ -1192,8 +2390,7 @@ def obter_teleobjetos_ncu(
         JOIN public.equipment e ON a.equipment_id = e.id
         JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
         JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-        WHERE a.power_station_id = :usina_id
-        AND e.name = :ncu_nome
+        WHERE e.name = :ncu_nome
         GROUP BY toc.id, toc.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
@@ -1215,9 +2412,10 @@ def obter_teleobjetos_ncu(
 # QUERIES ESPECÍFICAS PARA TRACKERS (TR-XXX)
 # ============================================================================
 
+@consulta_em_cache
 def obter_alarmes_trackers(
     usina_id: int, 
-    periodos: List[Dict[str, int]], 
+    periodos: Periodos, 
     limite: int = LIMITE_TOP_20
 ) -> pd.DataFrame:
     """
@@ -1226,8 +2424,9 @@ def obter_alarmes_trackers(
     Agrupa todos os teleobjetos que começam com o mesmo prefixo TR-XXX,
     somando o tempo total alarmado de cada tracker SEM DUPLICIDADE.
     
-    IMPORTANTE: Usa SUBQUERIES ANINHADAS para fundir intervalos sobrepostos.
-    Se um tracker tem múltiplos alarmes simultâneos, o tempo é contado apenas UMA vez.
+    IMPORTANTE: Funde intervalos sobrepostos com uma única função de janela
+    (maior fim acumulado). Se um tracker tem múltiplos alarmes simultâneos,
+    o tempo é contado apenas UMA vez.
     
     Exemplo de aglutinação:
         - Alarme A: 12:00-15:00 (3h)
@@ -1236,146 +2435,73 @@ def obter_alarmes_trackers(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         limite: Número máximo de trackers (padrão: 20)
     
     Retorna:
         DataFrame: Colunas [tracker_code, quantidade_alarmes, duracao_total_minutos]
     
     Exemplo:
-        df = obter_alarmes_trackers(86, [{'ano': 2025, 'mes': 6}], limite=10)
+        df = obter_alarmes_trackers(86, ((2025, 6),), limite=10)
         print(df.head())
         tracker_code  quantidade_alarmes  duracao_total_minutos
         TR-011        150                 1234.56
         TR-010        120                 987.65
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("tele_object_id", "date_time", "clear_date")
+    )
     
     # ========================================================================
-    # QUERY COM SUBQUERIES ANINHADAS (6 NÍVEIS)
+    # FUSÃO DE INTERVALOS COM UMA ÚNICA JANELA
     # ========================================================================
-    # Estratégia: Cada nível anterior é uma subquery do próximo
-    # Lógica de dentro para fora:
-    #   1. alarmes_tracker (mais interno) - Extrai dados brutos
-    #   2. alarmes_ordenados - Adiciona LAG() para detectar sobreposição
-    #   3. grupos_sobrepostos - Marca início de novos grupos
-    #   4. grupos_numerados - Numera grupos com SUM() OVER
-    #   5. intervalos_fundidos - Agrupa e funde intervalos
-    #   6. SELECT final (mais externo) - Soma durações finais
+    # Para cada alarme (ordenado por início dentro do tracker), o maior 'fim'
+    # dos alarmes anteriores diz até onde o tracker já estava alarmado.
+    # Cada alarme contribui só com o trecho que passa desse ponto:
+    #   GREATEST(fim - GREATEST(inicio, fim_acumulado), 0)
+    # Exemplo (A: 12h-18h, B: 13h-14h, C: 15h-19h):
+    #   A → 6h, B → 0h (contido em A), C → 1h (18h-19h) = 7h
     # ========================================================================
     
     query_sql = f"""
-        SELECT 
-            -- ================================================================
-            -- NÍVEL 6 (MAIS EXTERNO): AGREGAÇÃO FINAL POR TRACKER
-            -- ================================================================
-            -- Aqui somamos o tempo total de todos os intervalos fundidos
-            -- Cada tracker pode ter múltiplos intervalos fundidos (gaps entre alarmes)
+        SELECT
             tracker_code,
-            SUM(qtd_alarmes_no_intervalo) AS quantidade_alarmes,
+            COUNT(*) AS quantidade_alarmes,
             ROUND(
                 SUM(
-                    EXTRACT(EPOCH FROM (fim_intervalo - inicio_intervalo)) / 60
+                    EXTRACT(EPOCH FROM GREATEST(
+                        fim - GREATEST(inicio, COALESCE(fim_acumulado, inicio)),
+                        INTERVAL '0'
+                    )) / 60
                 ), 2
             ) AS duracao_total_minutos
         FROM (
-            -- ================================================================
-            -- NÍVEL 5: FUSÃO DE INTERVALOS DENTRO DE CADA GRUPO
-            -- ================================================================
-            -- Para cada grupo_id (intervalos sobrepostos):
-            --   - MIN(inicio): Pega o início do primeiro alarme do grupo
-            --   - MAX(fim): Pega o fim do último alarme do grupo
-            -- Resultado: Um único intervalo fundido por grupo
             SELECT
                 tracker_code,
-                grupo_id,
-                MIN(inicio) AS inicio_intervalo,
-                MAX(fim) AS fim_intervalo,
-                COUNT(alarm_id) AS qtd_alarmes_no_intervalo
+                inicio,
+                fim,
+                -- Maior 'fim' entre os alarmes anteriores do mesmo tracker
+                MAX(fim) OVER (
+                    PARTITION BY tracker_code
+                    ORDER BY inicio, fim
+                    ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                ) AS fim_acumulado
             FROM (
-                -- ============================================================
-                -- NÍVEL 4: NUMERAÇÃO DE GRUPOS
-                -- ============================================================
-                -- Usa SUM(novo_grupo) OVER para numerar grupos sequencialmente
-                -- Alarmes com mesmo grupo_id estão sobrepostos
-                -- Exemplo:
-                --   novo_grupo: 1, 0, 0, 1, 0
-                --   grupo_id:   1, 1, 1, 2, 2
                 SELECT
-                    tracker_code,
-                    inicio,
-                    fim,
-                    alarm_id,
-                    SUM(novo_grupo) OVER (
-                        PARTITION BY tracker_code 
-                        ORDER BY inicio
-                    ) AS grupo_id
+                    -- Extrai 'TR-001' de 'TR-001 - Posição do Tracker'
+                    SPLIT_PART(toc.name, ' - ', 1) AS tracker_code,
+                    a.date_time AS inicio,
+                    -- Se alarme ainda não foi cleared, usa NOW()
+                    COALESCE(a.clear_date, NOW()) AS fim
                 FROM (
-                    -- ========================================================
-                    -- NÍVEL 3: DETECÇÃO DE GRUPOS SOBREPOSTOS
-                    -- ========================================================
-                    -- Marca com 1 quando um novo grupo começa (sem sobreposição)
-                    -- Marca com 0 quando alarme pertence ao grupo anterior (sobreposição)
-                    -- Lógica:
-                    --   - Se inicio > fim_anterior → GAP → novo_grupo = 1
-                    --   - Se inicio <= fim_anterior → SOBREPOSIÇÃO → novo_grupo = 0
-                    SELECT
-                        tracker_code,
-                        inicio,
-                        fim,
-                        alarm_id,
-                        fim_anterior,
-                        CASE 
-                            -- Primeiro alarme do tracker (não tem anterior)
-                            WHEN fim_anterior IS NULL THEN 1
-                            -- Alarme começa DEPOIS do anterior terminar (existe um GAP)
-                            WHEN inicio > fim_anterior THEN 1
-                            -- Alarme sobrepõe o anterior (sem GAP)
-                            ELSE 0
-                        END AS novo_grupo
-                    FROM (
-                        -- ================================================
-                        -- NÍVEL 2: ORDENAÇÃO E DETECÇÃO DE SOBREPOSIÇÃO
-                        -- ================================================
-                        -- Ordena alarmes por tracker_code e inicio
-                        -- Usa LAG() para trazer o 'fim' do alarme anterior
-                        -- Isso permite comparar se alarmes se sobrepõem
-                        SELECT
-                            tracker_code,
-                            inicio,
-                            fim,
-                            alarm_id,
-                            LAG(fim) OVER (
-                                PARTITION BY tracker_code 
-                                ORDER BY inicio
-                            ) AS fim_anterior
-                        FROM (
-                            -- ============================================
-                            -- NÍVEL 1 (MAIS INTERNO): EXTRAÇÃO DOS DADOS
-                            -- ============================================
-                            -- Busca todos os alarmes de trackers (TR-XXX)
-                            -- Extrai apenas TR-XXX do nome completo do teleobjeto
-                            -- Normaliza timestamps (usa NOW() se clear_date é NULL)
-                            SELECT
-                                -- Extrai 'TR-001' de 'TR-001 - Posição do Tracker'
-                                SPLIT_PART(toc.name, ' - ', 1) AS tracker_code,
-                                a.date_time AS inicio,
-                                -- Se alarme ainda não foi cleared, usa NOW()
-                                COALESCE(a.clear_date, NOW()) AS fim,
-                                a.id AS alarm_id
-                            FROM (
-                                {union_tabelas}
-                            ) a
-                            JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
-                            JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-                            WHERE a.power_station_id = :usina_id
-                            AND toc.name LIKE 'TR-%'
-                        ) alarmes_tracker
-                    ) alarmes_ordenados
-                ) grupos_sobrepostos
-            ) grupos_numerados
-            GROUP BY tracker_code, grupo_id
-        ) intervalos_fundidos
+                    {union_tabelas}
+                ) a
+                JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
+                JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
+                WHERE toc.name LIKE 'TR-%'
+            ) alarmes_tracker
+        ) alarmes_acumulados
         GROUP BY tracker_code
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
@@ -1393,9 +2519,10 @@ def obter_alarmes_trackers(
         return pd.DataFrame()
 
 
+@consulta_em_cache
 def obter_teleobjetos_tracker(
     usina_id: int, 
-    periodos: List[Dict[str, int]],
+    periodos: Periodos,
     tracker_code: str,
     limite: int = LIMITE_TOP_20
 ) -> pd.DataFrame:
@@ -1404,33 +2531,31 @@ def obter_teleobjetos_tracker(
     
     Parâmetros:
         usina_id: ID da usina
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
         tracker_code: Código do tracker (ex: 'TR-011')
         limite: Número máximo de teleobjetos (padrão: 20)
     
     Retorna:
         DataFrame: Colunas [teleobjeto_nome, quantidade_alarmes, duracao_total_minutos]
     """
-    union_tabelas = construir_union_all_tabelas(usina_id, periodos)
+    union_tabelas = construir_union_all_tabelas(
+        usina_id, periodos,
+        ("id", "tele_object_id", "duracao_minutos")
+    )
     
     query_sql = f"""
         SELECT
             toc.name AS teleobjeto_nome,
             COUNT(a.id) AS quantidade_alarmes,
             ROUND(
-                SUM(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(a.clear_date, NOW()) - a.date_time
-                    )) / 60
-                ), 2
+                SUM(a.duracao_minutos), 2
             ) AS duracao_total_minutos
         FROM (
             {union_tabelas}
         ) a
         JOIN public.tele_object tobj ON a.tele_object_id = tobj.id
         JOIN public.tele_object_config toc ON tobj.tele_object_config_id = toc.id
-        WHERE a.power_station_id = :usina_id
-        AND toc.name LIKE :tracker_pattern
+        WHERE toc.name LIKE :tracker_pattern
         GROUP BY toc.id, toc.name
         ORDER BY duracao_total_minutos DESC
         LIMIT :limite
@@ -5,6 +5,8 @@ Este módulo contém funções auxiliares gerais usadas em todo o sistema.
 """
 
 from .helpers import (
+    Periodos,
+    normalizar_periodos,
     validar_periodos_selecionados,
     obter_nome_mes,
     construir_texto_periodo,
@@ -12,6 +14,8 @@ from .helpers import (
 )
 
 __all__ = [
+    "Periodos",
+    "normalizar_periodos",
     "validar_periodos_selecionados",
     "obter_nome_mes",
     "construir_texto_periodo",
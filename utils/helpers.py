@@ -6,19 +6,56 @@ diferentes partes do sistema.
 """
 
 import streamlit as st
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Iterable, Union
 from datetime import datetime
 import calendar
 
 from config import LIMITE_MAXIMO_MESES
 
+# Períodos selecionados: tupla ordenada de (ano, mes), ex: ((2025, 5), (2025, 6))
+Periodos = Tuple[Tuple[int, int], ...]
 
-def validar_periodos_selecionados(periodos: List[Dict[str, int]]) -> Tuple[bool, str]:
+# Nomes dos meses em português, indexados pelo número do mês (1-12)
+NOMES_MESES: Dict[int, str] = {
+    1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril",
+    5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto",
+    9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro",
+}
+
+
+def normalizar_periodos(
+    periodos: Iterable[Union[Tuple[int, int], Dict[str, int]]]
+) -> Periodos:
+    """
+    Converte períodos para uma tupla ordenada e sem repetições de (ano, mes).
+    
+    Tuplas são baratas de hashear, então a mesma seleção gera sempre a
+    mesma chave de cache no `st.cache_data`. Aceita também o formato antigo
+    de lista de dicionários {'ano': ..., 'mes': ...}.
+    
+    Parâmetros:
+        periodos: Períodos como tuplas (ano, mes) ou dicionários
+    
+    Retorna:
+        Periodos: Tupla ordenada de (ano, mes)
+    
+    Exemplo:
+        >>> normalizar_periodos([{'ano': 2025, 'mes': 6}, {'ano': 2025, 'mes': 5}])
+        ((2025, 5), (2025, 6))
+    """
+    return tuple(sorted({
+        (int(periodo['ano']), int(periodo['mes'])) if isinstance(periodo, dict)
+        else (int(periodo[0]), int(periodo[1]))
+        for periodo in periodos
+    }))
+
+
+def validar_periodos_selecionados(periodos: Periodos) -> Tuple[bool, str]:
     """
     Valida se os períodos selecionados estão dentro das regras de negócio.
     
     Parâmetros:
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
         Tuple (valido: bool, mensagem_erro: str)
@@ -28,7 +65,7 @@ def validar_periodos_selecionados(periodos: List[Dict[str, int]]) -> Tuple[bool,
         - Pelo menos 1 período deve ser selecionado
     
     Exemplo:
-        >>> periodos = [{'ano': 2025, 'mes': 6}, {'ano': 2025, 'mes': 7}]
+        >>> periodos = ((2025, 6), (2025, 7))
         >>> valido, msg = validar_periodos_selecionados(periodos)
         >>> if not valido:
         ...     print(msg)
@@ -60,15 +97,7 @@ def obter_nome_mes(numero_mes: int) -> str:
         >>> obter_nome_mes(12)
         'Dezembro'
     """
-    meses = [
-        "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-        "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-    ]
-    
-    if 1 <= numero_mes <= 12:
-        return meses[numero_mes - 1]
-    
-    return f"Mês {numero_mes}"
+    return NOMES_MESES.get(numero_mes, f"Mês {numero_mes}")
 
 
 def obter_nome_mes_abreviado(numero_mes: int) -> str:
@@ -98,64 +127,55 @@ def obter_nome_mes_abreviado(numero_mes: int) -> str:
     return f"M{numero_mes}"
 
 
-def construir_texto_periodo(periodos: List[Dict[str, int]]) -> str:
+def construir_texto_periodo(periodos: Periodos) -> str:
     """
     Constrói texto descritivo do período selecionado.
     
     Parâmetros:
-        periodos: Lista de períodos {'ano': ..., 'mes': ...}
+        periodos: Tupla de períodos (ano, mes)
     
     Retorna:
         str: Texto descritivo do período
     
     Exemplo:
-        >>> periodos = [{'ano': 2025, 'mes': 6}]
-        >>> construir_texto_periodo(periodos)
+        >>> construir_texto_periodo(((2025, 6),))
         'Junho/2025'
         
-        >>> periodos = [
-        ...     {'ano': 2025, 'mes': 5},
-        ...     {'ano': 2025, 'mes': 6},
-        ...     {'ano': 2025, 'mes': 7}
-        ... ]
+        >>> periodos = ((2025, 5), (2025, 6), (2025, 8))
         >>> construir_texto_periodo(periodos)
-        'Maio/2025, Junho/2025, Julho/2025'
+        'Maio/2025, Junho/2025, Agosto/2025'
     """
     if not periodos:
         return "Nenhum período selecionado"
     
-    # Ordenar períodos por ano e mês
-    periodos_ordenados = sorted(periodos, key=lambda p: (p['ano'], p['mes']))
+    # Normalizar antes do cache: a mesma seleção sempre gera a mesma chave
+    return _montar_texto_periodo(normalizar_periodos(periodos))
+
+
+@st.cache_data(show_spinner=False)
+def _montar_texto_periodo(periodos_ordenados: Periodos) -> str:
+    """
+    Monta o texto de `construir_texto_periodo` a partir dos períodos já normalizados.
+    
+    Parâmetros:
+        periodos_ordenados: Tupla ordenada e sem repetições de (ano, mes)
     
-    # Construir lista de textos
-    textos = []
-    for periodo in periodos_ordenados:
-        mes_nome = obter_nome_mes(periodo['mes'])
-        textos.append(f"{mes_nome}/{periodo['ano']}")
+    Retorna:
+        str: Texto descritivo do período
+    """
+    primeiro_ano, primeiro_mes = periodos_ordenados[0]
+    ultimo_ano, ultimo_mes = periodos_ordenados[-1]
     
-    # Se forem consecutivos do mesmo ano, pode usar formato compacto
-    if len(periodos_ordenados) > 2:
-        primeiro = periodos_ordenados[0]
-        ultimo = periodos_ordenados[-1]
-        
-        # Verificar se são consecutivos
-        consecutivos = True
-        for i in range(1, len(periodos_ordenados)):
-            diff_meses = (
-                periodos_ordenados[i]['ano'] * 12 + periodos_ordenados[i]['mes']
-            ) - (
-                periodos_ordenados[i-1]['ano'] * 12 + periodos_ordenados[i-1]['mes']
-            )
-            if diff_meses != 1:
-                consecutivos = False
-                break
-        
-        if consecutivos and primeiro['ano'] == ultimo['ano']:
-            # Formato compacto: "Maio a Julho/2025"
-            return f"{obter_nome_mes(primeiro['mes'])} a {obter_nome_mes(ultimo['mes'])}/{primeiro['ano']}"
+    # Consecutivos do mesmo ano (3+ meses) usam formato compacto: "Maio a Julho/2025"
+    if (
+        len(periodos_ordenados) > 2
+        and primeiro_ano == ultimo_ano
+        and ultimo_mes - primeiro_mes == len(periodos_ordenados) - 1
+    ):
+        return f"{obter_nome_mes(primeiro_mes)} a {obter_nome_mes(ultimo_mes)}/{primeiro_ano}"
     
     # Formato padrão: lista separada por vírgulas
-    return ", ".join(textos)
+    return ", ".join(f"{obter_nome_mes(mes)}/{ano}" for ano, mes in periodos_ordenados)
 
 
 def inicializar_session_state():
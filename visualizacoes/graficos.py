@@ -16,7 +16,7 @@ from typing import List, Dict, Any, Optional
 import streamlit as st
 from streamlit_echarts import st_echarts
 
-from calculos.formatacao import formatar_duracao_para_grafico, formatar_percentual
+from calculos.formatacao import formatar_duracao_para_grafico_vec, formatar_percentual
 from config import CORES_SEVERIDADE
 
 
@@ -54,6 +54,7 @@ def criar_grafico_pizza_severidade(dataframe: pd.DataFrame) -> Dict[str, Any]:
     ]
     
     opcoes = {
+        "animation": False,
         "title": {
             "text": "Tempo Total por Severidade",
             "left": "center",
@@ -145,16 +146,17 @@ def criar_grafico_barras_horizontais(
     labels = df_ordenado[coluna_nome].tolist()
     valores = df_ordenado[coluna_valor].tolist()
     
-    # Formatar valores para exibição e criar estrutura de dados
+    # Formatar valores para exibição (tempos formatados de uma vez, vetorizado)
+    if formato_valor == "tempo":
+        labels_formatadas = formatar_duracao_para_grafico_vec(df_ordenado[coluna_valor].to_numpy()).tolist()
+    elif formato_valor == "percentual":
+        labels_formatadas = [formatar_percentual(v) for v in valores]
+    else:
+        labels_formatadas = [f"{int(v):,}".replace(",", ".") for v in valores]
+    
+    # Criar estrutura de dados
     dados_formatados = []
-    for v in valores:
-        if formato_valor == "tempo":
-            label_formatada = formatar_duracao_para_grafico(v)
-        elif formato_valor == "percentual":
-            label_formatada = formatar_percentual(v)
-        else:
-            label_formatada = f"{int(v):,}".replace(",", ".")
-        
+    for v, label_formatada in zip(valores, labels_formatadas):
         dados_formatados.append({
             "value": v,
             "label": {
@@ -166,15 +168,18 @@ def criar_grafico_barras_horizontais(
         })
     
     opcoes = {
+        "animation": False,
         "title": {
             "text": titulo,
             "left": "center",
             "top": "10",
             "textStyle": {"fontSize": 16, "fontWeight": "bold"}
         },
+        # Os valores já aparecem nas barras: tooltip só no clique, sem
+        # processar eventos de hover
         "tooltip": {
-            "trigger": "axis",
-            "axisPointer": {"type": "shadow"}
+            "trigger": "item",
+            "triggerOn": "click"
         },
         "grid": {
             "left": "20%",
@@ -200,7 +205,9 @@ def criar_grafico_barras_horizontais(
                 "type": "bar",
                 "data": dados_formatados,
                 "itemStyle": {"color": cor},
-                "barWidth": "60%"
+                "barWidth": "60%",
+                "large": True,
+                "largeThreshold": 200
             }
         ]
     }
@@ -260,35 +267,39 @@ def criar_grafico_barras_tempo_medio(
     
     labels = df_ordenado['severidade_nome'].tolist()
     valores = df_ordenado['tempo_medio_reconhecimento_minutos'].tolist()
+    labels_formatadas = formatar_duracao_para_grafico_vec(
+        df_ordenado['tempo_medio_reconhecimento_minutos'].to_numpy()
+    ).tolist()
     
     # Preparar dados com cores e labels formatadas
     dados = []
     if usar_cores_severidade and 'severidade_cor' in df_ordenado.columns:
         cores = df_ordenado['severidade_cor'].tolist()
-        for valor, cor in zip(valores, cores):
+        for valor, cor, label_formatada in zip(valores, cores, labels_formatadas):
             dados.append({
                 "value": valor,
                 "itemStyle": {"color": cor},
                 "label": {
                     "show": True,
                     "position": "right",
-                    "formatter": formatar_duracao_para_grafico(valor),
+                    "formatter": label_formatada,
                     "fontSize": 10
                 }
             })
     else:
-        for valor in valores:
+        for valor, label_formatada in zip(valores, labels_formatadas):
             dados.append({
                 "value": valor,
                 "label": {
                     "show": True,
                     "position": "right",
-                    "formatter": formatar_duracao_para_grafico(valor),
+                    "formatter": label_formatada,
                     "fontSize": 10
                 }
             })
     
     opcoes = {
+        "animation": False,
         "title": {
             "text": "Tempo Médio de Reconhecimento por Severidade",
             "left": "center",
@@ -398,6 +409,103 @@ def criar_grafico_alarmes_criticos_teleobjeto(dataframe: pd.DataFrame) -> Dict[s
     )
 
 
+def criar_grafico_alarmes_criticos(
+    df_equipamentos: pd.DataFrame,
+    df_teleobjetos: pd.DataFrame
+) -> Dict[str, Any]:
+    """
+    Cria um único gráfico com os alarmes críticos por equipamento e por
+    teleobjeto lado a lado (um grid para cada), renderizado em uma só
+    instância do ECharts.
+    
+    Parâmetros:
+        df_equipamentos: DataFrame com colunas [equipamento_nome_formatado, duracao_total_minutos]
+        df_teleobjetos: DataFrame com colunas [teleobjeto_nome, duracao_total_minutos]
+    
+    Retorna:
+        Dict: Configuração do gráfico para st_echarts ({} se ambos vazios)
+    
+    Exemplo:
+        >>> grafico = criar_grafico_alarmes_criticos(df_crit_equip, df_crit_tele)
+        >>> st_echarts(grafico, height="400px")
+    """
+    graficos = [
+        criar_grafico_barras_horizontais(
+            df_equipamentos,
+            "Por Equipamento",
+            "equipamento_nome_formatado",
+            "duracao_total_minutos",
+            "Tempo Total (min)",
+            "#c0392b",
+            formato_valor="tempo"
+        ),
+        criar_grafico_barras_horizontais(
+            df_teleobjetos,
+            "Por Teleobjeto",
+            "teleobjeto_nome",
+            "duracao_total_minutos",
+            "Duração (min)",
+            "#c0392b",
+            formato_valor="tempo"
+        ),
+    ]
+    
+    return combinar_graficos_lado_a_lado([g for g in graficos if g])
+
+
+def combinar_graficos_lado_a_lado(graficos: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Junta gráficos de barras horizontais em uma única opção do ECharts,
+    cada um em seu próprio grid, dividindo a largura igualmente.
+    
+    Parâmetros:
+        graficos: Lista de opções criadas por criar_grafico_barras_horizontais
+    
+    Retorna:
+        Dict: Configuração do gráfico para st_echarts ({} se a lista for vazia)
+    """
+    if not graficos:
+        return {}
+    if len(graficos) == 1:
+        return graficos[0]
+    
+    largura = 100 / len(graficos)
+    opcoes = {
+        "animation": False,
+        "title": [],
+        "tooltip": {
+            "trigger": "item",
+            "triggerOn": "click"
+        },
+        "grid": [],
+        "xAxis": [],
+        "yAxis": [],
+        "series": []
+    }
+    
+    for indice, grafico in enumerate(graficos):
+        inicio = indice * largura
+        
+        opcoes["title"].append({
+            **grafico["title"],
+            "left": f"{inicio + largura / 2}%",
+            "textAlign": "center"
+        })
+        opcoes["grid"].append({
+            **grafico["grid"],
+            "left": f"{inicio + largura * 0.35}%",
+            "right": f"{100 - inicio - largura * 0.95}%"
+        })
+        opcoes["xAxis"].append({**grafico["xAxis"], "gridIndex": indice})
+        opcoes["yAxis"].append({**grafico["yAxis"], "gridIndex": indice})
+        opcoes["series"].extend(
+            {**serie, "xAxisIndex": indice, "yAxisIndex": indice}
+            for serie in grafico["series"]
+        )
+    
+    return opcoes
+
+
 # ============================================================================
 # GRÁFICO 9: BARRAS - ALARMES NÃO FINALIZADOS
 # ============================================================================
@@ -433,41 +541,38 @@ def criar_grafico_linha_evolucao(
     """
     Cria gráfico de linha mostrando evolução diária de alarmes.
     
+    O gráfico leva as duas séries (quantidade e duração); a legenda funciona
+    como seletor (uma série por vez), então trocar de métrica acontece no
+    navegador, sem rerun do Streamlit.
+    
     Parâmetros:
         dataframe: DataFrame com colunas [data, quantidade_alarmes, duracao_total_minutos]
-        modo: "quantidade" para mostrar quantidade de alarmes, 
-              "duracao" para mostrar duração total
+        modo: Série exibida inicialmente: "quantidade" ou "duracao"
     
     Retorna:
         Dict: Configuração do gráfico para st_echarts
     
     Exemplo:
         >>> df = obter_evolucao_diaria(86, periodos)
-        >>> grafico_qtd = criar_grafico_linha_evolucao(df, modo="quantidade")
+        >>> grafico = criar_grafico_linha_evolucao(df)
         >>> grafico_dur = criar_grafico_linha_evolucao(df, modo="duracao")
     """
     if dataframe.empty:
         return {}
     
-    # Converter data para string formatada
-    dataframe['data_str'] = pd.to_datetime(dataframe['data']).dt.strftime('%d/%m')
+    # Datas formatadas para o eixo X
+    datas = pd.to_datetime(dataframe['data']).dt.strftime('%d/%m').tolist()
     
-    datas = dataframe['data_str'].tolist()
-    
-    if modo == "quantidade":
-        valores = dataframe['quantidade_alarmes'].tolist()
-        titulo = "Evolução Diária - Quantidade de Alarmes"
-        nome_serie = "Quantidade"
-        cor = "#3498db"
-    else:
-        valores = dataframe['duracao_total_minutos'].tolist()
-        titulo = "Evolução Diária - Duração Total"
-        nome_serie = "Duração (min)"
-        cor = "#e67e22"
+    series = [
+        ("Quantidade", dataframe['quantidade_alarmes'].tolist(), "#3498db"),
+        ("Duração (min)", dataframe['duracao_total_minutos'].tolist(), "#e67e22"),
+    ]
+    serie_inicial = series[0][0] if modo == "quantidade" else series[1][0]
     
     opcoes = {
+        "animation": False,
         "title": {
-            "text": titulo,
+            "text": "Evolução Diária de Alarmes",
             "left": "center",
             "top": "10",
             "textStyle": {"fontSize": 16, "fontWeight": "bold"}
@@ -476,6 +581,11 @@ def criar_grafico_linha_evolucao(
             "trigger": "axis",
             "axisPointer": {"type": "cross"}
         },
+        "legend": {
+            "top": "40",
+            "selectedMode": "single",
+            "selected": {nome: nome == serie_inicial for nome, _, _ in series}
+        },
         "grid": {
             "left": "10%",
             "right": "10%",
@@ -492,14 +602,11 @@ def criar_grafico_linha_evolucao(
             }
         },
         "yAxis": {
-            "type": "value",
-            "name": nome_serie,
-            "nameLocation": "middle",
-            "nameGap": 50
+            "type": "value"
         },
         "series": [
             {
-                "name": nome_serie,
+                "name": nome,
                 "type": "line",
                 "data": valores,
                 "smooth": True,
@@ -519,8 +626,13 @@ def criar_grafico_linha_evolucao(
                 },
                 "lineStyle": {"width": 2},
                 "symbol": "circle",
-                "symbolSize": 6
+                "symbolSize": 6,
+                # Séries longas: amostragem e renderização progressiva
+                "sampling": "lttb",
+                "progressive": 2000,
+                "progressiveThreshold": 3000
             }
+            for nome, valores, cor in series
         ],
         "dataZoom": [
             {
@@ -565,6 +677,7 @@ def criar_grafico_resumo_mensal(dataframe: pd.DataFrame) -> Dict[str, Any]:
     duracoes = (dataframe['duracao_total_minutos'] / 60).round(1).tolist()  # Converter para horas
     
     opcoes = {
+        "animation": False,
         "title": {
             "text": "Resumo por Mês",
             "left": "center",
@@ -657,7 +770,7 @@ def exibir_grafico_com_toggle(
         cor_duracao: Cor para modo duração
     
     Exemplo:
-        >>> df = obter_top_equipamentos_por_quantidade(86, periodos, 50)
+        >>> df = obter_top_equipamentos_com_qtd_e_duracao(86, periodos, 50)
         >>> exibir_grafico_com_toggle(
         ...     df, "Top Equipamentos", "equipamento_nome",
         ...     "quantidade_alarmes", "duracao_total_minutos",
@@ -684,8 +797,9 @@ def exibir_grafico_com_toggle(
     
     limite = limite_expandido if st.session_state[f"{key_prefix}_expandido"] else limite_inicial
     
-    # Filtrar dados conforme limite
-    df_exibir = dataframe.head(limite)
+    # Ordenar pela métrica selecionada antes de aplicar o limite
+    coluna_ordenacao = coluna_quantidade if modo == "Quantidade" else coluna_duracao
+    df_exibir = dataframe.nlargest(limite, coluna_ordenacao)
     
     # Criar gráfico conforme modo selecionado
     if modo == "Quantidade":
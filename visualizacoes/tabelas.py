@@ -5,27 +5,43 @@ Este módulo contém funções para exibir tabelas formatadas usando Streamlit.
 Inclui tabelas de alarmes com paginação e tabelas de ranking.
 """
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from typing import Optional
 from datetime import datetime
 
 from calculos.formatacao import (
-    formatar_tempo_minutos,
-    formatar_data_hora_brasileira,
+    formatar_tempo_minutos_vec,
+    formatar_data_hora_brasileira_vec,
     formatar_numero
 )
 from config import ALARMES_POR_PAGINA
 
 
+def mudar_pagina_tabela(pagina: int):
+    """
+    Define a página atual da tabela de alarmes (callback dos botões de paginação).
+    
+    Parâmetros:
+        pagina: Número da nova página
+    """
+    st.session_state['pagina_tabela'] = pagina
+
+
 def exibir_tabela_alarmes(
     dataframe: pd.DataFrame,
     pagina_atual: int = 1,
-    alarmes_por_pagina: int = ALARMES_POR_PAGINA
+    alarmes_por_pagina: int = ALARMES_POR_PAGINA,
+    total_registros: Optional[int] = None
 ):
     """
     Exibe tabela de alarmes com paginação.
     
+    Com total_registros informado, o DataFrame já é a página atual (paginada
+    no banco, ver obter_lista_alarmes); sem ele, a página é recortada do
+    DataFrame completo.
+    
     Parâmetros:
         dataframe: DataFrame com colunas [data_inicio, data_fim, duracao_minutos,
                                          equipamento_nome, teleobjeto_nome,
@@ -34,46 +50,47 @@ def exibir_tabela_alarmes(
                                          usuario_reconhecimento]
         pagina_atual: Número da página atual (padrão: 1)
         alarmes_por_pagina: Número de alarmes por página (padrão: 50)
+        total_registros: Total de alarmes do filtro, quando o DataFrame é só a página
     
     Exemplo:
-        >>> df = obter_lista_alarmes(86, periodos, offset=0, limite=50)
-        >>> exibir_tabela_alarmes(df, pagina_atual=1)
+        >>> df = obter_lista_alarmes(86, periodos, limite=50)
+        >>> exibir_tabela_alarmes(df, pagina_atual=1, total_registros=1234)
     """
     if dataframe.empty:
         st.info("📄 Nenhum alarme encontrado para o período selecionado.")
         return
     
-    # Calcular total de páginas
-    total_registros = len(dataframe)
-    total_paginas = (total_registros + alarmes_por_pagina - 1) // alarmes_por_pagina
+    # Calcular total de páginas e a página a exibir
+    if total_registros is not None:
+        df_pagina = dataframe
+    else:
+        total_registros = len(dataframe)
+        offset = (pagina_atual - 1) * alarmes_por_pagina
+        df_pagina = dataframe.iloc[offset:offset + alarmes_por_pagina]
     
-    # Calcular offset
-    offset = (pagina_atual - 1) * alarmes_por_pagina
-    df_pagina = dataframe.iloc[offset:offset + alarmes_por_pagina]
+    total_paginas = (total_registros + alarmes_por_pagina - 1) // alarmes_por_pagina
     
     # Preparar DataFrame para exibição
     df_exibir = df_pagina.copy()
     
     # Formatar colunas
-    df_exibir['Data Início'] = df_exibir['data_inicio'].apply(
-        lambda x: formatar_data_hora_brasileira(x) if pd.notna(x) else '-'
-    )
+    df_exibir['Data Início'] = formatar_data_hora_brasileira_vec(df_exibir['data_inicio'])
     
-    df_exibir['Data Fim'] = df_exibir['data_fim'].apply(
-        lambda x: formatar_data_hora_brasileira(x) if pd.notna(x) else 'Em andamento'
-    )
+    df_exibir['Data Fim'] = formatar_data_hora_brasileira_vec(df_exibir['data_fim'], 'Em andamento')
     
-    df_exibir['Duração'] = df_exibir['duracao_minutos'].apply(
-        lambda x: formatar_tempo_minutos(x) if pd.notna(x) else '-'
+    duracoes = df_exibir['duracao_minutos']
+    df_exibir['Duração'] = np.where(
+        duracoes.notna(),
+        formatar_tempo_minutos_vec(duracoes.to_numpy()),
+        '-'
     )
     
-    df_exibir['Reconhecimento'] = df_exibir.apply(
-        lambda row: (
-            f"{formatar_data_hora_brasileira(row['data_reconhecimento'])} "
-            f"({row['usuario_reconhecimento']})"
-            if pd.notna(row['data_reconhecimento']) else 'Não reconhecido'
-        ),
-        axis=1
+    reconhecido = df_exibir['data_reconhecimento'].notna()
+    df_exibir['Reconhecimento'] = np.where(
+        reconhecido,
+        formatar_data_hora_brasileira_vec(df_exibir['data_reconhecimento'])
+        + " (" + df_exibir['usuario_reconhecimento'].astype(str) + ")",
+        'Não reconhecido'
     )
     
     # Selecionar colunas para exibição
@@ -114,11 +131,16 @@ def exibir_tabela_alarmes(
     st.markdown("---")
     col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
     
+    # Callbacks (on_click) em vez de st.rerun(): funcionam também quando a
+    # tabela é desenhada dentro de um fragmento, que é rerodado sozinho
     with col1:
         if pagina_atual > 1:
-            if st.button("◀️ Anterior", key="btn_anterior"):
-                st.session_state['pagina_atual'] = pagina_atual - 1
-                st.rerun()
+            st.button(
+                "◀️ Anterior",
+                key="btn_anterior",
+                on_click=mudar_pagina_tabela,
+                args=(pagina_atual - 1,)
+            )
     
     with col3:
         st.markdown(
@@ -131,9 +153,12 @@ def exibir_tabela_alarmes(
     
     with col5:
         if pagina_atual < total_paginas:
-            if st.button("Próxima ▶️", key="btn_proxima"):
-                st.session_state['pagina_atual'] = pagina_atual + 1
-                st.rerun()
+            st.button(
+                "Próxima ▶️",
+                key="btn_proxima",
+                on_click=mudar_pagina_tabela,
+                args=(pagina_atual + 1,)
+            )
 
 
 def exibir_tabela_ranking(